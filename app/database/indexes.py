@@ -0,0 +1,121 @@
+import importlib
+import inspect
+import logging
+import pkgutil
+from typing import Dict, List, Type
+
+import pymongo
+import pymongo.errors
+from odmantic import AIOEngine, Model
+from odmantic.index import ODMBaseIndex
+
+import app.database.models as models_package
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def get_models() -> List[Type[Model]]:
+    """
+    app/database/models 패키지에 정의된 컬렉션 모델을 수집하는 함수
+    새로운 모델 파일을 추가하면 별도 등록 없이 인덱스 관리 대상에 포함됩니다.
+    model_config에 collection이 없는 모델(MediaFile처럼 다른 문서에 포함되어만 쓰이는 모델)은
+    컬렉션이 없으므로 제외합니다. 새 컬렉션 모델은 collection을 명시해야 합니다.
+    """
+    found = []
+    for module_info in pkgutil.iter_modules(models_package.__path__):
+        module = importlib.import_module(
+            f"{models_package.__name__}.{module_info.name}"
+        )
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, Model)
+                and obj is not Model
+                and obj.__module__ == module.__name__
+                and obj.model_config.get("collection")
+            ):
+                found.append(obj)
+    return found
+
+
+def get_declared_indexes(model: Type[Model]) -> List[pymongo.IndexModel]:
+    """
+    모델에 선언된 인덱스(Field의 index/unique 옵션 및 model_config의 indexes)를
+    pymongo IndexModel 목록으로 반환하는 함수
+    """
+    return [
+        index.get_pymongo_index() if isinstance(index, ODMBaseIndex) else index
+        for index in model.__indexes__()
+    ]
+
+
+async def ensure_indexes(engine: AIOEngine) -> None:
+    """
+    모든 모델에 선언된 인덱스를 생성하는 함수.
+    이미 존재하는 인덱스는 그대로 두며, 기존 데이터가 유니크 조건을 위반하는 등
+    하나의 인덱스 생성이 실패해도 나머지 인덱스 생성은 계속 진행합니다.
+    """
+    for model in get_models():
+        collection = engine.get_collection(model)
+        for index in get_declared_indexes(model):
+            name = index.document["name"]
+            try:
+                await collection.create_indexes([index])
+            except pymongo.errors.PyMongoError:
+                logger.error(
+                    f"인덱스 생성 실패: {collection.name}.{name}", exc_info=True
+                )
+
+
+async def get_index_report(engine: AIOEngine) -> Dict[str, Dict[str, List[str]]]:
+    """
+    컬렉션별 인덱스 상태를 점검하는 함수
+    - missing: 모델에 선언되었지만 DB에 없는 인덱스
+    - undeclared: DB에는 있지만 모델에 선언되지 않은 인덱스
+    - unused: 서버 재시작 이후 한 번도 사용되지 않은 인덱스 ($indexStats 기준)
+    :return: {컬렉션 이름: {"missing": [...], "undeclared": [...], "unused": [...]}}
+    """
+    report = {}
+    for model in get_models():
+        collection = engine.get_collection(model)
+        declared = {index.document["name"] for index in get_declared_indexes(model)}
+
+        existing = set()
+        async for index_info in collection.list_indexes():
+            existing.add(index_info["name"])
+        existing.discard("_id_")
+
+        unused = []
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats["accesses"]["ops"] == 0:
+                    unused.append(stats["name"])
+        except pymongo.errors.PyMongoError:
+            logger.warning(f"인덱스 사용 통계 조회 실패: {collection.name}")
+
+        entry = {
+            "missing": sorted(declared - existing),
+            "undeclared": sorted(existing - declared),
+            "unused": sorted(unused),
+        }
+        if any(entry.values()):
+            report[collection.name] = entry
+    return report
+
+
+async def init_indexes(engine: AIOEngine) -> None:
+    """
+    앱 시작 시 인덱스를 생성하고 점검 결과를 로그로 남기는 함수
+    """
+    await ensure_indexes(engine)
+
+    report = await get_index_report(engine)
+    for collection_name, entry in report.items():
+        for kind, names in entry.items():
+            if not names:
+                continue
+            # 사용 통계는 mongod 재시작 시 초기화되므로 unused는 참고용으로만 남깁니다.
+            log = logger.info if kind == "unused" else logger.warning
+            log(f"인덱스 점검 [{collection_name}] {kind}: {names}")
+    if not report:
+        logger.info("인덱스 점검 완료: 모든 선언된 인덱스가 존재합니다.")
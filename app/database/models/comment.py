@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from odmantic import Field, ObjectId, Model
+from odmantic import Field, Index, ObjectId, Model
 
 from app.utils.time_util import get_current_time
 
@@ -15,4 +15,10 @@ class Comment(Model):
     # 대댓기능은 보류
     # replies: Optional[List["Comment"]] = []  # 댓글에 대한 댓글 리스트
 
-    model_config = {"collection": "comments"}
+    model_config = {
+        "collection": "comments",
+        # 게시글별 댓글 목록 조회(작성순 정렬)용 복합 인덱스
+        "indexes": lambda: [
+            Index(Comment.post_id, Comment.created_at, name="post_id_created_at"),
+        ],
+    }
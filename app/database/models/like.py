@@ -0,0 +1,20 @@
+from datetime import datetime
+from odmantic import Field, Index, Model, ObjectId
+
+from app.utils.time_util import get_current_time
+
+
+class PostLike(Model):
+    post_id: ObjectId  # 좋아요가 눌린 게시글의 ID
+    user_id: ObjectId  # 좋아요를 누른 사용자의 ID
+    created_at: datetime = Field(default_factory=get_current_time)  # 생성 시간
+
+    model_config = {
+        "collection": "post_likes",
+        "indexes": lambda: [
+            # 사용자당 게시글 하나에 좋아요 하나만 존재하도록 보장
+            Index(PostLike.post_id, PostLike.user_id, unique=True, name="post_id_user_id"),
+            # 목록 응답의 is_liked_by_me 일괄 조회용
+            Index(PostLike.user_id, PostLike.post_id, name="user_id_post_id"),
+        ],
+    }
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import List, Optional
+from odmantic import Field, Model, ObjectId
+
+from app.utils.time_util import get_current_time
+
+
+class MediaBlob(Model):
+    # 저장소 안의 상대 경로 ("ab/cd/{sha256}.jpg") - 같은 내용의 파일은 한 번만 저장
+    key: str = Field(primary_field=True)
+    size: int  # 파일 크기(바이트)
+    ref_count: int = 0  # 이 파일을 참조하는 MediaFile, 프로필 이미지 수
+    created_at: datetime = Field(default_factory=get_current_time)  # 생성 시간
+    updated_at: datetime = Field(default_factory=get_current_time)  # 참조 수 변경 시간
+    # 파일 삭제 중 표시 (삭제하는 쪽의 토큰, 삭제가 끝나면 기록도 삭제) - 삭제 중에는 새로 참조할 수 없음
+    deleting: Optional[str] = None
+    deleting_at: Optional[datetime] = None  # 삭제 시작 시간
+
+    model_config = {"collection": "media_blobs"}
+
+
+class ImageHash(Model):
+    media_id: ObjectId = Field(unique=True)  # 이미지 MediaFile의 ID
+    post_id: ObjectId = Field(index=True)  # 이미지가 첨부된 게시글의 ID
+    phash: str  # 64비트 지각 해시 (16진수)
+    # 해시를 16비트씩 나눈 "{위치}:{값}" 목록 (멀티키 인덱스로 해밍 거리 검색 후보 조회)
+    segments: List[str] = Field(index=True)
+    created_at: datetime = Field(default_factory=get_current_time)  # 생성 시간
+
+    model_config = {"collection": "image_hashes"}
@@ -1,26 +1,78 @@
 from datetime import datetime
 from typing import List, Optional
-from odmantic import Field, ObjectId, Model
+from odmantic import EmbeddedModel, Field, Index, ObjectId, Model
+from odmantic.query import desc
+from pymongo import IndexModel
 
 from app.utils.time_util import get_current_time
 
 
+# 미디어 처리 상태
+MEDIA_STATUS_PENDING = "pending"  # 처리 대기 중 (작업 큐에 등록됨)
+MEDIA_STATUS_PROCESSING = "processing"  # 워커가 처리 중
+MEDIA_STATUS_READY = "ready"  # 처리 완료
+MEDIA_STATUS_FAILED = "failed"  # 재시도 후에도 처리 실패
+
+
+class ImageVariant(EmbeddedModel):
+    url: str  # 파생본 URL
+    width: int  # 너비(px)
+    height: int  # 높이(px)
+    format: str  # 이미지 형식 ("webp", "jpeg")
+
+
+class VideoSprite(EmbeddedModel):
+    url: str  # 탐색 미리보기 이미지 URL (프레임을 격자로 배치한 JPEG)
+    columns: int  # 열 수
+    rows: int  # 행 수
+    count: int  # 실제로 채워진 칸 수 (왼쪽 위부터 행 단위로 채움)
+    tile_width: int  # 칸 너비(px)
+    tile_height: int  # 칸 높이(px)
+    positions: List[float] = []  # 칸별 프레임의 재생 위치(초)
+
+
 class MediaFile(Model):
     url: str  # 파일 URL
     file_type: str  # 파일 타입 ("image", "video" 등)
     # 비디오일 경우 썸네일 URL (이미지에는 필요 없음)
     thumbnail_url: Optional[str] = None
+    # 백그라운드 처리 상태 (클라이언트는 ready가 될 때까지 게시글을 다시 조회)
+    status: str = MEDIA_STATUS_READY
+    # 목록 화면이 미디어를 받기 전에 자리를 잡고 미리보기를 그릴 수 있도록 제공하는 정보
+    # (크기는 업로드 시, 나머지는 처리 완료 후 채워짐)
+    size: Optional[int] = None  # 파일 크기(바이트)
+    width: Optional[int] = None  # 너비(px, 비디오는 회전 반영)
+    height: Optional[int] = None  # 높이(px)
+    duration: Optional[float] = None  # 비디오 재생 시간(초)
+    blurhash: Optional[str] = None  # 흐린 미리보기용 BlurHash (비디오는 썸네일 기준)
+    # 이미지일 경우 크기/형식별 파생본 (처리 완료 전에는 비어 있으며 url의 원본을 사용)
+    variants: List[ImageVariant] = []
+    # 이미지일 경우 지각 해시와, 비슷한 이미지가 먼저 올라온 게시글의 ID (재업로드 표시용)
+    phash: Optional[str] = None
+    duplicate_of: Optional[ObjectId] = None
+    # 비디오일 경우 HLS 마스터 플레이리스트 URL (없으면 url의 원본을 재생)
+    hls_url: Optional[str] = None
+    # 비디오일 경우 재생 바 탐색 미리보기 이미지
+    sprite: Optional[VideoSprite] = None
 
 
 class Post(Model):
-    user_id: ObjectId
+    user_id: ObjectId = Field(index=True)  # 닉네임 변경 시 작성자 게시글 일괄 조회
     title: str
     content: str
     nick_name: str  # 작성자의 닉네임
     tags: List[str]  # 여러 문자열을 저장할 수 있는 리스트 필드
     files: List[MediaFile] = []  # 파일 정보를 저장할 수 있는 리스트 필드
-    likes_count: int = 0  # 좋아요 수
-    liked_users_id: List[ObjectId] = []  # 좋아요를 누른 사용자들의 ID 리스트
+    likes_count: int = 0  # 좋아요 수 (좋아요 목록은 post_likes 컬렉션에 저장)
     created_at: datetime = Field(default_factory=get_current_time)  # 생성 시간
 
-    model_config = {"collection": "posts"}
+    model_config = {
+        "collection": "posts",
+        # 커서 기반 페이지네이션용 (정렬 값, _id) 복합 인덱스
+        "indexes": lambda: [
+            Index(desc(Post.created_at), desc(Post.id), name="created_at_id"),
+            Index(desc(Post.likes_count), desc(Post.id), name="likes_count_id"),
+            # 저장소 정리 작업에서 파일 URL로 참조 여부를 일괄 조회
+            IndexModel([("files.url", 1)], name="files_url"),
+        ],
+    }
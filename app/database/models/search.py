@@ -0,0 +1,10 @@
+from typing import List
+from odmantic import Field, Model, ObjectId
+
+
+class PostSearchIndex(Model):
+    post_id: ObjectId = Field(unique=True)  # 색인된 게시글의 ID
+    # 제목/태그에서 추출한 n-gram 토큰 (멀티키 인덱스로 역색인 역할)
+    tokens: List[str] = Field(index=True)
+
+    model_config = {"collection": "post_search_index"}
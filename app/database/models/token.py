@@ -4,7 +4,7 @@ from odmantic import Field, Model, ObjectId
 from app.utils.time_util import get_current_time
 
 class FCMToken(Model):
-    user_id: ObjectId
+    user_id: ObjectId = Field(unique=True)  # 사용자당 하나의 토큰만 유지
     fcm_token: str
     created_at: datetime = Field(default_factory=get_current_time) # 생성 시간
  
@@ -1,18 +1,20 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from odmantic import Field, Model
 
+from app.database.models.post import ImageVariant
 from app.utils.time_util import get_current_time
 
 
 class User(Model):
-    nick_name: str
-    email: str
+    nick_name: str = Field(unique=True)
+    email: str = Field(unique=True)
     feather: int = 0  # 사용자의 깃털 개수
     is_admin: bool = False  # 관리자 여부, 기본값 False
     created_at: datetime = Field(default_factory=get_current_time) # 생성 시간
     last_nick_name_updated_at: Optional[datetime] = None  # 업데이트 시간은 기본값 없이 옵셔널
     profile_image_url: Optional[str] = None # 파일 url 저장 필드
     profile_image_path: Optional[str] = None # 파일 url 저장 필드
+    profile_image_variants: List[ImageVariant] = []  # 크기/형식별 프로필 이미지 파생본
 
     model_config = {"collection": "users"}
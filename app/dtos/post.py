@@ -1,6 +1,10 @@
+from datetime import datetime
 from typing import List
+from odmantic import ObjectId
 from pydantic import BaseModel, Field
 
+from app.database.models.post import MediaFile
+
 
 # 요청 바디 모델 정의
 class PostUpdate(BaseModel):
@@ -8,6 +12,23 @@ class PostUpdate(BaseModel):
     content: str = Field(..., description="게시글의 내용", example="업데이트된 게시글 내용입니다.")
     tags: List[str] = Field(..., description="게시글에 포함할 태그 목록", example=["Python", "FastAPI"])
 
+# 게시글 조회 시 반환되는 모델
+class PostResponseModel(BaseModel):
+    id: ObjectId = Field(..., description="게시글의 고유 ID")
+    user_id: ObjectId = Field(..., description="작성자의 고유 ID")
+    title: str = Field(..., description="게시글의 제목")
+    content: str = Field(..., description="게시글의 내용")
+    nick_name: str = Field(..., description="작성자의 닉네임")
+    tags: List[str] = Field(..., description="게시글의 태그 목록")
+    files: List[MediaFile] = Field([], description="첨부된 이미지/비디오 파일 목록")
+    likes_count: int = Field(0, description="좋아요 수")
+    is_liked_by_me: bool = Field(False, description="요청한 사용자가 좋아요를 눌렀는지 여부")
+    created_at: datetime = Field(..., description="생성 시간")
+
+    class Config:
+        from_attributes = True
+
+
 # 댓글 생성 dto
 class CreateComment(BaseModel):
     content: str = Field(..., description="생성할 댓글의 내용", example="이 게시글 정말 유익하네요!")
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+
+class CreateUploadSession(BaseModel):
+    """
+    이어 올리기 업로드 세션을 생성할 때 필요한 데이터 모델입니다.
+    """
+
+    filename: str = Field(..., description="업로드할 파일 이름", example="video.mp4")
+    content_type: str = Field(..., description="파일의 MIME 타입", example="video/mp4")
+    size: int = Field(..., gt=0, description="파일 전체 크기(바이트)", example=31457280)
+
+
+# 업로드 세션 조회/갱신 시 반환되는 모델
+class UploadSessionResponseModel(BaseModel):
+    upload_id: str = Field(..., description="업로드 ID (완료 후 게시글 생성 시 upload_ids로 전달)")
+    offset: int = Field(..., description="서버가 받은 크기(바이트) - 다음 조각의 시작 위치")
+    size: int = Field(..., description="파일 전체 크기(바이트)")
+    status: str = Field(..., description="업로드 상태 (uploading, complete)")
+    chunk_size: int = Field(..., description="권장 조각 크기(바이트)")
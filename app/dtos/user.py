@@ -2,6 +2,8 @@ from typing import List, Optional
 from odmantic import ObjectId
 from pydantic import BaseModel, Field
 
+from app.database.models.post import ImageVariant
+
 
 class UserCreate(BaseModel):
     """
@@ -35,6 +37,9 @@ class UserResponseModel(BaseModel):
     profile_image_url: Optional[str] = Field(
         None, description="사용자의 프로필 이미지 URL"
     )
+    profile_image_variants: List[ImageVariant] = Field(
+        [], description="크기/형식별 프로필 이미지 파생본 목록"
+    )
 
     class Config:
         from_attributes = True
@@ -71,3 +76,6 @@ class DeleteUserResponseModel(BaseModel):
 class UpdateProfileImageResponseModel(BaseModel):
     msg: str = Field(..., description="프로필 이미지가 업데이트된 결과 메시지")
     profile_image_url: str = Field(..., description="업데이트된 프로필 이미지의 URL")
+    profile_image_variants: List[ImageVariant] = Field(
+        [], description="크기/형식별 프로필 이미지 파생본 목록"
+    )
@@ -0,0 +1,76 @@
+"""
+저장소 정리 작업
+
+업로드 디렉터리를 훑으며 게시글, 프로필 어디에서도 참조하지 않는 파일을 삭제(또는 격리)하고
+media_blobs의 참조 수를 실제 참조 수에 맞춥니다. 파일 목록을 한꺼번에 읽지 않으므로 파일이 많아도 메모리 사용량이 일정합니다.
+
+실행: python -m app.gc [--dry-run] [--quarantine DIR] [--min-age 초] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.common.config import conf
+from app.database.conn import close_mongo, init_mongo
+from app.utils.gc_utils import (
+    GC_BATCH_SIZE,
+    GC_MIN_AGE,
+    GC_QUARANTINE_DIRECTORY,
+    StorageGarbageCollector,
+)
+from app.utils.storage_backend_utils import get_storage_backend
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+async def run_gc(args: argparse.Namespace) -> None:
+    # 원격 저장소의 파일은 업로드 디렉터리에 없으므로 정리할 수 없음 (버킷 수명 주기 규칙 사용)
+    if not get_storage_backend().is_local:
+        logger.error("저장소 정리는 로컬 저장소(STORAGE_BACKEND=local)에서만 실행할 수 있습니다.")
+        return
+
+    c = conf()
+    engine = await init_mongo(db_url=c.DB_URL, db_name=c.DB_NAME)
+    try:
+        collector = StorageGarbageCollector(
+            engine,
+            dry_run=args.dry_run,
+            quarantine_dir=args.quarantine,
+            min_age=args.min_age,
+            batch_size=args.batch_size,
+        )
+        await collector.run()
+    finally:
+        await close_mongo(engine)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="참조하지 않는 업로드 파일 정리")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="삭제하지 않고 정리 대상과 통계만 출력"
+    )
+    parser.add_argument(
+        "--quarantine",
+        nargs="?",
+        const=GC_QUARANTINE_DIRECTORY,
+        default=None,
+        help=f"삭제하지 않고 디렉터리로 옮김 (기본: {GC_QUARANTINE_DIRECTORY})",
+    )
+    parser.add_argument(
+        "--min-age", type=int, default=GC_MIN_AGE, help="이 시간(초) 안에 수정된 파일은 건너뜀"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=GC_BATCH_SIZE, help="한 번에 참조를 조회할 파일 수"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    asyncio.run(run_gc(parse_args()))
@@ -1,15 +1,25 @@
 from dataclasses import asdict
 import logging
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import redis.asyncio as aioredis
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, HTTPException, Request
 from app.utils.settings import UPLOAD_DIRECTORY
+from app.utils.static_utils import MediaFiles
+from app.utils.upload_utils import (
+    MAX_UPLOAD_REQUEST_SIZE,
+    STATIC_URL_PREFIX,
+    check_content_length,
+)
 from app.database.conn import init_mongo, close_mongo,init_redis,close_redis
+from app.database.indexes import init_indexes
+from app.utils.executor_utils import init_media_executors, shutdown_media_executors
+from app.utils.like_utils import migrate_embedded_likes
+from app.utils.search_utils import sync_search_index
 from app.common.config import conf
-from app.routes import index, auth, posts, user
+from app.routes import index, auth, posts, uploads, user
 from contextlib import asynccontextmanager
 
 
@@ -35,18 +45,31 @@ async def lifespan(app: FastAPI):
     # await db.connect()
     app.state.mongo_engine = await init_mongo(db_url=c.DB_URL, db_name=c.DB_NAME)
 
+    # 모델에 선언된 인덱스 생성 및 점검
+    await init_indexes(app.state.mongo_engine)
+
+    # 게시글에 내장된 좋아요 목록을 post_likes 컬렉션으로 이전
+    await migrate_embedded_likes(app.state.mongo_engine)
+
+    # 검색 색인에 누락된 기존 게시글 색인
+    await sync_search_index(app.state.mongo_engine)
+
     # Redis 클라이언트 초기화
     app.state.redis_client = await init_redis(redis_url=c.redis_url)
 
+    # 미디어 파일 I/O, 영상 디코딩용 스레드/프로세스 풀 생성
+    init_media_executors()
+
     # 미들웨어 정의
 
-    # 정적 파일 제공 경로 매핑
-    app.mount("/static", StaticFiles(directory=UPLOAD_DIRECTORY), name="static")
+    # 정적 파일 제공 경로 매핑 (Range 요청, 캐시 헤더 지원)
+    app.mount("/static", MediaFiles(directory=UPLOAD_DIRECTORY), name="static")
 
     yield
 
     # await redis_client.close()
     # await db.close()
+    shutdown_media_executors()
     await close_mongo(app.state.mongo_engine)
     await close_redis(app.state.redis)
 
@@ -65,24 +88,68 @@ app = create_app()
 
 
 # 미들웨어 추가
-class CharsetMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response: Response = await call_next(request)
-        # 모든 응답에 charset=utf-8 추가
-        response.headers["Content-Type"] = (
-            response.headers.get("Content-Type", "application/json") + "; charset=utf-8"
-        )
-        return response
+# 응답 본문을 다시 감싸지 않도록 ASGI 미들웨어로 작성하고, 정적 파일 요청은 그대로 통과시킴
+def is_static_request(scope: Scope) -> bool:
+    return scope["type"] != "http" or scope["path"].startswith(STATIC_URL_PREFIX)
+
+
+class CharsetMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if is_static_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_charset(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # JSON, 텍스트 응답에 charset=utf-8 추가 (이미 지정된 경우 제외)
+                headers = MutableHeaders(scope=message)
+                content_type = headers.get("content-type", "")
+                if (
+                    content_type.startswith(("application/json", "text/"))
+                    and "charset=" not in content_type
+                ):
+                    headers["content-type"] = content_type + "; charset=utf-8"
+            await send(message)
+
+        await self.app(scope, receive, send_with_charset)
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if is_static_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Content-Length가 업로드 최대 크기를 넘으면 본문을 받기 전에 거절
+        try:
+            check_content_length(
+                Headers(scope=scope).get("content-length"), MAX_UPLOAD_REQUEST_SIZE
+            )
+        except HTTPException as http_ex:
+            response = JSONResponse(
+                status_code=http_ex.status_code, content={"detail": http_ex.detail}
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
 
 # 미들웨어 등록
 app.add_middleware(CharsetMiddleware)
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # 라우터 정의
 app.include_router(index.router)
 app.include_router(auth.router, tags=["Authentication"], prefix="/api")
 app.include_router(posts.router, tags=["Post"], prefix="/api")
 app.include_router(user.router, tags=["User"], prefix="/api")
+app.include_router(uploads.router, tags=["Upload"], prefix="/api")
 
 
 # test endpoints
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Body
 import logging
 from odmantic import AIOEngine, ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.database.models.token import FCMToken
 from app.database.models.user import User
 from app.dtos.auth import FCMTokenCreate
@@ -74,7 +75,11 @@ async def register(
             email=email,
         )
 
-        await engine.save(user)
+        try:
+            await engine.save(user)
+        except DuplicateKeyError:
+            # 동시 가입 요청으로 유니크 인덱스(닉네임/이메일)에 걸린 경우
+            raise HTTPException(status_code=400, detail="이미 가입된 사용자이거나 중복된 닉네임입니다.")
 
         # 유저 생성 로그
         logger.info(f"유저 생성 완료: 닉네임 - {user.nick_name}, 이메일 - {user.email}")
@@ -1,6 +1,5 @@
-from datetime import datetime
+import json
 import logging
-import re
 from typing import List, Optional
 from fastapi import (
     APIRouter,
@@ -13,29 +12,102 @@ from fastapi import (
     Request,
     UploadFile,
 )
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
 from odmantic import AIOEngine, ObjectId
 import redis.asyncio as aioredis
-from app.database.models.post import MediaFile, Post
+from app.database.models.post import MEDIA_STATUS_PENDING, MediaFile, Post
 from app.database.models.user import User
 from app.database.models.comment import Comment
-from app.utils.media_utils import create_video_thumbnail
-from app.utils.notification_utils import send_comment_notification, send_like_notification
-from app.utils.settings import UPLOAD_DIRECTORY
+from app.dtos.post import PostResponseModel
+from app.utils.cache_utils import (
+    get_cached_field,
+    get_or_load_cached,
+    set_cached_field_json,
+)
+from app.utils.etag_utils import (
+    conditional_json_response,
+    is_not_modified,
+    json_etag_response,
+    make_etag,
+    not_modified_response,
+)
+from app.utils.media_job_utils import enqueue_post_media_jobs, get_media_job_type
+from app.utils.notification_utils import (
+    get_notification_stats,
+    send_comment_notification,
+    send_like_notification,
+)
+from app.utils.pagination_utils import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    paginate_posts,
+)
+from app.utils.like_utils import (
+    build_post_responses,
+    delete_post_likes,
+    get_liked_post_ids,
+    to_post_response,
+    toggle_like,
+)
+from app.utils.post_utils import (
+    POST_COMMENTS_CACHE_TTL,
+    POST_DETAIL_CACHE_TTL,
+    get_post_comments_cache_key,
+    get_post_detail_cache_key,
+    get_posts_by_ids,
+    invalidate_comments_cache,
+    invalidate_post_cache,
+)
+from app.utils.ranking_utils import (
+    DEFAULT_POPULAR_WINDOW,
+    POPULAR_POSTS_CACHE_TTL,
+    POPULAR_WINDOWS,
+    get_popular_cache_key,
+    get_top_post_ids,
+    record_like_score,
+    remove_post_from_rankings,
+)
+from app.utils.executor_utils import MediaBusyError
+from app.utils.search_utils import index_post, remove_post_index, search_posts
+from app.utils.image_hash_utils import (
+    MAX_SEARCH_DISTANCE,
+    NEAR_DUPLICATE_DISTANCE,
+    get_duplicate_clusters,
+    remove_post_image_hashes,
+)
+from app.utils.storage_utils import get_blob_size, release_blob, store_upload
+from app.utils.upload_session_utils import (
+    claim_completed_upload,
+    delete_upload_session,
+    get_upload_session,
+    release_claimed_upload,
+    store_completed_upload,
+)
 from app.utils.dependancies import get_mongo_engine, get_redis_client
-import os
 from app.dtos.post import CreateComment, PostUpdate, UpdateComment
-from app.utils.time_util import get_seconds_until_midnight_kst
+from app.utils.upload_utils import (
+    MAX_IMAGE_COUNT,
+    MAX_UPLOAD_SIZES,
+    get_upload_kind,
+    to_static_url,
+    to_upload_path,
+)
 from app.utils.user_utils import (
     decrement_feather,
     get_user_by_object_id,
     increment_feather,
+    invalidate_user_cache,
+)
+from app.utils.token_utils import (
+    get_current_user_id,
+    get_optional_user_id,
+    verify_admin,
 )
-from app.utils.token_utils import get_current_user_id, verify_admin
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/post")
-MAX_VIDEO_SIZE = 30 * 1024 * 1024  # 50MB
 
 
 # Create - 게시글 생성
@@ -49,115 +121,125 @@ async def create_post(
         ..., description="게시글에 추가할 태그들", example=["Python", "FastAPI"]
     ),
     files: List[UploadFile] = File(
-        ..., description="업로드할 이미지 또는 비디오 파일들"
+        [], description="업로드할 이미지 또는 비디오 파일들"
+    ),
+    upload_ids: List[str] = Form(
+        [], description="이어 올리기로 업로드를 완료한 파일들의 업로드 ID"
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     try:
+        if not files and not upload_ids:
+            raise HTTPException(status_code=400, detail="첨부할 파일이 없습니다.")
+
+        # 파일 종류 확인 (지원하지 않는 형식이면 저장 전에 거절)
+        file_kinds = [get_upload_kind(file.content_type) for file in files]
+
+        # 이어 올리기로 완료된 업로드 확인
+        uploads = [
+            await get_upload_session(redis, upload_id, user_id) for upload_id in upload_ids
+        ]
+        upload_kinds = [upload["kind"] for upload in uploads]
+
         # 이미지 파일의 개수 제한
-        image_files = [file for file in files if file.content_type.startswith("image/")]
-        if len(image_files) > 5:
+        if (file_kinds + upload_kinds).count("image") > MAX_IMAGE_COUNT:
             raise HTTPException(
-                status_code=400, detail="최대 5개의 이미지 파일만 업로드할 수 있습니다."
+                status_code=400,
+                detail=f"최대 {MAX_IMAGE_COUNT}개의 이미지 파일만 업로드할 수 있습니다.",
             )
 
         file_objects = []
-        for file in files:
-            # 파일 MIME 타입 확인
-            file_type = file.content_type
-
-            if file_type.startswith("video/"):
-                # 파일 크기 검사
-                contents = await file.read()
-                file_size = len(contents)
-                await file.seek(0)  # 파일 포인터를 다시 처음으로 이동
-
-                if file_size > MAX_VIDEO_SIZE:
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"비디오 파일은 {MAX_VIDEO_SIZE // (1024 * 1024)}MB를 초과할 수 없습니다.",
-                    )
-
-            # 이름 중복 제거 위한 시간 접두사
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            new_filename = f"{timestamp}_{file.filename}"
-
-            # 중복된 파일명 처리하기
-            if file_type.startswith("image/"):
-                file_path = os.path.join(UPLOAD_DIRECTORY, "images", new_filename)
-                file_url = f"/static/images/{new_filename}"
-                thumbnail_url = None
-
-            elif file_type.startswith("video/"):
-                file_path = os.path.join(UPLOAD_DIRECTORY, "videos", new_filename)
-                file_url = f"/static/videos/{new_filename}"
-
-                # 비디오일 경우 썸네일 URL 생성
-                thumbnail_path = os.path.join(
-                    UPLOAD_DIRECTORY, "thumbnails", f"{new_filename}_thumbnail.jpg"
+        stored_paths = []
+        claimed_upload_ids = []
+        try:
+            for file, file_kind in zip(files, file_kinds):
+                # 파일을 청크 단위로 저장하면서 내용 해시 계산 (종류별 최대 크기를 넘으면 413)
+                # 같은 내용의 파일이 이미 있으면 새로 저장하지 않고 공유
+                file_path = await store_upload(engine, file, MAX_UPLOAD_SIZES[file_kind])
+                stored_paths.append((file_path, file_kind))
+
+            for upload_id in upload_ids:
+                # 완료된 업로드를 첨부 중으로 표시하고 저장소에 저장 (같은 업로드는 한 게시글에만 첨부)
+                upload = await claim_completed_upload(redis, upload_id, user_id)
+                claimed_upload_ids.append(upload_id)
+                file_path = await store_completed_upload(engine, upload_id, upload)
+                stored_paths.append((file_path, upload["kind"]))
+
+            for file_path, file_kind in stored_paths:
+                # MediaFile 객체 생성 및 리스트에 추가
+                # 썸네일 생성 등 후처리가 필요한 파일은 대기 상태로 저장하고 워커가 처리
+                file_object = MediaFile(
+                    url=to_static_url(file_path),
+                    file_type=file_kind,
+                    size=await get_blob_size(file_path),
                 )
-                thumbnail_url = f"/static/thumbnails/{new_filename}_thumbnail.jpg"
-            else:
+                if get_media_job_type(file_object):
+                    file_object.status = MEDIA_STATUS_PENDING
+                file_objects.append(file_object)
+
+            # 작성자 정보
+            user = await engine.find_one(User, User.id == user_id)
+            if user is None:
                 raise HTTPException(
-                    status_code=400, detail=f"{file_type} is an unsupported file type"
+                    status_code=404, detail=f"ID가 '{user_id}'인 사용자를 찾을 수 없습니다."
                 )
 
-            # 파일 저장
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "wb") as buffer:
-                buffer.write(await file.read())
-
-            # 파일이 저장된 후 비디오일 경우 썸네일 생성
-            if file_type.startswith("video/"):
-                create_video_thumbnail(file_path, thumbnail_path)
-
-            # MediaFile 객체 생성 및 리스트에 추가
-            file_object = MediaFile(
-                url=file_url,
-                file_type=file_type.split("/")[0],
-                thumbnail_url=thumbnail_url,
+            new_post = Post(
+                title=title,
+                content=content,
+                files=file_objects,
+                tags=tags,
+                user_id=user.id,
+                nick_name=user.nick_name,
             )
-            file_objects.append(file_object)
-
-        # 작성자 정보
-        user = await engine.find_one(User, User.id == user_id)
-        if user is None:
-            raise HTTPException(
-                status_code=404, detail=f"ID가 '{user_id}'인 사용자를 찾을 수 없습니다."
-            )
-
-        new_post = Post(
-            title=title,
-            content=content,
-            files=file_objects,
-            tags=tags,
-            user_id=user.id,
-            nick_name=user.nick_name,
-        )
+            new_post = await engine.save(new_post)
+        except BaseException:
+            # 게시글이 저장되지 않았으면 저장한 파일의 참조 해제 (이어 올리기 업로드는 다시 첨부할 수 있게 되돌림)
+            for file_path, _ in stored_paths:
+                await release_blob(engine, file_path)
+            for upload_id in claimed_upload_ids:
+                await release_claimed_upload(redis, upload_id)
+            raise
+
+        # 게시글이 저장된 뒤에 첨부한 업로드 세션과 받은 파일 삭제
+        for upload_id in claimed_upload_ids:
+            await delete_upload_session(redis, upload_id)
 
         # 게시글 작성 시 깃털 증가
         await increment_feather(engine, user.id)
+        await invalidate_user_cache(redis, user.id)
+
+        # 미디어 후처리 작업 등록 (응답은 처리 완료를 기다리지 않음)
+        await enqueue_post_media_jobs(redis, new_post)
 
-        new_post = await engine.save(new_post)
+        # 검색 색인 추가
+        await index_post(engine, new_post)
 
         # 로그 출력
         logger.info(
             f"새 게시글 생성 성공. 제목:{new_post.title}, 작성자:{new_post.nick_name}, 현재 보유 깃털:{user.feather}"
         )
 
-        return new_post
+        return to_post_response(new_post)
     except HTTPException as http_ex:
         logger.error(
-            f"게시글 생성 실패: {user_id} ({user.email if user.email else '이메일 정보 찾을 수 없음'})",
+            f"게시글 생성 실패: {user_id}",
             exc_info=True,
         )
 
         # http 에러는 다시 raise해서 그대로 클라이언트에 전달
         raise http_ex
+    except MediaBusyError:
+        logger.warning(f"게시글 생성 실패(미디어 작업 대기열 초과): {user_id}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 미디어를 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
     except Exception as ex:
         logger.error(
-            f"게시글 생성 실패: {user_id} ({user.email if user.email else '이메일 정보 찾을 수 없음'})",
+            f"게시글 생성 실패: {user_id}",
             exc_info=True,
         )
         raise HTTPException(
@@ -168,16 +250,30 @@ async def create_post(
 
 # Read - 모든 게시글 조회
 @router.get("/")
-async def read_post(engine: AIOEngine = Depends(get_mongo_engine)):
+async def read_post(
+    limit: int = Query(
+        DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="한 페이지의 게시글 수"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="이전 응답의 next_cursor (첫 페이지는 생략)"
+    ),
+    engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: Optional[ObjectId] = Depends(get_optional_user_id),
+):
     """
-    이 엔드포인트는 모든 게시글을 조회합니다.
-    결과는 생성일 기준으로 정렬됩니다.
+    이 엔드포인트는 게시글을 커서 기반으로 페이지 단위 조회합니다.
+    결과는 생성일 기준 최신순으로 정렬되며, 다음 페이지는 next_cursor로 요청합니다.
     """
     try:
-        posts = await engine.find(Post, sort=Post.created_at)
-        if not posts:
+        posts, next_cursor = await paginate_posts(
+            engine, sort_by="created_at", limit=limit, cursor=cursor
+        )
+        if not posts and cursor is None:
             raise HTTPException(status_code=404, detail="Post not found")
-        return posts
+        return {
+            "posts": await build_post_responses(engine, posts, user_id),
+            "next_cursor": next_cursor,
+        }
     except HTTPException as http_ex:
         logger.error(f"게시글 전체 조회 실패", exc_info=True)
 
@@ -198,39 +294,45 @@ async def read_post(
         None, description="게시글 제목 또는 태그에 포함될 검색어"
     ),
     sort_by: str = Query(
-        "created_at",
-        enum=["created_at", "likes"],
-        description="정렬 기준 (created_at: 최신순, likes: 좋아요 많은 순)",
+        "relevance",
+        enum=["relevance", "created_at", "likes"],
+        description="정렬 기준 (relevance: 정확도순, created_at: 최신순, likes: 좋아요 많은 순)",
+    ),
+    limit: int = Query(
+        DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="한 페이지의 게시글 수"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="이전 응답의 next_cursor (첫 페이지는 생략)"
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: Optional[ObjectId] = Depends(get_optional_user_id),
 ):
     """
     이 엔드포인트는 게시글을 검색합니다.
-    제목 또는 태그에 검색어가 포함된 게시글만 조회하며,
-    결과는 최신순 혹은 좋아요 많은 순으로 정렬됩니다.
+    제목 또는 태그의 n-gram 역색인으로 검색어와 일치하는 게시글을 조회하며,
+    결과는 정확도순, 최신순 혹은 좋아요 많은 순으로 정렬되어 커서 기반으로 페이지 단위 반환됩니다.
+    검색어가 없으면 전체 게시글을 최신순(또는 좋아요순)으로 반환합니다.
     """
-    # try:
-    #     posts = await engine.find(Post, sort=Post.created_at)
-    #     if not posts:
-    #         raise HTTPException(status_code=404, detail="Post not found")
-    #     return posts
     try:
-        query = {}
-        
-         # 검색어가 있을 경우 제목과 태그에서 검색 (odmantic 방식으로)
-        if search:
-            regex = re.compile(search, re.IGNORECASE)  # 대소문자 구분 없이 정규 표현식 생성
-            query = {"$or": [Post.title.match(regex), Post.tags.match(regex)]}
-
-        # 정렬 기준 설정
-        sort_field = Post.created_at if sort_by == "created_at" else Post.likes_count
-        
-        # 검색 및 정렬된 결과 가져오기
-        posts = await engine.find(Post, query, sort=sort_field)
-
-        if not posts:
+        if search and search.strip():
+            # 역색인에서 검색 및 정렬된 결과 가져오기
+            posts, next_cursor = await search_posts(
+                engine, search, sort_by=sort_by, limit=limit, cursor=cursor
+            )
+        else:
+            posts, next_cursor = await paginate_posts(
+                engine,
+                sort_by="likes" if sort_by == "likes" else "created_at",
+                limit=limit,
+                cursor=cursor,
+            )
+
+        if not posts and cursor is None:
             raise HTTPException(status_code=404, detail="Post not found")
-        return posts
+        return {
+            "posts": await build_post_responses(engine, posts, user_id),
+            "next_cursor": next_cursor,
+        }
 
     except HTTPException as http_ex:
         logger.error(f"게시글 검색 및 조회 실패", exc_info=True)
@@ -245,37 +347,149 @@ async def read_post(
         )
 
 
-# 인기 게시글 상위 n+1개를 반환하는 엔드포인트
-@router.get("/popular", response_model=List[Post])
+# 비슷한 이미지(재업로드) 묶음을 반환하는 관리자용 엔드포인트
+@router.get("/duplicates")
+async def get_duplicate_image_clusters(
+    max_distance: int = Query(
+        NEAR_DUPLICATE_DISTANCE,
+        ge=0,
+        le=MAX_SEARCH_DISTANCE,
+        description="같은 이미지로 볼 최대 해밍 거리 (64비트 지각 해시 기준)",
+    ),
+    min_size: int = Query(2, ge=2, description="반환할 묶음의 최소 이미지 수"),
+    limit: int = Query(50, ge=1, le=500, description="반환할 최대 묶음 수"),
+    engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: ObjectId = Depends(get_current_user_id),
+):
+    """
+    이 엔드포인트는 지각 해시가 비슷한 이미지끼리 묶어서 반환합니다. (관리자 전용)
+
+    - **max_distance**: 같은 이미지로 볼 최대 해밍 거리
+    - **min_size**: 반환할 묶음의 최소 이미지 수
+    - **limit**: 반환할 최대 묶음 수 (큰 묶음부터)
+    """
+    try:
+        if not await verify_admin(engine, user_id):
+            raise HTTPException(status_code=403, detail="관리자가 아닙니다.")
+
+        clusters = await get_duplicate_clusters(engine, max_distance, min_size)
+        return {
+            "total": len(clusters),
+            "clusters": [
+                [
+                    {
+                        "post_id": str(image_hash.post_id),
+                        "media_id": str(image_hash.media_id),
+                        "phash": image_hash.phash,
+                        "created_at": image_hash.created_at,
+                    }
+                    for image_hash in cluster
+                ]
+                for cluster in clusters[:limit]
+            ],
+        }
+    except HTTPException as http_ex:
+        logger.error(f"중복 이미지 묶음 조회 실패 사용자ID:{user_id}", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except Exception as ex:
+        logger.error(f"중복 이미지 묶음 조회 실패 사용자ID:{user_id}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# 좋아요/댓글 알림 전송 통계를 반환하는 관리자용 엔드포인트
+@router.get("/notifications/stats")
+async def read_notification_stats(
+    engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 알림 전송 누적 건수와 현재 대기 중인 알림 수를 반환합니다. (관리자 전용)
+
+    - 누적 건수: enqueued, flushed, sent, failed 등 항목별 건수
+    - **queued**: 전송 대기 중인 알림 이벤트 수
+    - **retrying**: 재시도 예약된 알림 이벤트 수
+    - **coalescing**: 모으는 중인 게시글/종류별 알림 수
+    """
+    try:
+        if not await verify_admin(engine, user_id):
+            raise HTTPException(status_code=403, detail="관리자가 아닙니다.")
+
+        return await get_notification_stats(redis)
+    except HTTPException as http_ex:
+        logger.error(f"알림 전송 통계 조회 실패 사용자ID:{user_id}", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except Exception as ex:
+        logger.error(f"알림 전송 통계 조회 실패 사용자ID:{user_id}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# 인기 게시글 상위 n개를 반환하는 엔드포인트
+@router.get("/popular", response_model=List[PostResponseModel])
 async def get_popular_posts(
+    window: str = Query(
+        DEFAULT_POPULAR_WINDOW,
+        enum=list(POPULAR_WINDOWS),
+        description="집계 기간 (24h: 최근 24시간, 7d: 최근 7일, 30d: 최근 30일)",
+    ),
+    limit: int = Query(5, ge=1, le=50, description="반환할 인기 게시글 수"),
     engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: Optional[ObjectId] = Depends(get_optional_user_id),
     redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
-    일간 인기순위 상위의 게시글을 반환합니다.
-    상위 n개는 내부적으로 고정된 값입니다.
+    최근 24시간/7일/30일 동안의 인기순위 상위 게시글을 반환합니다.
+    순위는 시간/일 단위 점수 버킷을 합산한 값이며, 날짜가 바뀌어도 초기화되지 않습니다.
+    조회된 게시글 목록은 짧은 시간 동안 Redis에 캐싱되며, 점수가 바뀌면 무효화됩니다.
     """
     try:
-        # 상위 고정 값
-        n = 4
-
-        # Redis에서 상위 n+1개의 인기 게시글 ID 가져오기
-        popular_post_ids = await redis.zrevrange("popular_posts", 0, n)
+        # 캐시된 응답이 있으면 DB 조회 없이 반환
+        cache_key = get_popular_cache_key(window)
+        cached = await get_cached_field(redis, cache_key, str(limit))
+        if cached is None:
+            # Redis에서 기간 내 상위 limit개의 인기 게시글 ID 가져오기
+            popular_post_ids = await get_top_post_ids(redis, window, limit)
+
+            if not popular_post_ids:
+                raise HTTPException(status_code=404, detail="인기 게시글이 없습니다.")
+
+            # 가져온 인기 게시글 ID 리스트로 한 번에 게시글 정보 조회 (순위 순서 유지)
+            popular_posts = await get_posts_by_ids(
+                engine, [ObjectId(post_id) for post_id in popular_post_ids]
+            )
 
-        if not popular_post_ids:
-            raise HTTPException(status_code=404, detail="인기 게시글이 없습니다.")
+            if not popular_posts:
+                raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-        # 가져온 인기 게시글 ID 리스트로 DB에서 게시글 정보 조회
-        popular_posts = []
-        for post_id in popular_post_ids:
-            post = await engine.find_one(Post, Post.id == ObjectId(post_id))
-            if post:
-                popular_posts.append(post)
+            cached = await set_cached_field_json(
+                redis,
+                cache_key,
+                str(limit),
+                [to_post_response(post).model_dump(mode="json") for post in popular_posts],
+                POPULAR_POSTS_CACHE_TTL,
+            )
 
-        if not popular_posts:
-            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+        # 비로그인 사용자는 캐시된 본문을 그대로 응답
+        if user_id is None:
+            return Response(content=cached, media_type="application/json")
 
-        return popular_posts
+        posts = json.loads(cached)
+        liked_ids = await get_liked_post_ids(
+            engine, user_id, [ObjectId(post["id"]) for post in posts]
+        )
+        for post in posts:
+            post["is_liked_by_me"] = ObjectId(post["id"]) in liked_ids
+        return posts
     except HTTPException as http_ex:
         logger.error(f"인기글 조회 실패", exc_info=True)
 
@@ -297,6 +511,7 @@ async def read_post(
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글에 특정 댓글을 수정합니다.
@@ -323,9 +538,11 @@ async def read_post(
 
         # 댓글 저장 (업데이트)
         await engine.save(existing_comment)
+        await invalidate_comments_cache(redis, existing_comment.post_id)
 
         # 댓글 수정 시 깃털 감소
         await decrement_feather(engine, user.id)
+        await invalidate_user_cache(redis, user.id)
         logger.info(
             f"댓글 수정 성공. 사용자:{user.nick_name}, 댓글ID:{comment_id}, 보유 깃털:{user.feather})"
         )
@@ -355,6 +572,7 @@ async def read_post(
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글에 특정 댓글을 블라인드합니다.
@@ -376,6 +594,7 @@ async def read_post(
 
         # 댓글 저장 (업데이트)
         await engine.save(existing_comment)
+        await invalidate_comments_cache(redis, existing_comment.post_id)
 
         return existing_comment
     except HTTPException as http_ex:
@@ -405,62 +624,25 @@ async def like_post(
     이 엔드포인트는 특정 게시글에 좋아요를 추가하거나 취소합니다.
     """
     try:
-        # 현재 사용자 가져오기
-        user = await get_user_by_object_id(engine, user_id)
-
-        # 게시글 정보 가져오기
-        post = await engine.find_one(Post, Post.id == post_id)
-        if not post:
-            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
-
-        # 이미 좋아요를 눌렀는지 확인
-        if user.id in post.liked_users_id:
-            # 이미 좋아요를 눌렀다면, 좋아요 취소
-            post.liked_users_id.remove(user.id)
-            post.likes_count -= 1
-            liked = False
-
-        else:
-            # 좋아요 추가
-            post.liked_users_id.append(user.id)
-            post.likes_count += 1
-            liked = True
-
-            # redis용 문자열
-            str_post_id = str(post_id)
-            str_user_id = str(user_id)
-
-            # 24시간 이내에 동일 사용자가 좋아요를 눌렀는지 확인
-            notification_exists = await redis.hexists(
-                f"post:{str_post_id}:like_user", str_user_id
-            )
+        # 현재 사용자 확인
+        await get_user_by_object_id(engine, user_id)
 
-            # 캐싱되지 않았다면 추가
-            if not notification_exists:
-                # 좋아요 알림 발송
-                await send_like_notification(engine, user_id, post_id)
+        # 좋아요 추가 또는 취소 후 갱신된 게시글 반환 (게시글이 없으면 404)
+        liked, post = await toggle_like(engine, post_id, user_id)
 
-                # 알림 성공적으로 발송 시
-                logger.info(f"좋아요 알림 전송 성공: 사용자 ID - {user_id}, 게시글 ID - {post_id}")
+        # 좋아요 수가 바뀌었으므로 상세 캐시 무효화
+        await invalidate_post_cache(redis, post_id)
 
-                # HSET으로 유저 정보를 저장
-                await redis.hset(f"post:{str_post_id}:like_user", str_user_id, "notified")
+        if liked:
+            # 오늘 처음 누른 좋아요일 때만 현재 시간/일 버킷의 인기 점수 증가 (Redis 왕복 1회)
+            is_first_like = await record_like_score(redis, str(post_id), str(user_id))
 
-                # 한국 시간 기준으로 자정까지 남은 시간 계산
-                seconds_until_midnight = get_seconds_until_midnight_kst()
+            if is_first_like:
+                # 좋아요 알림 등록 (전송은 워커가 Firebase로 일괄 처리하므로 기다리지 않음)
+                await send_like_notification(redis, user_id, post_id)
+                logger.info(f"좋아요 알림 등록: 사용자 ID - {user_id}, 게시글 ID - {post_id}")
 
-                # 다음 00시까지 남은 시간 동안 만료 설정
-                await redis.expire(f"post:{str_post_id}:like_user", seconds_until_midnight)
-
-                # ZSET에 좋아요 증가 기록 추가
-                await redis.zincrby("popular_posts", 1, f"{str_post_id}")
-
-                # ZSET 만료 시간 설정 (자정까지 남은 시간)
-                await redis.expire("popular_posts", seconds_until_midnight)
-
-        await engine.save(post)
-
-        return {"liked": liked, "post": post}
+        return {"liked": liked, "post": to_post_response(post, liked)}
     except HTTPException as http_ex:
         logger.error(
             f"게시글 좋아요 처리 실패 게시글ID:{post_id} 사용자ID:{user_id}",
@@ -482,27 +664,38 @@ async def like_post(
 
 @router.get("/{post_id}/comments")
 async def read_post(
+    request: Request,
     post_id: ObjectId = Path(
         ..., description="수정할 게시글의 고유 ID", example="614c1b5f27f3b87636d1c2a5"
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글의 모든 댓글 목록을 반환합니다.
+    댓글 목록은 Redis에 캐싱되며, ETag와 같은 If-None-Match를 보내면 304를 응답합니다.
     """
     try:
-        # 게시글 ID로 가져오기
-        post = await engine.find_one(Post, Post.id == post_id)
 
-        if not post:
-            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+        async def load_comments():
+            # 게시글 ID로 가져오기
+            post = await engine.find_one(Post, Post.id == post_id)
+            if not post:
+                return None
+
+            # 게시글 ID를 가지는 모든 댓글 가져오기
+            comments = await engine.find(
+                Comment, Comment.post_id == post_id, sort=Comment.created_at
+            )
+            return jsonable_encoder(comments)
 
-        # 게시글 ID를 가지는 모든 댓글 가져오기
-        comments = await engine.find(
-            Comment, Comment.post_id == post_id, sort=Comment.created_at
+        cached = await get_or_load_cached(
+            redis, get_post_comments_cache_key(post_id), POST_COMMENTS_CACHE_TTL, load_comments
         )
+        if cached is None:
+            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-        return comments
+        return conditional_json_response(request, cached)
     except HTTPException as http_ex:
         logger.error(f"댓글 가져오기 처리 실패 게시글ID:{post_id}", exc_info=True)
 
@@ -524,6 +717,7 @@ async def create_comment(
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글에 댓글을 생성합니다.
@@ -549,9 +743,10 @@ async def create_comment(
             post_id=post_id,
         )
         await engine.save(new_comment)
+        await invalidate_comments_cache(redis, post_id)
 
-        # 댓글 알림을 작성자에게 전송합니다.
-        await send_comment_notification(engine, user.id, post.id)
+        # 댓글 알림을 작성자에게 전송합니다. (워커가 일괄 전송하므로 기다리지 않음)
+        await send_comment_notification(redis, user.id, post.id)
 
         return new_comment
     except HTTPException as http_ex:
@@ -574,19 +769,46 @@ async def create_comment(
 # Read - 게시글 조회 (ID 기반)
 @router.get("/{post_id}")
 async def read_post(
+    request: Request,
     post_id: ObjectId = Path(
         ..., description="조회할 게시글의 고유 ID", example="614c1b5f27f3b87636d1c2a5"
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
+    user_id: Optional[ObjectId] = Depends(get_optional_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     try:
         """
         이 엔드포인트는 특정 게시글을 조회합니다.
+        게시글 본문은 Redis에 캐싱되며, 게시글이 바뀌면 무효화됩니다.
+        응답의 ETag와 같은 If-None-Match를 보내면 본문 없이 304를 응답합니다.
         """
-        post = await engine.find_one(Post, Post.id == post_id)
-        if not post:
+
+        async def load_post():
+            post = await engine.find_one(Post, Post.id == post_id)
+            return to_post_response(post).model_dump(mode="json") if post else None
+
+        cached = await get_or_load_cached(
+            redis, get_post_detail_cache_key(post_id), POST_DETAIL_CACHE_TTL, load_post
+        )
+        if cached is None:
             raise HTTPException(status_code=404, detail="Post not found")
-        return post
+
+        # 비로그인 사용자는 캐시된 본문을 그대로 응답
+        if user_id is None:
+            return conditional_json_response(request, cached)
+
+        # 로그인 사용자는 좋아요 여부에 따라 본문이 달라지므로 ETag에 반영
+        is_liked = bool(await get_liked_post_ids(engine, user_id, [post_id]))
+        etag = make_etag(cached, f"liked={int(is_liked)}")
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        post = json.loads(cached)
+        post["is_liked_by_me"] = is_liked
+        return json_etag_response(
+            json.dumps(post, ensure_ascii=False, separators=(",", ":")), etag
+        )
     except HTTPException as http_ex:
         logger.error(
             f"게시글 세부 정보 가져오기 실패 게시글ID:{post_id}", exc_info=True
@@ -613,6 +835,7 @@ async def update_post(
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글의 내용을 수정합니다.
@@ -637,7 +860,15 @@ async def update_post(
         post.tags = post_update.tags
 
         await engine.save(post)
-        return post
+
+        # 검색 색인 갱신
+        await index_post(engine, post)
+
+        # 상세 캐시 무효화
+        await invalidate_post_cache(redis, post.id)
+
+        liked_ids = await get_liked_post_ids(engine, user_id, [post.id])
+        return to_post_response(post, post.id in liked_ids)
     except HTTPException as http_ex:
         logger.error(
             f"게시글 수정 실패 게시글ID:{post_id} 사용자ID:{user_id}", exc_info=True
@@ -663,6 +894,7 @@ async def delete_post(
     ),
     engine: AIOEngine = Depends(get_mongo_engine),
     user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),  # Redis 인스턴스 의존성
 ):
     """
     이 엔드포인트는 특정 게시글을 삭제합니다.
@@ -681,7 +913,22 @@ async def delete_post(
             )
 
         await engine.delete(post)
-        return post
+
+        # 검색 색인 및 좋아요 기록 제거
+        await remove_post_index(engine, post.id)
+        await delete_post_likes(engine, post.id)
+        await remove_post_image_hashes(engine, post.id)
+
+        # 첨부 파일 참조 해제 (다른 게시글이 같은 파일을 쓰지 않으면 삭제)
+        for media in post.files:
+            await release_blob(engine, to_upload_path(media.url))
+
+        # 인기 게시글 순위에서 제거 및 상세 캐시 무효화
+        await remove_post_from_rankings(redis, str(post.id))
+        await invalidate_post_cache(redis, post.id)
+        await invalidate_comments_cache(redis, post.id)
+
+        return to_post_response(post)
     except HTTPException as http_ex:
         logger.error(
             f"게시글 삭제 실패 게시글ID:{post_id} 사용자ID:{user_id}", exc_info=True
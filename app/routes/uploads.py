@@ -0,0 +1,190 @@
+import logging
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
+from odmantic import ObjectId
+import redis.asyncio as aioredis
+
+from app.dtos.upload import CreateUploadSession, UploadSessionResponseModel
+from app.utils.dependancies import get_redis_client
+from app.utils.executor_utils import MediaBusyError
+from app.utils.token_utils import get_current_user_id
+from app.utils.upload_session_utils import (
+    append_upload_chunk,
+    complete_upload_session,
+    create_upload_session,
+    delete_upload_session,
+    get_upload_session,
+    to_upload_session_response,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/upload")
+
+
+# Create - 이어 올리기 업로드 세션 생성
+@router.post("/", status_code=201, response_model=UploadSessionResponseModel)
+async def create_upload(
+    upload_info: CreateUploadSession,
+    response: Response,
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 큰 파일을 여러 조각으로 나눠 올리기 위한 업로드 세션을 생성합니다.
+
+    1. 세션을 생성하고 upload_id를 받습니다.
+    2. PATCH /upload/{upload_id}로 Upload-Offset 헤더와 함께 조각을 순서대로 보냅니다.
+       연결이 끊기면 GET /upload/{upload_id}로 받은 offset부터 다시 보냅니다.
+    3. POST /upload/{upload_id}/complete로 완료한 뒤 게시글 생성 시 upload_ids로 전달합니다.
+    """
+    try:
+        upload_id = await create_upload_session(
+            redis,
+            user_id,
+            upload_info.filename,
+            upload_info.content_type,
+            upload_info.size,
+        )
+        session = await get_upload_session(redis, upload_id, user_id)
+        response.headers["Upload-Offset"] = session["offset"]
+        return to_upload_session_response(upload_id, session)
+    except HTTPException as http_ex:
+        logger.error(f"업로드 세션 생성 실패: {user_id}", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except MediaBusyError:
+        logger.warning(f"업로드 세션 생성 실패(미디어 작업 대기열 초과): {user_id}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 미디어를 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
+    except Exception as ex:
+        logger.error(f"업로드 세션 생성 실패: {user_id}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# Read - 업로드 진행 상태 조회 (재시도 시 이어 보낼 위치 확인)
+@router.get("/{upload_id}", response_model=UploadSessionResponseModel)
+async def read_upload(
+    response: Response,
+    upload_id: str = Path(..., pattern="^[0-9a-f]{32}$", description="업로드 ID"),
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 업로드 세션의 진행 상태를 반환합니다.
+    """
+    try:
+        session = await get_upload_session(redis, upload_id, user_id)
+        response.headers["Upload-Offset"] = session["offset"]
+        return to_upload_session_response(upload_id, session)
+    except HTTPException as http_ex:
+        logger.error(f"업로드 상태 조회 실패: {upload_id} ({user_id})", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except Exception as ex:
+        logger.error(f"업로드 상태 조회 실패: {upload_id} ({user_id})", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# Update - 조각 전송
+@router.patch("/{upload_id}", response_model=UploadSessionResponseModel)
+async def upload_chunk(
+    request: Request,
+    response: Response,
+    upload_id: str = Path(..., pattern="^[0-9a-f]{32}$", description="업로드 ID"),
+    upload_offset: int = Header(..., ge=0, description="이 조각의 시작 위치(바이트)"),
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 요청 본문(application/offset+octet-stream)을 업로드 파일의 Upload-Offset 위치에 이어 붙입니다.
+
+    - 위치가 서버가 받은 크기와 다르면 409와 함께 현재 위치를 Upload-Offset 헤더로 반환합니다.
+    """
+    try:
+        session = await append_upload_chunk(
+            redis, upload_id, user_id, upload_offset, request.stream()
+        )
+        response.headers["Upload-Offset"] = session["offset"]
+        return to_upload_session_response(upload_id, session)
+    except HTTPException as http_ex:
+        logger.error(f"업로드 조각 저장 실패: {upload_id} ({user_id})", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except MediaBusyError:
+        logger.warning(f"업로드 조각 저장 실패(미디어 작업 대기열 초과): {upload_id} ({user_id})")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 미디어를 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
+    except Exception as ex:
+        logger.error(f"업로드 조각 저장 실패: {upload_id} ({user_id})", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# Update - 업로드 완료
+@router.post("/{upload_id}/complete", response_model=UploadSessionResponseModel)
+async def complete_upload(
+    upload_id: str = Path(..., pattern="^[0-9a-f]{32}$", description="업로드 ID"),
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 모든 조각을 받은 업로드를 완료 처리합니다.
+    완료된 업로드는 게시글 생성 시 upload_ids로 첨부할 수 있습니다.
+    """
+    try:
+        session = await complete_upload_session(redis, upload_id, user_id)
+        return to_upload_session_response(upload_id, session)
+    except HTTPException as http_ex:
+        logger.error(f"업로드 완료 처리 실패: {upload_id} ({user_id})", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except Exception as ex:
+        logger.error(f"업로드 완료 처리 실패: {upload_id} ({user_id})", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
+
+
+# Delete - 업로드 취소
+@router.delete("/{upload_id}")
+async def delete_upload(
+    upload_id: str = Path(..., pattern="^[0-9a-f]{32}$", description="업로드 ID"),
+    user_id: ObjectId = Depends(get_current_user_id),
+    redis: aioredis.Redis = Depends(get_redis_client),
+):
+    """
+    이 엔드포인트는 업로드 세션을 취소하고 받은 조각을 삭제합니다.
+    """
+    try:
+        await get_upload_session(redis, upload_id, user_id)
+        await delete_upload_session(redis, upload_id)
+        return {"msg": "업로드가 취소되었습니다."}
+    except HTTPException as http_ex:
+        logger.error(f"업로드 취소 실패: {upload_id} ({user_id})", exc_info=True)
+
+        # http 에러는 다시 raise해서 그대로 클라이언트에 전달
+        raise http_ex
+    except Exception as ex:
+        logger.error(f"업로드 취소 실패: {upload_id} ({user_id})", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="서버 내부 오류가 발생했습니다.",
+        )
@@ -1,8 +1,7 @@
 from datetime import datetime, timedelta
-import os
-from fastapi import APIRouter, File, HTTPException, Depends, Body, UploadFile
+from fastapi import APIRouter, File, HTTPException, Depends, Body, Request, UploadFile
 from odmantic import AIOEngine, ObjectId
-from app.database.models.post import Post
+from app.database.models.post import ImageVariant, Post
 from app.database.models.user import User
 from app.dtos.user import (
     DeleteUserResponseModel,
@@ -12,10 +11,21 @@ from app.dtos.user import (
     UserResponseModel,
     UserUpdate,
 )
+from app.utils.cache_utils import get_or_load_cached
 from app.utils.dependancies import get_mongo_engine, get_redis_client
-from app.utils.settings import UPLOAD_DIRECTORY
+from app.utils.executor_utils import MediaBusyError
+from app.utils.etag_utils import conditional_json_response
+from app.utils.media_job_utils import generate_image_variants
+from app.utils.post_utils import invalidate_post_cache
+from app.utils.storage_utils import open_local_blob, release_blob, store_upload
 from app.utils.time_util import get_seconds_until_midnight_kst
 from app.utils.token_utils import get_current_user_id
+from app.utils.upload_utils import MAX_IMAGE_SIZE, to_static_url
+from app.utils.user_utils import (
+    USER_CACHE_TTL,
+    get_user_cache_key,
+    invalidate_user_cache,
+)
 import redis.asyncio as aioredis
 
 import logging
@@ -55,6 +65,7 @@ async def get_user(
 async def ad_reward(
     user_id: ObjectId = Depends(get_current_user_id),
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     이 엔드포인트에서 보상형 광고를 시청하고 깃털을 얻습니다.
@@ -70,6 +81,7 @@ async def ad_reward(
         # 사용자에게 보상을 주는 로직
         user.feather += 10
         await engine.save(user)
+        await invalidate_user_cache(redis, user_id)
 
         # ODMantic User 객체를 Pydantic UserResponseModel로 변환 후 반환
         return {
@@ -126,6 +138,7 @@ async def check_in(
         # 사용자에게 보상을 주는 로직 (예시로 깃털 하나 얻기)
         user.feather += 1
         await engine.save(user)
+        await invalidate_user_cache(redis, user_id)
 
         # ODMantic User 객체를 Pydantic UserResponseModel로 변환 후 반환
         return {
@@ -151,6 +164,7 @@ async def update_user_nick_name(
     user_update: UserUpdate,
     user_id: ObjectId = Depends(get_current_user_id),
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     이 엔드포인트는 사용자의 닉네임을 수정합니다.
@@ -187,13 +201,16 @@ async def update_user_nick_name(
             user.nick_name = user_update.nick_name
             user.last_nick_name_updated_at = datetime.now()
             
-            # 사용자 게시글들의 닉네임 업데이트
-            posts = await engine.find(Post, Post.user_id == user_id)
-            for post in posts:
-                post.nick_name = user_update.nick_name
-                await engine.save(post)  # 게시글 업데이트
+            # 사용자 게시글들의 닉네임을 한 번에 업데이트하고 상세 캐시 무효화
+            post_collection = engine.get_collection(Post)
+            post_ids = await post_collection.distinct("_id", {"user_id": user_id})
+            await post_collection.update_many(
+                {"user_id": user_id}, {"$set": {"nick_name": user_update.nick_name}}
+            )
+            await invalidate_post_cache(redis, *post_ids)
 
         await engine.save(user)
+        await invalidate_user_cache(redis, user_id)
 
         logger.info(f"사용자 업데이트 완료 {old_nick_name} -> {user.nick_name} ({user.email})")
 
@@ -222,6 +239,7 @@ async def update_user_profile_image(
     file: UploadFile = File(..., description="업로드할 이미지 또는 비디오 파일들"),
     user_id: ObjectId = Depends(get_current_user_id),
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     이 엔드포인트는 사용자의 프로필 이미지를 수정합니다.
@@ -241,26 +259,28 @@ async def update_user_profile_image(
                 status_code=400, detail="이미지 파일만 업로드 가능합니다."
             )
 
-        new_filename = f"{user_id}_{file.filename}"
-
-        # 저장할 경로 설정
-        file_path = os.path.join(UPLOAD_DIRECTORY, "profile_images", new_filename)
-        file_url = f"/static/profile_images/{new_filename}"
-
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)  # 디렉터리가 없으면 생성
-        # 파일 저장
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
-
-        # 기존 프로필 이미지 삭제 (선택사항)
-        if user.profile_image_url:
-            if os.path.exists(user.profile_image_url):
-                os.remove(user.profile_image_url)
-
-        # 사용자 프로필 이미지 경로 업데이트
-        user.profile_image_url = file_url
-        user.profile_image_path = file_path
-        await engine.save(user)
+        # 파일을 청크 단위로 저장 (최대 크기를 넘으면 413, 같은 내용의 파일이 있으면 공유)
+        file_path = await store_upload(engine, file, MAX_IMAGE_SIZE)
+        file_url = to_static_url(file_path)
+
+        try:
+            # 크기/형식별 파생본 생성 (프로필 이미지는 한 장이므로 요청 안에서 프로세스 풀로 처리)
+            async with open_local_blob(file_path):
+                variants = await generate_image_variants(file_path)
+
+            # 사용자 프로필 이미지 경로 업데이트
+            old_image_path = user.profile_image_path
+            user.profile_image_url = file_url
+            user.profile_image_path = file_path
+            user.profile_image_variants = [ImageVariant(**variant) for variant in variants]
+            await engine.save(user)
+        except BaseException:
+            await release_blob(engine, file_path)
+            raise
+        await invalidate_user_cache(redis, user_id)
+
+        # 기존 프로필 이미지와 파생본 참조 해제
+        await release_blob(engine, old_image_path)
 
         logger.info(
             f"사용자 프로필 이미지 업데이트 완료: {user.nick_name} (이메일: {user.email}), (경로: {user.profile_image_path})"
@@ -269,6 +289,7 @@ async def update_user_profile_image(
         return {
             "msg": "프로필 이미지가 업데이트되었습니다.",
             "profile_image_url": file_url,
+            "profile_image_variants": variants,
         }
     except HTTPException as http_ex:
         logger.error(
@@ -277,6 +298,12 @@ async def update_user_profile_image(
         )
         # http 에러는 다시 raise해서 그대로 클라이언트에 전달
         raise http_ex
+    except MediaBusyError:
+        logger.warning(f"사용자 프로필 이미지 수정 실패(미디어 작업 대기열 초과): {user_id}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 미디어를 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
     except Exception as ex:
         logger.error(
             f"사용자 프로필 이미지 수정 실패: {user_id} ({user.email if user.email else '이메일 정보 찾을 수 없음'})",
@@ -293,6 +320,7 @@ async def update_user_profile_image(
 async def delete_user(
     user_id: ObjectId,
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     이 엔드포인트는 특정 사용자를 삭제합니다.
@@ -307,6 +335,10 @@ async def delete_user(
             )
 
         await engine.delete(user)
+        await invalidate_user_cache(redis, user_id)
+
+        # 프로필 이미지 참조 해제
+        await release_blob(engine, user.profile_image_path)
 
         logger.info(f"사용자 삭제 완료: {user.nick_name} ({user.email})")
 
@@ -332,38 +364,46 @@ async def delete_user(
 # Read - 사용자 조회
 @router.get("/{user_id}", response_model=UserResponseModel)
 async def get_user_by_id(
+    request: Request,
     user_id: ObjectId,
     engine: AIOEngine = Depends(get_mongo_engine),
+    redis: aioredis.Redis = Depends(get_redis_client),
 ):
     """
     이 엔드포인트는 아이템을 path parameter를 통해 사용자를 조회합니다.
+    사용자 정보는 Redis에 캐싱되며, ETag와 같은 If-None-Match를 보내면 304를 응답합니다.
 
     - **user_id**: 조회할 사용자의 ObjectId
     """
     try:
-        user = await engine.find_one(User, User.id == user_id)
-        if not user:
+
+        async def load_user():
+            found = await engine.find_one(User, User.id == user_id)
+            if not found:
+                return None
+            # Pydantic 모델로 변환
+            return UserResponseModel.model_validate(found).model_dump(mode="json")
+
+        cached = await get_or_load_cached(
+            redis, get_user_cache_key(user_id), USER_CACHE_TTL, load_user
+        )
+        if cached is None:
             raise HTTPException(
                 status_code=404, detail=f"ID가 '{user_id}'인 사용자를 찾을 수 없습니다."
             )
-        # Pydantic 모델로 변환
-        # user_response = UserResponseModel(user)
-
-        # 변환된 데이터 로깅
-        # logger.info(f"변환된 사용자 데이터: {user_response}")
 
-        # 변환된 사용자 데이터를 반환
-        return user
+        # 캐시된 사용자 데이터를 반환
+        return conditional_json_response(request, cached)
     except HTTPException as http_ex:
         logger.error(
-            f"사용자 조회 실패: {user_id} ({user.email if user.email else '이메일 정보 찾을 수 없음'})",
+            f"사용자 조회 실패: {user_id}",
             exc_info=True,
         )
         # http 에러는 다시 raise해서 그대로 클라이언트에 전달
         raise http_ex
     except Exception as ex:
         logger.error(
-            f"사용자 조회 실패: {user_id} ({user.email if user.email else '이메일 정보 찾을 수 없음'})",
+            f"사용자 조회 실패: {user_id}",
             exc_info=True,
         )
         raise HTTPException(
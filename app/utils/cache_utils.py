@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+import redis.asyncio as aioredis
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 캐시 재생성 잠금 만료(초)와 잠금을 얻지 못한 요청의 대기 설정
+CACHE_LOCK_TTL = 5
+CACHE_WAIT_INTERVAL = 0.05
+CACHE_MAX_WAIT = 1.0
+
+# 잠금을 건 요청일 때만 잠금을 해제하는 스크립트
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+async def get_cached_raw(redis: aioredis.Redis, key: str) -> Optional[str]:
+    """
+    캐시된 JSON 문자열을 그대로 반환하는 함수 (응답 본문으로 바로 쓸 때 사용)
+    """
+    return await redis.get(key)
+
+
+async def get_cached_json(redis: aioredis.Redis, key: str) -> Optional[Any]:
+    """
+    캐시된 JSON 값을 파싱해서 반환하는 함수
+    """
+    raw = await redis.get(key)
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def set_cached_json(
+    redis: aioredis.Redis, key: str, value: Any, ttl: int
+) -> str:
+    """
+    값을 JSON 문자열로 직렬화해 만료 시간과 함께 저장하는 함수
+    :return: 저장한 JSON 문자열
+    """
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    await redis.set(key, raw, ex=ttl)
+    return raw
+
+
+async def get_cached_field(
+    redis: aioredis.Redis, key: str, field: str
+) -> Optional[str]:
+    """
+    HASH 캐시에서 필드에 저장된 JSON 문자열을 반환하는 함수
+    (같은 대상의 여러 변형을 한 키에 묶어 한 번에 무효화할 때 사용)
+    """
+    return await redis.hget(key, field)
+
+
+async def set_cached_field_json(
+    redis: aioredis.Redis, key: str, field: str, value: Any, ttl: int
+) -> str:
+    """
+    값을 JSON 문자열로 직렬화해 HASH 캐시의 필드에 저장하는 함수
+    만료 시간은 HASH가 처음 만들어질 때만 설정되어, 필드가 추가되어도 연장되지 않습니다.
+    :return: 저장한 JSON 문자열
+    """
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    pipe = redis.pipeline(transaction=True)
+    pipe.hset(key, field, raw)
+    pipe.expire(key, ttl, nx=True)
+    await pipe.execute()
+    return raw
+
+
+async def invalidate_cache(redis: aioredis.Redis, *keys: str) -> None:
+    """
+    캐시를 무효화하는 함수
+    """
+    if keys:
+        await redis.delete(*keys)
+
+
+async def get_or_load_cached(
+    redis: aioredis.Redis,
+    key: str,
+    ttl: int,
+    loader: Callable[[], Awaitable[Optional[Any]]],
+) -> Optional[str]:
+    """
+    캐시를 먼저 조회하고, 없으면 loader로 값을 만들어 캐싱하는 read-through 함수
+    캐시가 비었을 때 동시에 들어온 요청 중 잠금을 얻은 하나만 loader를 실행하고,
+    나머지는 잠시 캐시가 채워지기를 기다려 DB로 요청이 몰리지 않도록 합니다.
+    :return: 캐시된 JSON 문자열 (loader가 None을 반환하면 None, 이 경우 캐싱하지 않음)
+    """
+    raw = await redis.get(key)
+    if raw is not None:
+        return raw
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if await redis.set(lock_key, token, nx=True, ex=CACHE_LOCK_TTL):
+        try:
+            value = await loader()
+            if value is None:
+                return None
+            return await set_cached_json(redis, key, value, ttl)
+        finally:
+            release = redis.register_script(_RELEASE_LOCK_SCRIPT)
+            await release(keys=[lock_key], args=[token])
+
+    # 다른 요청이 캐시를 채우는 중이면 잠시 대기
+    waited = 0.0
+    while waited < CACHE_MAX_WAIT:
+        await asyncio.sleep(CACHE_WAIT_INTERVAL)
+        waited += CACHE_WAIT_INTERVAL
+        raw = await redis.get(key)
+        if raw is not None:
+            return raw
+
+    # 대기 시간이 지나면 직접 조회 (캐싱은 잠금을 가진 요청에 맡김)
+    logger.warning(f"캐시 대기 시간 초과, 직접 조회: {key}")
+    value = await loader()
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,60 @@
+import hashlib
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+
+# 조건부 응답은 클라이언트가 매번 서버에 재검증하도록 설정
+# (사용자마다 응답이 다를 수 있으므로 공유 캐시에는 저장하지 않음)
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(raw: str, *variants: str) -> str:
+    """
+    응답 본문(JSON 문자열)의 해시로 강한 ETag를 만드는 함수
+    같은 본문이라도 사용자별로 달라지는 값(좋아요 여부 등)은 variants로 구분합니다.
+    """
+    digest = hashlib.sha1(raw.encode("utf-8"))
+    for variant in variants:
+        digest.update(b"\x00" + variant.encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    If-None-Match 헤더에 etag가 포함되어 있는지 확인하는 함수
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교를 사용하므로 W/ 접두사는 무시
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL},
+    )
+
+
+def json_etag_response(raw: str, etag: str) -> Response:
+    return Response(
+        content=raw,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL},
+    )
+
+
+def conditional_json_response(
+    request: Request, raw: str, etag: Optional[str] = None
+) -> Response:
+    """
+    캐시된 JSON 문자열을 ETag와 함께 응답하고, 클라이언트가 같은 ETag를 보내면 304를 응답하는 함수
+    """
+    etag = etag or make_etag(raw)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return json_etag_response(raw, etag)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Callable, Iterator, Optional, TypeVar
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 파일 읽기/쓰기 등 블로킹 I/O를 처리할 스레드 수
+MEDIA_IO_WORKERS = 8
+# 영상 디코딩 등 CPU 작업을 처리할 프로세스 수 (이벤트 루프용 코어 하나는 남김)
+MEDIA_CPU_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# 동시에 실행하는 작업 수 제한
+MEDIA_IO_CONCURRENCY = MEDIA_IO_WORKERS * 2
+MEDIA_CPU_CONCURRENCY = MEDIA_CPU_WORKERS
+# 풀별로 실행을 기다리는 작업이 이 수를 넘으면 새 작업은 대기하지 않고 바로 거절 (실행 중인 작업은 세지 않음)
+MAX_QUEUED_IO_TASKS = 64
+MAX_QUEUED_CPU_TASKS = MEDIA_CPU_WORKERS * 4
+
+# media_cleanup 구간 안인지 여부 (구간 안의 작업은 대기열이 가득 차도 거절하지 않음)
+_in_cleanup: ContextVar[bool] = ContextVar("media_cleanup", default=False)
+
+
+class MediaBusyError(Exception):
+    """
+    미디어 작업 풀의 대기열이 가득 차 새 작업을 받을 수 없을 때 발생하는 예외 (라우터에서 503으로 응답)
+    """
+
+
+class _MediaPool:
+    """
+    실행기와 동시 실행 수 제한, 대기 중인 작업 수를 함께 관리하는 풀
+    """
+
+    def __init__(
+        self, name: str, executor: Executor, concurrency: int, max_queued: Optional[int]
+    ):
+        self.name = name
+        self.executor = executor
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # None이면 거절하지 않고 순서를 기다림 (워커처럼 동시 작업 수를 직접 제한하는 경우)
+        self.max_queued = max_queued
+        self.queued = 0
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        # 이미 기다리는 작업이 많으면 요청을 더 쌓지 않고 거절 (backpressure)
+        if (
+            self.max_queued is not None
+            and self.queued >= self.max_queued
+            and not _in_cleanup.get()
+        ):
+            logger.warning(f"미디어 작업 대기열 초과({self.name}): {self.queued}개 대기 중")
+            raise MediaBusyError(f"{self.name} 작업 대기열 초과")
+
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+        finally:
+            self.semaphore.release()
+
+
+@contextmanager
+def media_cleanup() -> Iterator[None]:
+    """
+    구간 안의 run_io/run_cpu는 대기열이 가득 차도 거절하지 않고 순서를 기다리게 하는 구간
+    파일 참조 해제, 임시 파일 삭제처럼 이미 일어난 변경을 마무리하는 정리 작업에 사용합니다.
+    (정리 도중 MediaBusyError로 중단되면 참조가 새거나 이미 삭제된 요청에 503을 응답하게 됨)
+    """
+    token = _in_cleanup.set(True)
+    try:
+        yield
+    finally:
+        _in_cleanup.reset(token)
+
+
+_io_pool: Optional[_MediaPool] = None
+_cpu_pool: Optional[_MediaPool] = None
+
+
+def init_media_executors(reject_when_busy: bool = True) -> None:
+    """
+    미디어 작업용 스레드 풀과 프로세스 풀을 생성하는 함수 (앱 시작 시 호출)
+    호출하지 않아도 첫 작업 실행 시 생성됩니다.
+    :param reject_when_busy: 대기열이 가득 차면 MediaBusyError로 거절할지 여부 (워커는 False로 순서를 기다림)
+    """
+    global _io_pool, _cpu_pool
+    if _io_pool is None:
+        _io_pool = _MediaPool(
+            "io",
+            ThreadPoolExecutor(max_workers=MEDIA_IO_WORKERS, thread_name_prefix="media-io"),
+            MEDIA_IO_CONCURRENCY,
+            MAX_QUEUED_IO_TASKS if reject_when_busy else None,
+        )
+    if _cpu_pool is None:
+        # 스레드와 이벤트 루프를 가진 프로세스를 fork하지 않도록 spawn 사용
+        _cpu_pool = _MediaPool(
+            "cpu",
+            ProcessPoolExecutor(
+                max_workers=MEDIA_CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            ),
+            MEDIA_CPU_CONCURRENCY,
+            MAX_QUEUED_CPU_TASKS if reject_when_busy else None,
+        )
+
+
+def shutdown_media_executors() -> None:
+    """
+    미디어 작업용 풀을 종료하는 함수 (앱 종료 시 호출)
+    """
+    global _io_pool, _cpu_pool
+    if _io_pool is not None:
+        _io_pool.executor.shutdown(wait=True)
+    if _cpu_pool is not None:
+        _cpu_pool.executor.shutdown(wait=True, cancel_futures=True)
+    _io_pool = _cpu_pool = None
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    블로킹 파일 I/O 함수를 스레드 풀에서 실행하는 함수
+    """
+    init_media_executors()
+    return await _io_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    영상 디코딩 등 CPU를 많이 쓰는 함수를 프로세스 풀에서 실행하는 함수
+    func와 인자는 다른 프로세스로 전달되므로 pickle 가능해야 합니다. (모듈 최상위 함수)
+    """
+    init_media_executors()
+    return await _cpu_pool.run(func, *args, **kwargs)
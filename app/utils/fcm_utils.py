@@ -0,0 +1,277 @@
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import firebase_admin
+from firebase_admin import credentials, exceptions, messaging
+from odmantic import AIOEngine, ObjectId
+import redis.asyncio as aioredis
+
+from app.database.models.post import Post
+from app.database.models.token import FCMToken
+from app.database.models.user import User
+from app.utils.executor_utils import run_io
+from app.utils.notification_utils import (
+    NOTIFICATION_QUEUE_KEY,
+    NOTIFICATION_RETRY_KEY,
+    NOTIFICATION_STATS_KEY,
+    NOTIFICATION_SUMMARY_TEMPLATES,
+    NOTIFICATION_TEMPLATES,
+    dumps_notification_event,
+    parse_notification_events,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 현재 파일의 위치를 기준으로 프로젝트 루트 경로를 계산
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 서비스 계정 키 파일의 절대 경로
+service_account_path = os.path.join(
+    project_root, "firebase_kawaii_gallery.json"
+)
+
+# send_each 한 번에 보낼 수 있는 최대 메시지 수
+FCM_BATCH_SIZE = 500
+# 알림당 최대 전송 시도 횟수
+NOTIFICATION_MAX_ATTEMPTS = 5
+# 재시도 대기 시간(초) - 시도할 때마다 두 배 (최대 NOTIFICATION_RETRY_MAX_DELAY)
+NOTIFICATION_RETRY_BASE_DELAY = 5
+NOTIFICATION_RETRY_MAX_DELAY = 10 * 60
+
+# 다시 보낼 시각이 된 알림을 대기열로 옮기는 스크립트
+# KEYS[1]: 재시도 ZSET, KEYS[2]: 대기열, ARGV[1]: 현재 시각, ARGV[2]: 최대 개수
+_REQUEUE_DUE_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('LPUSH', KEYS[2], item)
+end
+return #items
+"""
+
+# 일시적인 오류 (잠시 후 다시 보내면 성공할 수 있음)
+_RETRYABLE_ERRORS = (
+    exceptions.UnavailableError,
+    exceptions.InternalError,
+    exceptions.DeadlineExceededError,
+    exceptions.ResourceExhaustedError,
+    exceptions.UnknownError,
+)
+# 더 이상 사용할 수 없는 토큰 (앱 삭제, 다른 프로젝트의 토큰 등)
+_INVALID_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
+_firebase_app: Optional[firebase_admin.App] = None
+
+
+def init_firebase() -> firebase_admin.App:
+    """
+    Firebase Admin SDK를 초기화하는 함수 (알림을 처음 보낼 때 한 번만 초기화)
+    """
+    global _firebase_app
+    if _firebase_app is None:
+        cred = credentials.Certificate(service_account_path)
+        _firebase_app = firebase_admin.initialize_app(cred)
+    return _firebase_app
+
+
+async def claim_notification_events(
+    redis: aioredis.Redis, batch_size: int = FCM_BATCH_SIZE, timeout: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    대기열에서 알림 이벤트를 최대 batch_size개 꺼내는 함수
+    대기열이 비어 있으면 timeout초 동안 첫 이벤트를 기다리고, 이후 쌓여 있는 이벤트를 한 번에 꺼냅니다.
+    (알림은 전송 도중 워커가 종료되면 유실될 수 있으며, 중복 전송보다 유실을 택함)
+    """
+    first = await redis.brpop([NOTIFICATION_QUEUE_KEY], timeout)
+    if first is None:
+        return []
+    rest = await redis.rpop(NOTIFICATION_QUEUE_KEY, batch_size - 1) if batch_size > 1 else None
+    return parse_notification_events([first[1], *(rest or [])])
+
+
+async def requeue_due_notifications(redis: aioredis.Redis) -> int:
+    """
+    다시 보낼 시각이 된 알림 이벤트를 대기열로 옮기는 함수
+    :return: 옮긴 이벤트 수
+    """
+    script = redis.register_script(_REQUEUE_DUE_SCRIPT)
+    return await script(
+        keys=[NOTIFICATION_RETRY_KEY, NOTIFICATION_QUEUE_KEY],
+        args=[time.time(), FCM_BATCH_SIZE],
+    )
+
+
+def get_retry_delay(attempts: int) -> float:
+    """
+    재시도 대기 시간을 반환하는 함수 (지수 백오프, 여러 알림이 동시에 몰리지 않도록 지터 추가)
+    """
+    delay = min(NOTIFICATION_RETRY_MAX_DELAY, NOTIFICATION_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def schedule_notification_retries(
+    redis: aioredis.Redis, events: List[Dict[str, Any]]
+) -> Tuple[int, int]:
+    """
+    전송에 실패한 알림 이벤트를 백오프 후 다시 보내도록 예약하는 함수 (최대 시도 횟수를 넘으면 버림)
+    :return: (예약한 수, 버린 수)
+    """
+    now = time.time()
+    retries = {}
+    for event in events:
+        attempts = event.get("attempts", 0) + 1
+        if attempts >= NOTIFICATION_MAX_ATTEMPTS:
+            continue
+        payload = dumps_notification_event(dict(event, attempts=attempts))
+        retries[payload] = now + get_retry_delay(attempts)
+
+    dropped = len(events) - len(retries)
+    if retries:
+        await redis.zadd(NOTIFICATION_RETRY_KEY, retries)
+    if dropped:
+        logger.warning(f"최대 시도 횟수를 넘은 알림 {dropped}건을 버립니다.")
+    return len(retries), dropped
+
+
+async def build_notification_messages(
+    engine: AIOEngine, events: List[Dict[str, Any]]
+) -> List[Tuple[Dict[str, Any], messaging.Message]]:
+    """
+    알림 이벤트로 FCM 메시지를 만드는 함수
+    게시글, 보낸 사용자, 받는 사용자 토큰을 이벤트마다 조회하지 않고 배치 전체를 컬렉션별 한 번씩 조회합니다.
+    :return: [(이벤트, 메시지), ...] (게시글이 삭제되었거나 토큰이 없는 이벤트는 제외)
+    """
+    post_ids = {ObjectId(event["post_id"]) for event in events}
+    posts = {
+        post["_id"]: post
+        async for post in engine.get_collection(Post).find(
+            {"_id": {"$in": list(post_ids)}}, {"title": 1, "user_id": 1}
+        )
+    }
+
+    user_ids = {ObjectId(event["user_id"]) for event in events}
+    nick_names = {
+        user["_id"]: user.get("nick_name")
+        async for user in engine.get_collection(User).find(
+            {"_id": {"$in": list(user_ids)}}, {"nick_name": 1}
+        )
+    }
+
+    author_ids = {post["user_id"] for post in posts.values()}
+    tokens = {
+        token["user_id"]: token["fcm_token"]
+        async for token in engine.get_collection(FCMToken).find(
+            {"user_id": {"$in": list(author_ids)}}, {"user_id": 1, "fcm_token": 1}
+        )
+    }
+
+    messages = []
+    for event in events:
+        post = posts.get(ObjectId(event["post_id"]))
+        template = NOTIFICATION_TEMPLATES.get(event.get("type"))
+        if post is None or template is None:
+            continue
+        token = tokens.get(post["user_id"])
+        nick_name = nick_names.get(ObjectId(event["user_id"]))
+        if token is None or nick_name is None:
+            continue
+
+        title, body_template = template
+        count = event.get("count", 1)
+        if count > 1:
+            body = NOTIFICATION_SUMMARY_TEMPLATES[event["type"]].format(
+                nick_name, count - 1, post["title"]
+            )
+        else:
+            body = body_template.format(nick_name, post["title"])
+        message = messaging.Message(
+            notification=messaging.Notification(title=title, body=body),
+            token=token,
+            data={"post_id": event["post_id"], "type": event["type"], "count": str(count)},
+        )
+        messages.append((event, message))
+    return messages
+
+
+async def send_notification_batch(
+    engine: AIOEngine, redis: aioredis.Redis, events: List[Dict[str, Any]]
+) -> Dict[str, int]:
+    """
+    알림 이벤트를 FCM send_each로 한 번에 전송하는 함수
+    - 일시적인 오류는 백오프 후 재시도
+    - 더 이상 사용할 수 없는 토큰은 삭제
+    전송한 뒤의 후처리(재시도 예약, 토큰 삭제, 통계) 실패는 로그만 남기고 예외를 던지지 않습니다.
+    예외는 전송하기 전에 실패한 경우에만 발생하므로 호출한 쪽은 배치 전체를 재시도하면 됩니다.
+    :return: 항목별 처리 건수 (통계 HASH에도 누적)
+    """
+    pairs = await build_notification_messages(engine, events)
+    result = {
+        "batches": 1,
+        "sent": 0,
+        "failed": 0,
+        "retried": 0,
+        "dropped": 0,
+        "invalid_tokens": 0,
+        "skipped": len(events) - len(pairs),
+    }
+
+    retry_events = []
+    invalid_tokens = set()
+    if pairs:
+        messages = [message for _, message in pairs]
+        try:
+            # send_each는 블로킹 함수이므로 I/O 스레드 풀에서 실행
+            response = await run_io(messaging.send_each, messages, app=init_firebase())
+            responses = response.responses
+        except Exception:
+            # 요청 전체가 실패한 경우 (네트워크 장애 등) 모두 재시도
+            logger.error(f"알림 일괄 전송 실패: {len(messages)}건", exc_info=True)
+            responses = None
+
+        for index, (event, message) in enumerate(pairs):
+            send_response = responses[index] if responses is not None else None
+            if send_response is not None and send_response.success:
+                result["sent"] += 1
+                continue
+
+            error = send_response.exception if send_response is not None else None
+            if error is None or isinstance(error, _RETRYABLE_ERRORS):
+                retry_events.append(event)
+                continue
+
+            result["failed"] += 1
+            if isinstance(error, _INVALID_TOKEN_ERRORS):
+                invalid_tokens.add(message.token)
+            else:
+                logger.warning(f"알림 전송 실패: {event} ({error})")
+
+    # 이미 보낸 알림이 다시 전송되지 않도록 이후 단계는 각각 처리하고 예외를 던지지 않음
+    if retry_events:
+        try:
+            result["retried"], result["dropped"] = await schedule_notification_retries(
+                redis, retry_events
+            )
+        except Exception:
+            logger.error(f"알림 재시도 예약 실패: {len(retry_events)}건", exc_info=True)
+            result["dropped"] += len(retry_events)
+    if invalid_tokens:
+        try:
+            deleted = await engine.get_collection(FCMToken).delete_many(
+                {"fcm_token": {"$in": list(invalid_tokens)}}
+            )
+            result["invalid_tokens"] = deleted.deleted_count
+        except Exception:
+            logger.warning(f"사용할 수 없는 FCM 토큰 삭제 실패: {len(invalid_tokens)}개", exc_info=True)
+
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for name, count in result.items():
+            if count:
+                pipe.hincrby(NOTIFICATION_STATS_KEY, name, count)
+        await pipe.execute()
+    except Exception:
+        logger.warning("알림 전송 통계 기록 실패", exc_info=True)
+    return result
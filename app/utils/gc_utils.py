@@ -0,0 +1,399 @@
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from odmantic import AIOEngine
+from pymongo.errors import DuplicateKeyError
+
+from app.database.models.media import MediaBlob
+from app.database.models.post import Post
+from app.database.models.user import User
+from app.utils.executor_utils import run_io
+from app.utils.settings import UPLOAD_DIRECTORY
+from app.utils.storage_utils import (
+    BLOB_DIRECTORY,
+    BLOB_TMP_DIRECTORY,
+    begin_blob_delete,
+    finish_blob_delete,
+    get_blob_key_from_path,
+)
+from app.utils.time_util import get_current_time
+from app.utils.upload_session_utils import UPLOAD_SESSION_TTL
+from app.utils.upload_utils import to_static_url
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 한 번에 DB에 참조 여부를 확인할 파일 수
+GC_BATCH_SIZE = 500
+# 최근에 수정된 파일은 게시글 저장 전일 수 있으므로 건너뜀(초)
+GC_MIN_AGE = 60 * 60
+# 임시 파일(업로드 중, 이어 올리기 조각)은 세션 만료 후에도 남아 있으면 삭제(초)
+GC_TMP_MIN_AGE = UPLOAD_SESSION_TTL + 60 * 60
+# 진행 상황 로그 주기(초)
+GC_LOG_INTERVAL = 10
+# 격리한 파일을 옮기는 디렉터리 (정적 파일로 제공되지 않도록 업로드 디렉터리 밖)
+GC_QUARANTINE_DIRECTORY = "./quarantine"
+
+# 저장소 원본 파일 이름 ("{sha256}{확장자}") - 그 외("{sha256}_*")는 파생본
+_BLOB_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,10})?$")
+_DERIVED_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})_")
+
+# 이전 방식으로 저장된 파일을 참조할 수 있는 필드
+_POST_URL_FIELDS = (
+    "files.url",
+    "files.thumbnail_url",
+    "files.variants.url",
+    "files.hls_url",
+    "files.sprite.url",
+)
+_USER_URL_FIELDS = ("profile_image_url", "profile_image_variants.url")
+
+
+@dataclass
+class GCStats:
+    dry_run: bool = True
+    scanned_files: int = 0
+    scanned_bytes: int = 0
+    skipped_recent: int = 0
+    orphan_files: int = 0
+    orphan_bytes: int = 0
+    removed_files: int = 0
+    fixed_ref_counts: int = 0
+    errors: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> Dict:
+        result = asdict(self)
+        elapsed = time.monotonic() - result.pop("started_at")
+        result["elapsed_seconds"] = round(elapsed, 1)
+        result["files_per_second"] = round(self.scanned_files / elapsed, 1) if elapsed else 0
+        return result
+
+
+def _scan(directory: str, skip: Tuple[str, ...] = ()) -> Iterator[os.DirEntry]:
+    """
+    디렉터리 아래 파일을 하나씩 반환하는 함수 (전체 목록을 메모리에 올리지 않음)
+    HLS처럼 디렉터리인 파생본("{sha256}_*")은 안으로 들어가지 않고 디렉터리 자체를 반환합니다.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if _DERIVED_NAME_PATTERN.match(entry.name):
+                            yield entry
+                        elif os.path.normpath(entry.path) not in skip:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def _batched(entries: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in _scan(path))
+    return os.path.getsize(path)
+
+
+def _quarantine(path: str, quarantine_dir: str) -> None:
+    target = os.path.join(quarantine_dir, os.path.relpath(path, UPLOAD_DIRECTORY))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.move(path, target)
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
+
+
+class StorageGarbageCollector:
+    """
+    업로드 디렉터리를 스트리밍으로 훑으며 어디에서도 참조하지 않는 파일을 삭제(또는 격리)하는 작업
+
+    - 저장소 파일(blobs/): 게시글/프로필에서 실제로 참조하는 수를 일괄 조회해 media_blobs의 참조 수를 바로잡고,
+      참조가 없으면 원본과 파생본을 함께 정리
+    - 파생본("{sha256}_*"): 원본 파일이 없으면 정리
+    - 이전 방식 파일(images/, videos/ 등): 게시글/프로필의 URL 필드에서 참조하지 않으면 정리
+    - 임시 파일(blobs/tmp/): 업로드 세션 만료 시간이 지나면 정리
+    """
+
+    def __init__(
+        self,
+        engine: AIOEngine,
+        dry_run: bool = True,
+        quarantine_dir: Optional[str] = None,
+        min_age: int = GC_MIN_AGE,
+        batch_size: int = GC_BATCH_SIZE,
+    ):
+        self.engine = engine
+        self.dry_run = dry_run
+        self.quarantine_dir = quarantine_dir
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.stats = GCStats(dry_run=dry_run)
+        self._last_log = time.monotonic()
+
+    async def run(self) -> GCStats:
+        now = time.time()
+        # 이 시각 이후에 참조 수가 바뀐 기록은 진행 중인 업로드일 수 있으므로 건드리지 않음
+        self.cutoff = get_current_time() - timedelta(seconds=self.min_age)
+        blob_dir = os.path.normpath(BLOB_DIRECTORY)
+        tmp_dir = os.path.normpath(BLOB_TMP_DIRECTORY)
+
+        for batch in _batched(_scan(tmp_dir), self.batch_size):
+            await self._collect_tmp(batch, now)
+        for batch in _batched(_scan(blob_dir, skip=(tmp_dir,)), self.batch_size):
+            await self._collect_blobs(batch, now)
+        for batch in _batched(_scan(UPLOAD_DIRECTORY, skip=(blob_dir,)), self.batch_size):
+            await self._collect_legacy(batch, now)
+
+        logger.info(f"저장소 정리 완료: {self.stats.as_dict()}")
+        return self.stats
+
+    def _is_recent(self, entry: os.DirEntry, now: float, min_age: int) -> bool:
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            # 같은 배치의 원본과 함께 이미 정리된 파생본
+            return True
+        self.stats.scanned_files += 1
+        if not entry.is_dir(follow_symlinks=False):
+            self.stats.scanned_bytes += stat.st_size
+        if now - stat.st_mtime < min_age:
+            self.stats.skipped_recent += 1
+            return True
+        return False
+
+    async def _collect_tmp(self, batch: List[os.DirEntry], now: float) -> None:
+        for entry in batch:
+            if not self._is_recent(entry, now, GC_TMP_MIN_AGE):
+                await self._discard(entry.path)
+        self._log_progress()
+
+    async def _collect_blobs(self, batch: List[os.DirEntry], now: float) -> None:
+        originals = {}
+        for entry in batch:
+            if self._is_recent(entry, now, self.min_age):
+                continue
+            if _BLOB_NAME_PATTERN.match(entry.name):
+                originals[to_static_url(entry.path)] = entry.path
+                continue
+            match = _DERIVED_NAME_PATTERN.match(entry.name)
+            # 원본이 없는 파생본 정리 (원본이 있으면 원본과 함께 판단)
+            if match and not await run_io(self._has_original, entry.path, match.group(1)):
+                await self._discard(entry.path)
+
+        if originals:
+            counts = await self._count_blob_references(list(originals))
+            for url, file_path in originals.items():
+                await self._reconcile_blob(file_path, counts.get(url, 0))
+        self._log_progress()
+
+    async def _collect_legacy(self, batch: List[os.DirEntry], now: float) -> None:
+        candidates = {
+            to_static_url(entry.path): entry.path
+            for entry in batch
+            if not self._is_recent(entry, now, self.min_age)
+        }
+        if candidates:
+            referenced = await self._find_referenced_urls(list(candidates))
+            for url, file_path in candidates.items():
+                if url not in referenced:
+                    await self._discard(file_path)
+        self._log_progress()
+
+    @staticmethod
+    def _has_original(derived_path: str, sha256: str) -> bool:
+        directory = os.path.dirname(derived_path)
+        with os.scandir(directory) as entries:
+            return any(
+                entry.name.startswith(sha256) and _BLOB_NAME_PATTERN.match(entry.name)
+                for entry in entries
+            )
+
+    async def _count_blob_references(self, urls: List[str]) -> Dict[str, int]:
+        """
+        게시글 첨부 파일과 프로필 이미지에서 각 URL을 참조하는 수를 일괄 조회하는 함수
+        """
+        counts: Dict[str, int] = {}
+        pipeline = [
+            {"$match": {"files.url": {"$in": urls}}},
+            {"$unwind": "$files"},
+            {"$match": {"files.url": {"$in": urls}}},
+            {"$group": {"_id": "$files.url", "count": {"$sum": 1}}},
+        ]
+        async for row in self.engine.get_collection(Post).aggregate(pipeline):
+            counts[row["_id"]] = counts.get(row["_id"], 0) + row["count"]
+        cursor = self.engine.get_collection(User).find(
+            {"profile_image_url": {"$in": urls}}, {"profile_image_url": 1}
+        )
+        async for user in cursor:
+            url = user["profile_image_url"]
+            counts[url] = counts.get(url, 0) + 1
+        return counts
+
+    async def _find_referenced_urls(self, urls: List[str]) -> Set[str]:
+        """
+        이전 방식 파일 URL 중 게시글/프로필에서 참조하는 URL을 일괄 조회하는 함수
+        """
+        url_set = set(urls)
+        referenced = set()
+        for model, fields in ((Post, _POST_URL_FIELDS), (User, _USER_URL_FIELDS)):
+            query = {"$or": [{name: {"$in": urls}} for name in fields]}
+            projection = {name.split(".")[0]: 1 for name in fields}
+            async for doc in self.engine.get_collection(model).find(query, projection):
+                referenced |= url_set & set(_iter_strings(doc))
+        return referenced
+
+    async def _reconcile_blob(self, file_path: str, count: int) -> None:
+        """
+        실제 참조 수와 media_blobs의 참조 수를 비교해 바로잡고, 참조가 없으면 원본과 파생본을 정리하는 함수
+        """
+        key = get_blob_key_from_path(file_path)
+        collection = self.engine.get_collection(MediaBlob)
+        blob = await collection.find_one({"_id": key})
+        if blob is not None:
+            # 다른 곳에서 삭제 중인 파일
+            if blob.get("deleting"):
+                return
+            # 최근에 참조 수가 바뀐 파일은 게시글 저장 전일 수 있으므로 다음 실행에서 확인
+            if blob["updated_at"] >= self.cutoff:
+                return
+            if count > 0 and blob["ref_count"] == count:
+                return
+
+        if count > 0:
+            # 작업 재시도, 중간 실패 등으로 어긋난 참조 수 보정
+            logger.info(f"참조 수 보정: {key} {blob and blob['ref_count']} -> {count}")
+            self.stats.fixed_ref_counts += 1
+            if self.dry_run:
+                return
+            if blob is None:
+                size = await run_io(os.path.getsize, file_path)
+                now = get_current_time()
+                await collection.update_one(
+                    {"_id": key},
+                    {
+                        "$set": {"ref_count": count, "updated_at": now},
+                        "$setOnInsert": {"size": size, "created_at": now},
+                    },
+                    upsert=True,
+                )
+            else:
+                # 조회 이후 참조 수가 바뀌었으면 다음 실행에서 다시 확인
+                await collection.update_one(
+                    {"_id": key, "ref_count": blob["ref_count"], "updated_at": blob["updated_at"]},
+                    {"$set": {"ref_count": count, "updated_at": get_current_time()}},
+                )
+            return
+
+        if self.dry_run:
+            await self._discard_blob(file_path)
+            return
+
+        # 조회 이후 다시 참조되었을 수 있으므로 기록이 그대로일 때만 삭제 중으로 표시
+        # (표시가 남아 있는 동안 같은 파일을 올리는 요청은 삭제가 끝난 뒤 파일을 다시 저장)
+        token = await self._begin_delete(key, file_path, blob)
+        if token is None:
+            return
+        try:
+            await self._discard_blob(file_path)
+        finally:
+            await finish_blob_delete(self.engine, key, token)
+
+    async def _begin_delete(self, key: str, file_path: str, blob: Optional[Dict]) -> Optional[str]:
+        if blob is not None:
+            return await begin_blob_delete(
+                self.engine,
+                key,
+                {"ref_count": blob["ref_count"], "updated_at": blob["updated_at"]},
+            )
+
+        # 기록이 없는 파일은 삭제 중 표시만 있는 기록을 만듦 (그 사이 기록이 생겼으면 다시 참조된 것)
+        token = uuid.uuid4().hex
+        now = get_current_time()
+        try:
+            await self.engine.get_collection(MediaBlob).insert_one(
+                {
+                    "_id": key,
+                    "size": await run_io(os.path.getsize, file_path),
+                    "ref_count": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                    "deleting": token,
+                    "deleting_at": now,
+                }
+            )
+        except (DuplicateKeyError, FileNotFoundError):
+            return None
+        return token
+
+    async def _discard_blob(self, file_path: str) -> None:
+        stem = os.path.splitext(file_path)[0]
+        directory = os.path.dirname(file_path)
+        with os.scandir(directory) as entries:
+            derived = [
+                entry.path
+                for entry in entries
+                if entry.name.startswith(os.path.basename(stem) + "_")
+            ]
+        for path in [file_path, *derived]:
+            await self._discard(path)
+
+    async def _discard(self, path: str) -> None:
+        try:
+            size = await run_io(_size, path)
+        except FileNotFoundError:
+            return
+        self.stats.orphan_files += 1
+        self.stats.orphan_bytes += size
+        if self.dry_run:
+            logger.info(f"[dry-run] 참조 없는 파일: {path}")
+            return
+        try:
+            if self.quarantine_dir:
+                await run_io(_quarantine, path, self.quarantine_dir)
+            else:
+                await run_io(_remove, path)
+            self.stats.removed_files += 1
+        except OSError:
+            self.stats.errors += 1
+            logger.error(f"파일 정리 실패: {path}", exc_info=True)
+
+    def _log_progress(self) -> None:
+        if time.monotonic() - self._last_log >= GC_LOG_INTERVAL:
+            self._last_log = time.monotonic()
+            logger.info(f"저장소 정리 진행 중: {self.stats.as_dict()}")
+
+
+def _iter_strings(value) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from odmantic import AIOEngine, ObjectId
+
+from app.database.models.media import ImageHash
+from app.utils.time_util import get_current_time
+
+# 지각 해시를 나누는 구간 수와 구간당 비트 수 (64비트 = 16비트 x 4)
+HASH_SEGMENTS = 4
+SEGMENT_BITS = 16
+# 구간별로 같은 값과 1비트 다른 값을 후보로 조회
+# 해밍 거리가 d인 두 해시는 적어도 한 구간의 차이가 d // HASH_SEGMENTS 이하이므로
+# 2 * HASH_SEGMENTS - 1 = 7 이하의 거리는 빠짐없이 찾을 수 있습니다.
+MAX_SEARCH_DISTANCE = 2 * HASH_SEGMENTS - 1
+
+# 이 해밍 거리 이하의 이미지를 같은 이미지(재업로드)로 판단
+NEAR_DUPLICATE_DISTANCE = 6
+
+
+def hamming_distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def _split(phash: str) -> List[int]:
+    value = int(phash, 16)
+    mask = (1 << SEGMENT_BITS) - 1
+    return [
+        (value >> (SEGMENT_BITS * (HASH_SEGMENTS - 1 - i))) & mask
+        for i in range(HASH_SEGMENTS)
+    ]
+
+
+def get_segment_keys(phash: str) -> List[str]:
+    """
+    해시를 저장할 때 색인하는 구간 키 목록
+    """
+    return [f"{i}:{segment:04x}" for i, segment in enumerate(_split(phash))]
+
+
+def get_query_segment_keys(phash: str) -> List[str]:
+    """
+    해시와 비슷한 해시를 찾을 때 조회하는 구간 키 목록 (구간별로 같은 값과 1비트 다른 값)
+    """
+    keys = []
+    for i, segment in enumerate(_split(phash)):
+        keys.append(f"{i}:{segment:04x}")
+        keys.extend(f"{i}:{segment ^ (1 << bit):04x}" for bit in range(SEGMENT_BITS))
+    return keys
+
+
+async def index_image_hash(
+    engine: AIOEngine, post_id: ObjectId, media_id: ObjectId, phash: str
+) -> None:
+    """
+    이미지의 지각 해시를 색인하는 함수 (같은 이미지를 다시 처리해도 하나만 유지)
+    """
+    await engine.get_collection(ImageHash).update_one(
+        {"media_id": media_id},
+        {
+            "$set": {
+                "post_id": post_id,
+                "phash": phash,
+                "segments": get_segment_keys(phash),
+            },
+            "$setOnInsert": {"created_at": get_current_time()},
+        },
+        upsert=True,
+    )
+
+
+async def find_near_duplicates(
+    engine: AIOEngine,
+    phash: str,
+    max_distance: int = NEAR_DUPLICATE_DISTANCE,
+    exclude_post_id: Optional[ObjectId] = None,
+) -> List[Tuple[ImageHash, int]]:
+    """
+    해밍 거리가 max_distance 이하인 색인된 이미지를 찾는 함수
+    구간 키 멀티키 인덱스로 후보만 조회한 뒤 실제 거리를 계산하므로 전체를 훑지 않습니다.
+    :return: [(이미지 해시, 거리), ...] (거리, 등록 순)
+    """
+    max_distance = min(max_distance, MAX_SEARCH_DISTANCE)
+    query = ImageHash.segments.in_(get_query_segment_keys(phash))
+    if exclude_post_id is not None:
+        query = query & (ImageHash.post_id != exclude_post_id)
+
+    matches = []
+    for candidate in await engine.find(ImageHash, query):
+        distance = hamming_distance(phash, candidate.phash)
+        if distance <= max_distance:
+            matches.append((candidate, distance))
+    matches.sort(key=lambda match: (match[1], match[0].created_at))
+    return matches
+
+
+async def remove_post_image_hashes(engine: AIOEngine, post_id: ObjectId) -> None:
+    """
+    삭제된 게시글의 이미지 해시를 색인에서 제거하는 함수
+    """
+    await engine.get_collection(ImageHash).delete_many({"post_id": post_id})
+
+
+async def remove_image_hash(engine: AIOEngine, media_id: ObjectId) -> None:
+    """
+    이미지 하나의 지각 해시를 색인에서 제거하는 함수 (처리 중 게시글이 삭제된 경우)
+    """
+    await engine.get_collection(ImageHash).delete_one({"media_id": media_id})
+
+
+async def get_duplicate_clusters(
+    engine: AIOEngine,
+    max_distance: int = NEAR_DUPLICATE_DISTANCE,
+    min_size: int = 2,
+) -> List[List[ImageHash]]:
+    """
+    서로 비슷한 이미지끼리 묶은 목록을 반환하는 함수 (관리자 점검용)
+    해시를 메모리에 구간 키별로 색인해 이미지마다 후보만 비교하고, 거리 이내인 쌍을 Union-Find로 묶습니다.
+    :return: 크기가 min_size 이상인 묶음 목록 (큰 묶음부터, 묶음 안은 등록 순)
+    """
+    max_distance = min(max_distance, MAX_SEARCH_DISTANCE)
+    hashes = await engine.find(ImageHash, sort=ImageHash.created_at)
+
+    buckets: Dict[str, List[int]] = defaultdict(list)
+    for index, image_hash in enumerate(hashes):
+        for key in get_segment_keys(image_hash.phash):
+            buckets[key].append(index)
+
+    parent = list(range(len(hashes)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, image_hash in enumerate(hashes):
+        for key in get_query_segment_keys(image_hash.phash):
+            for other in buckets.get(key, ()):
+                if other <= index or find(other) == find(index):
+                    continue
+                if hamming_distance(image_hash.phash, hashes[other].phash) <= max_distance:
+                    parent[find(other)] = find(index)
+
+    clusters: Dict[int, List[ImageHash]] = defaultdict(list)
+    for index, image_hash in enumerate(hashes):
+        clusters[find(index)].append(image_hash)
+    return sorted(
+        (cluster for cluster in clusters.values() if len(cluster) >= min_size),
+        key=len,
+        reverse=True,
+    )
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+import redis.asyncio as aioredis
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 처리 대기 중인 작업 (LPUSH로 넣고 워커가 오른쪽에서 꺼냄)
+MEDIA_JOB_QUEUE_KEY = "media_jobs:queue"
+# 워커가 꺼내 처리 중인 작업 (완료 전 워커가 죽어도 작업이 사라지지 않도록 보관)
+MEDIA_JOB_PROCESSING_KEY = "media_jobs:processing"
+# 처리 중인 작업 ID별 마지막 갱신 시각 (HASH, 처리하는 동안 워커가 주기적으로 갱신)
+MEDIA_JOB_STARTED_KEY = "media_jobs:started"
+# 재시도 후에도 실패한 작업
+MEDIA_JOB_DEAD_KEY = "media_jobs:dead"
+
+# 작업당 최대 시도 횟수
+MEDIA_JOB_MAX_ATTEMPTS = 3
+# 처리 중인 작업의 갱신 시각을 기록하는 주기(초)
+MEDIA_JOB_HEARTBEAT_INTERVAL = 30
+# 이 시간(초) 동안 갱신되지 않은 작업은 워커가 죽은 것으로 보고 다시 대기열에 넣음
+# (작업 자체의 처리 시간과는 무관하므로 오래 걸리는 HLS 변환도 중복 실행되지 않음)
+MEDIA_JOB_TIMEOUT = 2 * 60
+# 실패 작업 보관 개수
+MEDIA_JOB_DEAD_LIMIT = 1000
+
+# 처리 중 목록에서 작업을 빼고 대기열(또는 실패 목록)에 다시 넣는 스크립트
+# KEYS[1]: 처리 중 목록, KEYS[2]: 시작 시각 HASH, KEYS[3]: 다시 넣을 목록
+# ARGV[1]: 처리 중 목록의 작업, ARGV[2]: 작업 ID, ARGV[3]: 다시 넣을 작업
+_REQUEUE_SCRIPT = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[2], ARGV[2])
+redis.call('LPUSH', KEYS[3], ARGV[3])
+return 1
+"""
+
+# 갱신 시각이 기한 이전인 작업만 대기열에 다시 넣는 스크립트 (점검과 이동 사이의 갱신을 놓치지 않도록)
+# KEYS: _REQUEUE_SCRIPT와 같음, ARGV[1]: 작업, ARGV[2]: 작업 ID, ARGV[3]: 기한
+_REQUEUE_STALE_SCRIPT = """
+local heartbeat = redis.call('HGET', KEYS[2], ARGV[2])
+if heartbeat and tonumber(heartbeat) > tonumber(ARGV[3]) then
+    return 0
+end
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[2], ARGV[2])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+# 아직 처리 중인 작업만 갱신 시각을 기록하는 스크립트 (이미 다시 대기열에 들어간 작업은 제외)
+# KEYS[1]: 갱신 시각 HASH, ARGV[1]: 작업 ID, ARGV[2]: 현재 시각
+_HEARTBEAT_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+def _dumps(job: Dict[str, Any]) -> str:
+    return json.dumps(job, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_media_job(job_type: str, post_id: str, media_id: str, **params) -> Dict[str, Any]:
+    """
+    미디어 작업 페이로드를 생성하는 함수
+    """
+    return {
+        "id": uuid.uuid4().hex,
+        "type": job_type,
+        "post_id": str(post_id),
+        "media_id": str(media_id),
+        "params": params,
+        "attempts": 0,
+    }
+
+
+async def enqueue_media_jobs(redis: aioredis.Redis, jobs: Iterable[Dict[str, Any]]) -> int:
+    """
+    미디어 작업들을 대기열에 넣는 함수 (한 번의 왕복으로 처리)
+    :return: 등록한 작업 수
+    """
+    payloads = [_dumps(job) for job in jobs]
+    if payloads:
+        await redis.lpush(MEDIA_JOB_QUEUE_KEY, *payloads)
+    return len(payloads)
+
+
+async def claim_media_job(
+    redis: aioredis.Redis, timeout: int = 5
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    대기열에서 작업을 하나 꺼내 처리 중 목록으로 옮기는 함수
+    대기열이 비어 있으면 timeout초 동안 기다린 뒤 None을 반환합니다.
+    :return: (처리 중 목록에 저장된 원본 문자열, 작업) 또는 None
+    """
+    raw = await redis.blmove(
+        MEDIA_JOB_QUEUE_KEY, MEDIA_JOB_PROCESSING_KEY, timeout, "RIGHT", "LEFT"
+    )
+    if raw is None:
+        return None
+
+    try:
+        job = json.loads(raw)
+    except ValueError:
+        # 잘못된 작업은 실패 목록으로 옮김
+        logger.error(f"잘못된 미디어 작업 페이로드: {raw}")
+        await _move(redis, raw, "", raw, MEDIA_JOB_DEAD_KEY)
+        return None
+
+    await redis.hset(MEDIA_JOB_STARTED_KEY, job["id"], int(time.time()))
+    return raw, job
+
+
+async def complete_media_job(redis: aioredis.Redis, raw: str, job: Dict[str, Any]) -> None:
+    """
+    처리가 끝난 작업을 처리 중 목록에서 제거하는 함수
+    """
+    pipe = redis.pipeline(transaction=True)
+    pipe.lrem(MEDIA_JOB_PROCESSING_KEY, 1, raw)
+    pipe.hdel(MEDIA_JOB_STARTED_KEY, job["id"])
+    await pipe.execute()
+
+
+@asynccontextmanager
+async def media_job_heartbeat(redis: aioredis.Redis, job: Dict[str, Any]) -> AsyncIterator[None]:
+    """
+    작업을 처리하는 동안 MEDIA_JOB_HEARTBEAT_INTERVAL초마다 갱신 시각을 기록하는 구간
+    처리 중인 작업이 시간 초과로 다시 대기열에 들어가 중복 실행되지 않도록 합니다.
+    """
+    script = redis.register_script(_HEARTBEAT_SCRIPT)
+
+    async def beat():
+        while True:
+            await asyncio.sleep(MEDIA_JOB_HEARTBEAT_INTERVAL)
+            try:
+                alive = await script(
+                    keys=[MEDIA_JOB_STARTED_KEY], args=[job["id"], int(time.time())]
+                )
+            except Exception:
+                logger.warning(f"미디어 작업 갱신 시각 기록 실패: {job['id']}", exc_info=True)
+                continue
+            if not alive:
+                logger.warning(f"시간 초과로 다시 대기열에 들어간 미디어 작업: {job['id']}")
+                return
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def fail_media_job(redis: aioredis.Redis, raw: str, job: Dict[str, Any]) -> bool:
+    """
+    실패한 작업을 최대 시도 횟수 전까지는 대기열에 다시 넣고, 이후에는 실패 목록으로 옮기는 함수
+    :return: 다시 시도할 예정이면 True, 최종 실패면 False
+    """
+    retry = dict(job, attempts=job.get("attempts", 0) + 1)
+    will_retry = retry["attempts"] < MEDIA_JOB_MAX_ATTEMPTS
+    target = MEDIA_JOB_QUEUE_KEY if will_retry else MEDIA_JOB_DEAD_KEY
+    await _move(redis, raw, job["id"], _dumps(retry), target)
+    if not will_retry:
+        await redis.ltrim(MEDIA_JOB_DEAD_KEY, 0, MEDIA_JOB_DEAD_LIMIT - 1)
+    return will_retry
+
+
+async def requeue_stale_media_jobs(redis: aioredis.Redis) -> int:
+    """
+    MEDIA_JOB_TIMEOUT 동안 갱신 시각이 기록되지 않은 작업을 대기열에 다시 넣는 함수
+    (작업 도중 워커가 종료된 경우 복구, 워커에서 주기적으로 호출)
+    :return: 다시 넣은 작업 수
+    """
+    now = int(time.time())
+    started = await redis.hgetall(MEDIA_JOB_STARTED_KEY)
+    requeued = 0
+    for raw in await redis.lrange(MEDIA_JOB_PROCESSING_KEY, 0, -1):
+        try:
+            job = json.loads(raw)
+        except ValueError:
+            continue
+        started_at = started.get(job["id"])
+        # 시작 시각이 기록되기 전일 수 있으므로 기록이 없으면 다음 점검 때 처리
+        if started_at is None:
+            await redis.hsetnx(MEDIA_JOB_STARTED_KEY, job["id"], now)
+            continue
+        if now - int(started_at) < MEDIA_JOB_TIMEOUT:
+            continue
+        script = redis.register_script(_REQUEUE_STALE_SCRIPT)
+        if await script(
+            keys=[MEDIA_JOB_PROCESSING_KEY, MEDIA_JOB_STARTED_KEY, MEDIA_JOB_QUEUE_KEY],
+            args=[raw, job["id"], now - MEDIA_JOB_TIMEOUT],
+        ):
+            requeued += 1
+
+    if requeued:
+        logger.warning(f"시간 초과된 미디어 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+    return requeued
+
+
+async def _move(
+    redis: aioredis.Redis, raw: str, job_id: str, payload: str, target: str
+) -> bool:
+    script = redis.register_script(_REQUEUE_SCRIPT)
+    moved = await script(
+        keys=[MEDIA_JOB_PROCESSING_KEY, MEDIA_JOB_STARTED_KEY, target],
+        args=[raw, job_id, payload],
+    )
+    return bool(moved)
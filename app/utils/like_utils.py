@@ -0,0 +1,149 @@
+import logging
+from typing import Iterable, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from odmantic import AIOEngine, ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.database.models.like import PostLike
+from app.database.models.post import Post
+from app.dtos.post import PostResponseModel
+from app.utils.time_util import get_current_time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+async def toggle_like(
+    engine: AIOEngine, post_id: ObjectId, user_id: ObjectId
+) -> Tuple[bool, Post]:
+    """
+    게시글 좋아요를 추가하거나 취소하는 함수
+    게시글 문서를 읽고 다시 저장하지 않고, 좋아요 기록의 조건부 upsert/delete 결과에 따라
+    likes_count를 $inc 하면서 갱신된 게시글을 같은 요청으로 돌려받습니다.
+    동시 요청이 와도 실제로 상태를 바꾼 요청만 좋아요 수를 변경하므로 수가 어긋나지 않습니다.
+    :return: (처리 후 좋아요 상태, 갱신된 게시글)
+    """
+    likes = engine.get_collection(PostLike)
+    posts = engine.get_collection(Post)
+    like_filter = {"post_id": post_id, "user_id": user_id}
+
+    try:
+        result = await likes.update_one(
+            like_filter,
+            {"$setOnInsert": {"created_at": get_current_time()}},
+            upsert=True,
+        )
+        inserted = result.upserted_id is not None
+    except DuplicateKeyError:
+        # 동시에 같은 좋아요가 추가된 경우
+        inserted = False
+
+    if inserted:
+        liked, delta = True, 1
+    else:
+        # 이미 좋아요를 눌렀다면 좋아요 취소
+        result = await likes.delete_one(like_filter)
+        liked, delta = False, -result.deleted_count
+
+    post_filter = {"_id": post_id}
+    if delta < 0:
+        # 좋아요 수가 음수가 되지 않도록 보장
+        post_filter["likes_count"] = {"$gt": 0}
+
+    doc = await posts.find_one_and_update(
+        post_filter,
+        {"$inc": {"likes_count": delta}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None and delta < 0:
+        doc = await posts.find_one({"_id": post_id})
+
+    if doc is None:
+        # 존재하지 않는 게시글이면 방금 추가한 좋아요를 되돌림
+        if inserted:
+            await likes.delete_one(like_filter)
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
+    return liked, Post.model_validate_doc(doc)
+
+
+async def get_liked_post_ids(
+    engine: AIOEngine, user_id: Optional[ObjectId], post_ids: Iterable[ObjectId]
+) -> Set[ObjectId]:
+    """
+    주어진 게시글 중 사용자가 좋아요를 누른 게시글 ID 집합을 한 번의 쿼리로 반환하는 함수
+    """
+    post_ids = list(post_ids)
+    if user_id is None or not post_ids:
+        return set()
+
+    cursor = engine.get_collection(PostLike).find(
+        {"user_id": user_id, "post_id": {"$in": post_ids}}, {"post_id": 1, "_id": 0}
+    )
+    return {doc["post_id"] async for doc in cursor}
+
+
+async def delete_post_likes(engine: AIOEngine, post_id: ObjectId) -> None:
+    """
+    삭제된 게시글의 좋아요 기록을 제거하는 함수
+    """
+    await engine.get_collection(PostLike).delete_many({"post_id": post_id})
+
+
+def to_post_response(post: Post, is_liked_by_me: bool = False) -> PostResponseModel:
+    """
+    게시글 모델을 응답 모델로 변환하는 함수
+    """
+    response = PostResponseModel.model_validate(post)
+    response.is_liked_by_me = is_liked_by_me
+    return response
+
+
+async def build_post_responses(
+    engine: AIOEngine, posts: List[Post], user_id: Optional[ObjectId]
+) -> List[PostResponseModel]:
+    """
+    게시글 목록을 is_liked_by_me가 채워진 응답 모델 목록으로 변환하는 함수
+    """
+    liked_ids = await get_liked_post_ids(engine, user_id, (post.id for post in posts))
+    return [to_post_response(post, post.id in liked_ids) for post in posts]
+
+
+async def migrate_embedded_likes(engine: AIOEngine, batch_size: int = 500) -> int:
+    """
+    게시글 문서에 내장된 liked_users_id 배열을 post_likes 컬렉션으로 옮기는 함수 (앱 시작 시 호출)
+    옮긴 뒤에는 게시글 문서에서 배열 필드를 제거하며, 이미 옮겨진 좋아요는 무시합니다.
+    :return: 처리한 게시글 수
+    """
+    posts = engine.get_collection(Post)
+    likes = engine.get_collection(PostLike)
+    migrated = 0
+
+    cursor = posts.find(
+        {"liked_users_id": {"$exists": True}}, {"liked_users_id": 1}, batch_size=batch_size
+    )
+    async for doc in cursor:
+        user_ids = doc.get("liked_users_id") or []
+        if user_ids:
+            now = get_current_time()
+            try:
+                await likes.insert_many(
+                    [
+                        {"post_id": doc["_id"], "user_id": user_id, "created_at": now}
+                        for user_id in set(user_ids)
+                    ],
+                    ordered=False,
+                )
+            except BulkWriteError as ex:
+                # 중복 키(이미 옮겨진 좋아요)만 무시
+                write_errors = ex.details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in write_errors):
+                    raise
+
+        await posts.update_one({"_id": doc["_id"]}, {"$unset": {"liked_users_id": ""}})
+        migrated += 1
+
+    if migrated:
+        logger.info(f"내장 좋아요 목록 이전 완료: {migrated}개 게시글")
+    return migrated
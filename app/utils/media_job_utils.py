@@ -0,0 +1,293 @@
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from odmantic import AIOEngine, ObjectId
+import redis.asyncio as aioredis
+
+from app.database.models.post import (
+    MEDIA_STATUS_FAILED,
+    MEDIA_STATUS_PENDING,
+    MEDIA_STATUS_PROCESSING,
+    MEDIA_STATUS_READY,
+    MediaFile,
+    Post,
+)
+from app.utils.executor_utils import run_cpu, run_io
+from app.utils.image_hash_utils import (
+    find_near_duplicates,
+    index_image_hash,
+    remove_image_hash,
+)
+from app.utils.job_utils import build_media_job, enqueue_media_jobs
+from app.utils.media_utils import (
+    HLS_MASTER_PLAYLIST,
+    convert_mov_to_mp4,
+    create_hls_ladder,
+    create_image_variants,
+    create_video_sprite,
+    create_video_thumbnail,
+    get_image_metadata,
+    get_video_metadata,
+)
+from app.utils.post_utils import invalidate_post_cache, update_media_file
+from app.utils.settings import HLS_ENABLED
+from app.utils.storage_utils import (
+    BLOB_TMP_DIRECTORY,
+    derived_file_exists,
+    fetch_derived_file,
+    get_blob_size,
+    get_derived_path,
+    open_local_blob,
+    publish_derived_file,
+    release_blob,
+    store_local_file,
+)
+from app.utils.upload_utils import remove_file, to_static_url, to_upload_path
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 작업 종류
+PROCESS_IMAGE_JOB = "process_image"
+PROCESS_VIDEO_JOB = "process_video"
+
+# mp4로 변환해서 제공할 비디오 확장자
+TRANSCODE_VIDEO_EXTENSIONS = (".mov",)
+
+# 게시글의 미디어 파일을 받아 처리 후 미디어 파일에 반영할 필드를 반환하는 함수
+MediaJobHandler = Callable[[AIOEngine, Post, MediaFile], Awaitable[Dict[str, Any]]]
+
+
+async def generate_image_variants(image_path: str) -> List[Dict[str, Any]]:
+    """
+    원본 이미지 옆에 크기/형식별 파생본을 만드는 함수 (인코딩은 프로세스 풀에서 실행)
+    파생본은 원본 파일명(내용 해시) 기준으로 저장되어 원본을 삭제할 때 함께 삭제됩니다.
+    원본은 open_local_blob 구간 안에서 전달해야 합니다.
+    :return: ImageVariant 필드 목록
+    """
+    output_dir = os.path.dirname(image_path)
+    variants = await run_cpu(create_image_variants, image_path, output_dir)
+    return [
+        {
+            "url": await publish_derived_file(variant["path"]),
+            "width": variant["width"],
+            "height": variant["height"],
+            "format": variant["format"],
+        }
+        for variant in variants
+    ]
+
+
+async def process_image(engine: AIOEngine, post: Post, media: MediaFile) -> Dict[str, Any]:
+    """
+    이미지의 크기/형식별 파생본과 크기, BlurHash를 생성하고, 지각 해시로 먼저 올라온 비슷한 이미지를 찾는 작업
+    :return: 미디어 파일에 반영할 필드
+    """
+    async with open_local_blob(to_upload_path(media.url)) as image_path:
+        fields = {"variants": await generate_image_variants(image_path)}
+        metadata = await run_cpu(get_image_metadata, image_path)
+    phash = metadata.pop("phash")
+    fields.update(metadata)
+
+    # 다른 게시글에 비슷한 이미지가 있으면 가장 가까운 이미지의 게시글을 표시
+    # (색인은 결과 반영 전에 하고, 그 사이 게시글이 삭제되면 run_media_job에서 제거)
+    duplicates = await find_near_duplicates(engine, phash, exclude_post_id=post.id)
+    await index_image_hash(engine, post.id, media.id, phash)
+    fields["phash"] = phash
+    fields["duplicate_of"] = duplicates[0][0].post_id if duplicates else None
+    return fields
+
+
+async def transcode_to_mp4(engine: AIOEngine, video_path: str) -> str:
+    """
+    비디오를 mp4로 변환해 저장소에 저장하는 함수 (원본은 호출한 쪽에서 참조 해제)
+    :return: 저장된 mp4 파일 경로
+    """
+    mp4_path = os.path.join(BLOB_TMP_DIRECTORY, f"{uuid.uuid4().hex}.mp4")
+    await run_io(os.makedirs, BLOB_TMP_DIRECTORY, exist_ok=True)
+    try:
+        await run_io(convert_mov_to_mp4, video_path, mp4_path)
+        return await store_local_file(engine, mp4_path, ".mp4")
+    finally:
+        await run_io(remove_file, mp4_path)
+
+
+async def generate_hls(video_path: str) -> str:
+    """
+    원본 비디오 옆 "{sha256}_hls" 디렉터리에 HLS 화질 단계를 만드는 함수
+    같은 비디오를 공유하는 게시글은 이미 만들어진 플레이리스트를 그대로 사용합니다.
+    :return: 마스터 플레이리스트 경로
+    """
+    output_dir = get_derived_path(video_path, "hls")
+    master_path = os.path.join(output_dir, HLS_MASTER_PLAYLIST)
+    if not await derived_file_exists(master_path):
+        await run_io(create_hls_ladder, video_path, output_dir)
+        await publish_derived_file(output_dir)
+    return master_path
+
+
+async def generate_video_sprite(video_path: str) -> Optional[Dict[str, Any]]:
+    """
+    원본 비디오 옆에 탐색 미리보기 이미지를 만드는 함수 (디코딩은 프로세스 풀에서 실행)
+    미리보기는 부가 기능이므로 실패해도 작업을 실패시키지 않고 None을 반환합니다.
+    :return: VideoSprite 필드
+    """
+    sprite_path = get_derived_path(video_path, "sprite.jpg")
+    try:
+        sprite = await run_cpu(create_video_sprite, video_path, sprite_path)
+    except ValueError:
+        logger.warning(f"탐색 미리보기 이미지 생성 실패: {video_path}", exc_info=True)
+        return None
+    sprite["url"] = await publish_derived_file(sprite.pop("path"))
+    return sprite
+
+
+async def process_video(engine: AIOEngine, post: Post, media: MediaFile) -> Dict[str, Any]:
+    """
+    비디오를 mp4로 변환(필요한 경우)하고 썸네일과 HLS 플레이리스트를 생성하는 작업
+    변환한 파일은 참조 수가 1 올라간 상태로 반환되며, 이후 단계가 실패하면 여기서 참조를 해제합니다.
+    :return: 미디어 파일에 반영할 필드
+    """
+    video_path = to_upload_path(media.url)
+    fields = {}
+
+    # mov 등은 브라우저 호환을 위해 mp4로 변환 (원본은 결과 반영 후 참조 해제)
+    if os.path.splitext(video_path)[1].lower() in TRANSCODE_VIDEO_EXTENSIONS:
+        async with open_local_blob(video_path) as source_path:
+            video_path = await transcode_to_mp4(engine, source_path)
+        fields["url"] = to_static_url(video_path)
+
+    try:
+        if "url" in fields:
+            fields["size"] = await get_blob_size(video_path)
+
+        async with open_local_blob(video_path):
+            # 여러 프레임 중 가장 적합한 프레임으로 썸네일 생성 (OpenCV 디코딩은 프로세스 풀에서 실행)
+            # 같은 비디오를 공유하는 게시글은 썸네일도 공유
+            thumbnail_path = get_derived_path(video_path, "thumbnail.jpg")
+            if not await fetch_derived_file(thumbnail_path):
+                await run_cpu(create_video_thumbnail, video_path, thumbnail_path)
+                await publish_derived_file(thumbnail_path)
+            fields["thumbnail_url"] = to_static_url(thumbnail_path)
+            fields.update(await run_cpu(get_video_metadata, video_path, thumbnail_path))
+            # 재생 바 탐색 미리보기 이미지
+            fields["sprite"] = await generate_video_sprite(video_path)
+
+            # 느린 회선에서도 바로 재생되도록 화질별 HLS 세그먼트 생성 (선택)
+            if HLS_ENABLED:
+                fields["hls_url"] = to_static_url(await generate_hls(video_path))
+    except BaseException:
+        # 결과가 반영되지 않으므로 변환한 파일의 참조 해제 (재시도마다 참조가 쌓이지 않도록)
+        if "url" in fields:
+            await release_blob(engine, video_path)
+        raise
+    return fields
+
+
+# 작업 종류별 처리 함수
+MEDIA_JOB_HANDLERS: Dict[str, MediaJobHandler] = {
+    PROCESS_IMAGE_JOB: process_image,
+    PROCESS_VIDEO_JOB: process_video,
+}
+
+
+def get_media_job_type(media: MediaFile) -> Optional[str]:
+    """
+    업로드된 미디어 파일에 필요한 후처리 작업 종류를 반환하는 함수 (필요 없으면 None)
+    """
+    if media.file_type == "image":
+        return PROCESS_IMAGE_JOB
+    if media.file_type == "video":
+        return PROCESS_VIDEO_JOB
+    return None
+
+
+async def enqueue_post_media_jobs(redis: aioredis.Redis, post: Post) -> int:
+    """
+    게시글에서 처리 대기 중인 미디어 파일의 작업을 대기열에 넣는 함수 (게시글 저장 후 호출)
+    :return: 등록한 작업 수
+    """
+    jobs = [
+        build_media_job(get_media_job_type(media), post.id, media.id)
+        for media in post.files
+        if media.status == MEDIA_STATUS_PENDING and get_media_job_type(media)
+    ]
+    return await enqueue_media_jobs(redis, jobs)
+
+
+async def _set_media_fields(
+    engine: AIOEngine,
+    redis: aioredis.Redis,
+    post_id: ObjectId,
+    media_id: ObjectId,
+    fields,
+    url: Optional[str] = None,
+) -> bool:
+    updated = await update_media_file(engine, post_id, media_id, fields, url)
+    # 처리 상태를 조회하는 클라이언트가 바로 볼 수 있도록 상세 캐시 무효화
+    await invalidate_post_cache(redis, post_id)
+    return updated
+
+
+async def run_media_job(
+    engine: AIOEngine, redis: aioredis.Redis, job: Dict[str, Any]
+) -> None:
+    """
+    미디어 작업 하나를 처리하고 결과를 게시글의 미디어 파일에 반영하는 함수
+    처리 중 발생한 예외는 상위(워커)로 던져 재시도하도록 합니다.
+    """
+    handler = MEDIA_JOB_HANDLERS.get(job["type"])
+    if handler is None:
+        raise ValueError(f"알 수 없는 미디어 작업 종류: {job['type']}")
+
+    post_id, media_id = ObjectId(job["post_id"]), ObjectId(job["media_id"])
+    post = await engine.find_one(Post, Post.id == post_id)
+    media = next((file for file in post.files if file.id == media_id), None) if post else None
+    if media is None:
+        # 처리 전에 게시글이 삭제된 경우
+        logger.info(f"삭제된 게시글의 미디어 작업 건너뜀: {job['id']} (게시글ID:{post_id})")
+        return
+
+    # 결과는 파일 URL이 처리 시작 때와 같을 때만 반영 (같은 작업이 먼저 끝나 변환된 파일로 바뀐 경우 제외)
+    if not await _set_media_fields(
+        engine, redis, post_id, media_id, {"status": MEDIA_STATUS_PROCESSING}, media.url
+    ):
+        logger.info(f"삭제된 게시글의 미디어 작업 건너뜀: {job['id']} (게시글ID:{post_id})")
+        return
+    fields = await handler(engine, post, media)
+    fields["status"] = MEDIA_STATUS_READY
+
+    new_url = fields.get("url", media.url)
+    if not await _set_media_fields(engine, redis, post_id, media_id, fields, media.url):
+        # 게시글 삭제 시 원본은 이미 참조 해제되었으므로 이 작업에서 새로 만든 파일만 해제
+        if new_url != media.url:
+            await release_blob(engine, to_upload_path(new_url))
+        # 게시글 삭제 시 지운 뒤에 색인된 이미지 해시 제거 (같은 파일을 다른 작업이 처리한 경우는 유지)
+        if "phash" in fields and not await engine.get_collection(Post).count_documents(
+            {"_id": post_id, "files.id": media_id}
+        ):
+            await remove_image_hash(engine, media_id)
+        logger.info(
+            f"처리 중 게시글이 삭제되었거나 파일이 바뀌어 결과를 버림: {job['id']} (게시글ID:{post_id})"
+        )
+        return
+
+    # 변환 등으로 파일이 바뀌었으면 이전 파일 참조 해제
+    if new_url != media.url:
+        await release_blob(engine, to_upload_path(media.url))
+
+
+async def mark_media_job_failed(
+    engine: AIOEngine, redis: aioredis.Redis, job: Dict[str, Any]
+) -> None:
+    """
+    재시도 후에도 실패한 작업의 미디어 파일을 실패 상태로 표시하는 함수
+    """
+    await _set_media_fields(
+        engine,
+        redis,
+        ObjectId(job["post_id"]),
+        ObjectId(job["media_id"]),
+        {"status": MEDIA_STATUS_FAILED},
+    )
@@ -1,31 +1,545 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
 import cv2
 import ffmpeg
+import numpy as np
 
-def create_video_thumbnail(video_path: str, thumbnail_path: str, time: float = 1.0):
+# 이미지 파생본 너비(px) - 클라이언트는 화면에 맞는 가장 작은 크기를 선택
+IMAGE_VARIANT_WIDTHS = (256, 720, 1440)
+# 파생본 형식별 확장자와 인코딩 옵션
+IMAGE_VARIANT_FORMATS = {
+    "webp": (".webp", [cv2.IMWRITE_WEBP_QUALITY, 80]),
+    "jpeg": (".jpg", [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 1]),
+}
+
+# HLS 화질 단계 (짧은 변 길이(px), 비디오 비트레이트, 오디오 비트레이트)
+# 원본보다 높은 화질로는 만들지 않으며, 클라이언트가 회선 속도에 맞춰 단계를 선택
+HLS_RENDITIONS = (
+    (360, 800_000, 96_000),
+    (720, 2_800_000, 128_000),
+    (1080, 5_000_000, 128_000),
+)
+# 세그먼트 길이(초) - 짧을수록 재생 시작이 빠르고 단계 전환이 잦아짐
+HLS_SEGMENT_SECONDS = 4
+HLS_MASTER_PLAYLIST = "master.m3u8"
+
+# 지각 해시 계산용 축소 크기와 해시에 사용하는 저주파 DCT 계수 크기 (8x8 = 64비트)
+PHASH_IMAGE_SIZE = 32
+PHASH_HASH_SIZE = 8
+
+# BlurHash 계산용 축소 크기(긴 변 px)와 가로/세로 성분 수 (긴 변 4, 짧은 변 3)
+BLURHASH_IMAGE_SIZE = 32
+BLURHASH_COMPONENTS = (4, 3)
+
+# 썸네일 후보 프레임 수와 추출에 쓸 최대 시간(초)
+THUMBNAIL_CANDIDATES = 8
+THUMBNAIL_TIME_BUDGET = 3.0
+# 점수 계산용으로 줄인 프레임 크기 (너비, 높이)
+SCORE_FRAME_SIZE = (160, 90)
+# 탐색 미리보기 이미지 격자 (열 x 행)와 칸 너비(px), 추출에 쓸 최대 시간(초)
+SPRITE_COLUMNS = 5
+SPRITE_ROWS = 5
+SPRITE_TILE_WIDTH = 160
+SPRITE_TIME_BUDGET = 6.0
+
+def _read_keyframe(video_path: str, position: float) -> Optional[np.ndarray]:
     """
-    이 함수는 썸네일을 생성하는 유틸리티 함수이며, 발생하는 예외는 상위로 던집니다.
+    position 직전의 키프레임 하나만 디코딩하는 함수
+    -skip_frame nokey로 키프레임 외의 프레임은 디코딩하지 않고, -noaccurate_seek로 이동한 키프레임을 그대로 사용하므로
+    GOP가 긴 영상도 위치마다 프레임 하나만 디코딩합니다. (ffmpeg가 회전 정보를 반영)
+    :return: BGR 프레임 (키프레임이 없으면 None)
     """
-    video = cv2.VideoCapture(video_path)
+    try:
+        output, _ = (
+            ffmpeg.input(video_path, ss=position, noaccurate_seek=None, skip_frame="nokey")
+            .output("pipe:", vframes=1, format="image2pipe", vcodec="bmp")
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error:
+        return None
+    if not output:
+        return None
+    return cv2.imdecode(np.frombuffer(output, np.uint8), cv2.IMREAD_COLOR)
 
-    fps = video.get(cv2.CAP_PROP_FPS)  # 프레임 속도(FPS) 얻기
-    frame_number = int(fps * time)  # 지정된 시간에 해당하는 프레임 번호 계산
 
-    # 해당 프레임으로 이동
-    video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-    success, frame = video.read()
+def _sample_frames(video_path: str, count: int, deadline: float) -> List[Tuple[float, np.ndarray]]:
+    """
+    비디오 전체 구간에서 고르게 count개의 프레임을 추출하는 함수
+    앞뒤 5% 구간(검은 화면, 엔딩)은 제외하며, deadline(time.monotonic 기준)이 지나면 그때까지 추출한 프레임만 반환합니다.
+    :return: [(재생 위치(초), BGR 프레임), ...]
+    """
+    capture = cv2.VideoCapture(video_path)
+    frames = []
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0
+        frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        duration = frame_count / fps if fps > 0 and frame_count > 0 else 0
 
-    if success:
-        # 프레임을 이미지로 저장
-        cv2.imwrite(thumbnail_path, frame)
-        return True
-    else:
+        if duration <= 0:
+            # 길이를 알 수 없는 스트림은 앞에서부터 1초 간격으로 추출
+            step = max(1, int(round(fps))) if fps > 0 else 30
+            index = 0
+            while len(frames) < count and time.monotonic() < deadline:
+                success, frame = capture.read()
+                if not success:
+                    break
+                if index % step == 0:
+                    frames.append((index / fps if fps > 0 else 0.0, frame))
+                index += 1
+            return frames
+
+        for position in np.linspace(duration * 0.05, duration * 0.95, count):
+            # 위치 직전의 키프레임만 디코딩 (OpenCV로 시간 이동하면 키프레임부터 해당 위치까지 모두 디코딩함)
+            frame = _read_keyframe(video_path, float(position))
+            if frame is not None:
+                frames.append((float(position), frame))
+            if time.monotonic() >= deadline:
+                break
+        if not frames:
+            # 이동을 지원하지 않는 컨테이너는 첫 프레임 사용
+            capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = capture.read()
+            if success:
+                frames.append((0.0, frame))
+    finally:
+        capture.release()
+    return frames
+
+
+def score_frames(frames: List[np.ndarray]) -> np.ndarray:
+    """
+    프레임들을 밝기, 선명도(라플라시안 분산), 엔트로피로 점수화하는 함수
+    모든 프레임을 같은 크기의 흑백 배열 하나로 쌓아 NumPy 연산 한 번에 계산합니다.
+    :return: 프레임별 점수 (높을수록 썸네일에 적합)
+    """
+    stack = np.stack(
+        [
+            cv2.cvtColor(
+                cv2.resize(frame, SCORE_FRAME_SIZE, interpolation=cv2.INTER_AREA),
+                cv2.COLOR_BGR2GRAY,
+            )
+            for frame in frames
+        ]
+    ).astype(np.float32)
+
+    # 밝기: 중간 밝기(128)에 가까울수록 높음
+    brightness = stack.mean(axis=(1, 2))
+    exposure = 1 - np.abs(brightness - 128) / 128
+
+    # 선명도: 4-이웃 라플라시안의 분산 (흐린 프레임일수록 작음)
+    laplacian = (
+        4 * stack[:, 1:-1, 1:-1]
+        - stack[:, :-2, 1:-1]
+        - stack[:, 2:, 1:-1]
+        - stack[:, 1:-1, :-2]
+        - stack[:, 1:-1, 2:]
+    )
+    sharpness = laplacian.var(axis=(1, 2))
+
+    # 엔트로피: 밝기 분포가 다양할수록(단색 화면이 아닐수록) 높음
+    pixels = stack.astype(np.int64).reshape(len(frames), -1)
+    offsets = np.arange(len(frames))[:, None] * 256
+    histogram = np.bincount((pixels + offsets).ravel(), minlength=len(frames) * 256)
+    probability = histogram.reshape(len(frames), 256) / pixels.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropy = -np.nansum(probability * np.log2(probability), axis=1) / 8
+
+    score = (
+        0.3 * exposure
+        + 0.4 * sharpness / max(float(sharpness.max()), 1e-6)
+        + 0.3 * entropy
+    )
+    # 거의 검거나 하얀 화면은 다른 후보가 있으면 제외
+    score[(brightness < 16) | (brightness > 240)] -= 1
+    return score
+
+
+def create_video_thumbnail(
+    video_path: str, thumbnail_path: str, time_budget: float = THUMBNAIL_TIME_BUDGET
+):
+    """
+    이 함수는 썸네일을 생성하는 유틸리티 함수이며, 발생하는 예외는 상위로 던집니다.
+    여러 위치의 프레임 중 밝기/선명도/엔트로피 점수가 가장 높은 프레임을 썸네일로 저장합니다.
+    블로킹 디코딩 작업이므로 이벤트 루프에서 직접 호출하지 말고 run_cpu로 실행합니다.
+    """
+    deadline = time.monotonic() + time_budget
+    samples = _sample_frames(video_path, THUMBNAIL_CANDIDATES, deadline)
+    if not samples:
         raise ValueError("프레임을 추출할 수 없습니다.")  # 에러를 상위로 던짐
 
-    video.release()
+    best = int(np.argmax(score_frames([frame for _, frame in samples])))
+    # 프레임을 이미지로 저장
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    if not cv2.imwrite(thumbnail_path, samples[best][1]):
+        raise ValueError(f"썸네일을 저장할 수 없습니다: {thumbnail_path}")
+    return True
+
+
+def create_video_sprite(
+    video_path: str,
+    sprite_path: str,
+    columns: int = SPRITE_COLUMNS,
+    rows: int = SPRITE_ROWS,
+    tile_width: int = SPRITE_TILE_WIDTH,
+    time_budget: float = SPRITE_TIME_BUDGET,
+) -> Dict:
+    """
+    재생 바 탐색 미리보기용으로 비디오 전체에서 고르게 추출한 프레임을 격자 하나의 JPEG로 저장하는 함수
+    시간 안에 모든 칸을 채우지 못하면 추출한 프레임까지만 저장합니다.
+    블로킹 디코딩 작업이므로 run_cpu로 실행합니다.
+    :return: {"path", "columns", "rows", "count", "tile_width", "tile_height", "positions"}
+    """
+    deadline = time.monotonic() + time_budget
+    samples = _sample_frames(video_path, columns * rows, deadline)
+    if not samples:
+        raise ValueError("프레임을 추출할 수 없습니다.")
+
+    height, width = samples[0][1].shape[:2]
+    tile_height = _even(height * tile_width / width)
+    sheet = np.zeros((rows * tile_height, columns * tile_width, 3), np.uint8)
+    for index, (_, frame) in enumerate(samples):
+        row, column = divmod(index, columns)
+        sheet[
+            row * tile_height : (row + 1) * tile_height,
+            column * tile_width : (column + 1) * tile_width,
+        ] = cv2.resize(frame, (tile_width, tile_height), interpolation=cv2.INTER_AREA)
+
+    # 채워진 행까지만 저장
+    used_rows = (len(samples) + columns - 1) // columns
+    os.makedirs(os.path.dirname(sprite_path), exist_ok=True)
+    if not cv2.imwrite(
+        sprite_path, sheet[: used_rows * tile_height], [cv2.IMWRITE_JPEG_QUALITY, 75]
+    ):
+        raise ValueError(f"미리보기 이미지를 저장할 수 없습니다: {sprite_path}")
+    return {
+        "path": sprite_path,
+        "columns": columns,
+        "rows": used_rows,
+        "count": len(samples),
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "positions": [round(position, 3) for position, _ in samples],
+    }
 
 def convert_mov_to_mp4(input_path: str, output_path: str):
     """
     이 함수는 비디오 파일을 변환하는 유틸리티 함수이며, 발생하는 예외는 상위로 던집니다.
+    외부 프로세스가 끝날 때까지 블로킹되므로 run_io로 실행합니다.
     """
-    ffmpeg.input(input_path).output(output_path, vcodec='h264', acodec='aac').run()
+    ffmpeg.input(input_path).output(output_path, vcodec='h264', acodec='aac').overwrite_output().run(quiet=True)
     return True
+
+
+def read_image(image_path: str) -> np.ndarray:
+    """
+    이미지를 8비트 BGR(투명도가 있으면 BGRA) 배열로 읽는 함수
+    OpenCV가 읽지 못하는 GIF는 첫 프레임을 사용합니다.
+    """
+    # PNG/WebP는 투명도를 유지하고, 그 외(JPEG 등)는 EXIF 회전 정보를 반영해서 읽음
+    flags = (
+        cv2.IMREAD_UNCHANGED
+        if image_path.lower().endswith((".png", ".webp"))
+        else cv2.IMREAD_COLOR
+    )
+    image = cv2.imread(image_path, flags)
+    if image is None:
+        capture = cv2.VideoCapture(image_path)
+        try:
+            success, image = capture.read()
+        finally:
+            capture.release()
+        if not success:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {image_path}")
+
+    if image.dtype != np.uint8:
+        image = (image / 257).astype(np.uint8)  # 16비트 이미지
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    return image
+
+
+def _flatten_alpha(image: np.ndarray) -> np.ndarray:
+    """
+    투명 영역을 흰색 배경으로 합성하는 함수 (JPEG는 투명도를 지원하지 않음)
+    """
+    if image.shape[2] != 4:
+        return image
+    alpha = image[:, :, 3:4].astype(np.float32) / 255
+    color = image[:, :, :3].astype(np.float32)
+    return (color * alpha + 255 * (1 - alpha)).astype(np.uint8)
+
+
+def create_image_variants(
+    image_path: str, output_dir: str, widths=IMAGE_VARIANT_WIDTHS
+) -> List[Dict]:
+    """
+    이미지를 여러 너비의 WebP/JPEG 파생본으로 저장하는 함수
+    원본보다 큰 너비로는 확대하지 않으며, 원본이 가장 작은 너비보다 작으면 원본 크기로 하나만 만듭니다.
+    블로킹 인코딩 작업이므로 run_cpu로 실행합니다.
+    :return: [{"path", "width", "height", "format"}, ...] (너비 오름차순)
+    """
+    image = read_image(image_path)
+    height, width = image.shape[:2]
+    targets = sorted({min(target, width) for target in widths})
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    variants = []
+    for target in targets:
+        target_height = max(1, round(height * target / width))
+        # 축소는 INTER_AREA가 계단 현상이 적음
+        resized = (
+            image
+            if target == width
+            else cv2.resize(image, (target, target_height), interpolation=cv2.INTER_AREA)
+        )
+        for image_format, (extension, params) in IMAGE_VARIANT_FORMATS.items():
+            encoded = resized if image_format == "webp" else _flatten_alpha(resized)
+            variant_path = os.path.join(output_dir, f"{stem}_{target}w{extension}")
+            if not cv2.imwrite(variant_path, encoded, params):
+                raise ValueError(f"이미지 파생본을 저장할 수 없습니다: {variant_path}")
+            variants.append(
+                {
+                    "path": variant_path,
+                    "width": target,
+                    "height": target_height,
+                    "format": image_format,
+                }
+            )
+    return variants
+
+
+def _even(value: float) -> int:
+    # H.264는 가로/세로가 짝수여야 함
+    return max(2, int(round(value / 2)) * 2)
+
+
+def _probe_video(video_path: str):
+    """
+    비디오의 화면 크기(회전 반영)와 오디오 유무를 반환하는 함수
+    """
+    probe = ffmpeg.probe(video_path)
+    video = next((s for s in probe["streams"] if s["codec_type"] == "video"), None)
+    if video is None:
+        raise ValueError(f"비디오 스트림을 찾을 수 없습니다: {video_path}")
+    has_audio = any(s["codec_type"] == "audio" for s in probe["streams"])
+
+    width, height = int(video["width"]), int(video["height"])
+    # 휴대폰 세로 영상은 회전 정보로 저장되며, ffmpeg가 인코딩 시 자동으로 회전시킴
+    rotation = int(float(video.get("tags", {}).get("rotate", 0)))
+    for side_data in video.get("side_data_list", []):
+        rotation = int(float(side_data.get("rotation", rotation)))
+    if abs(rotation) % 180 == 90:
+        width, height = height, width
+    return width, height, has_audio
+
+
+def create_hls_ladder(video_path: str, output_dir: str, renditions=HLS_RENDITIONS) -> str:
+    """
+    비디오를 여러 화질의 HLS 세그먼트와 마스터 플레이리스트로 변환하는 함수
+    모든 단계의 키프레임을 세그먼트 경계에 맞춰 화질 전환 시 끊김이 없도록 합니다.
+    외부 프로세스가 끝날 때까지 블로킹되므로 run_io로 실행합니다.
+    :return: 마스터 플레이리스트 경로
+    """
+    width, height, has_audio = _probe_video(video_path)
+    short_side = min(width, height)
+    targets = [r for r in renditions if r[0] <= short_side] or [
+        (_even(short_side), *renditions[0][1:])
+    ]
+
+    os.makedirs(output_dir, exist_ok=True)
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for target, video_bitrate, audio_bitrate in targets:
+        name = f"{target}p"
+        scale = target / short_side
+        out_width, out_height = _even(width * scale), _even(height * scale)
+
+        source = ffmpeg.input(video_path)
+        streams = [source.video.filter("scale", out_width, out_height)]
+        options = {
+            "vcodec": "libx264",
+            "preset": "veryfast",
+            "profile:v": "main",
+            "b:v": video_bitrate,
+            "maxrate": int(video_bitrate * 1.07),
+            "bufsize": video_bitrate * 2,
+            "force_key_frames": f"expr:gte(t,n_forced*{HLS_SEGMENT_SECONDS})",
+            "sc_threshold": 0,
+            "f": "hls",
+            "hls_time": HLS_SEGMENT_SECONDS,
+            "hls_playlist_type": "vod",
+            "hls_segment_filename": os.path.join(output_dir, f"{name}_%04d.ts"),
+        }
+        if has_audio:
+            streams.append(source.audio)
+            options.update({"acodec": "aac", "b:a": audio_bitrate, "ac": 2})
+        ffmpeg.output(
+            *streams, os.path.join(output_dir, f"{name}.m3u8"), **options
+        ).overwrite_output().run(quiet=True)
+
+        bandwidth = int(video_bitrate * 1.07) + (audio_bitrate if has_audio else 0)
+        # H.264 Main 프로필, 720p 이하는 레벨 3.1, 그 이상은 4.0
+        codecs = "avc1.4d401f" if target <= 720 else "avc1.4d4028"
+        if has_audio:
+            codecs += ",mp4a.40.2"
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},"
+            f'RESOLUTION={out_width}x{out_height},CODECS="{codecs}"'
+        )
+        lines.append(f"{name}.m3u8")
+
+    # 모든 단계가 만들어진 뒤 마스터 플레이리스트를 저장 (중간에 실패하면 재시도 시 다시 생성)
+    master_path = os.path.join(output_dir, HLS_MASTER_PLAYLIST)
+    tmp_path = master_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as playlist:
+        playlist.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, master_path)
+    return master_path
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    # 직교 DCT-II 변환 행렬 (D @ X @ D.T 가 2차원 DCT)
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_PHASH_DCT = _dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def compute_phash(image: np.ndarray) -> str:
+    """
+    이미지의 64비트 지각 해시(pHash)를 계산하는 함수
+    크기 조정, 재압축, 약한 색 보정에도 해시가 거의 바뀌지 않아 해밍 거리로 유사 이미지를 찾을 수 있습니다.
+    :return: 16진수 문자열 (16자)
+    """
+    image = _flatten_alpha(image)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(
+        gray, (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), interpolation=cv2.INTER_AREA
+    ).astype(np.float64)
+
+    # 저주파 계수가 중앙값보다 큰지로 비트 결정 (평균 밝기인 DC 계수는 중앙값 계산에서 제외)
+    low = (_PHASH_DCT @ small @ _PHASH_DCT.T)[:PHASH_HASH_SIZE, :PHASH_HASH_SIZE].ravel()
+    bits = low > np.median(low[1:])
+    return np.packbits(bits).tobytes().hex()
+
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(
+        _BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length)
+    )
+
+
+def _srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    values = values / 255
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 0, 1)
+    srgb = np.where(
+        values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055
+    )
+    return np.round(srgb * 255).astype(int)
+
+
+def encode_blurhash(image: np.ndarray) -> str:
+    """
+    이미지를 BlurHash 문자열(20~30자)로 인코딩하는 함수
+    클라이언트는 미디어를 받기 전에 이 값으로 흐린 미리보기를 그릴 수 있습니다.
+    모든 성분을 코사인 기저 행렬과의 행렬 곱 한 번으로 계산합니다.
+    """
+    image = _flatten_alpha(image)
+    height, width = image.shape[:2]
+    scale = BLURHASH_IMAGE_SIZE / max(width, height)
+    small_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    small = cv2.resize(image, small_size, interpolation=cv2.INTER_AREA)
+    linear = _srgb_to_linear(small[:, :, ::-1].astype(np.float64))  # BGR -> RGB
+    small_height, small_width = linear.shape[:2]
+
+    x_components, y_components = (
+        BLURHASH_COMPONENTS if width >= height else BLURHASH_COMPONENTS[::-1]
+    )
+    basis_x = np.cos(
+        np.pi * np.arange(x_components)[:, None] * np.arange(small_width)[None, :] / small_width
+    )
+    basis_y = np.cos(
+        np.pi * np.arange(y_components)[:, None] * np.arange(small_height)[None, :] / small_height
+    )
+    # factors[j, i] = 성분 (i, j)의 RGB 값
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear)
+    factors /= small_width * small_height
+    factors[1:, :] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if len(ac):
+        quantised_max = int(np.clip(np.floor(np.abs(ac).max() * 166 - 0.5), 0, 82))
+        maximum = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += _base83(0, 1)
+
+    r, g, b = _linear_to_srgb(dc)
+    result += _base83((int(r) << 16) + (int(g) << 8) + int(b), 4)
+
+    scaled = ac / maximum
+    quantised = np.clip(
+        np.floor(np.sign(scaled) * np.abs(scaled) ** 0.5 * 9 + 9.5), 0, 18
+    ).astype(int)
+    for qr, qg, qb in quantised:
+        result += _base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return result
+
+
+def get_image_metadata(image_path: str) -> Dict:
+    """
+    이미지를 한 번 디코딩해서 크기, BlurHash, 지각 해시를 계산하는 함수
+    블로킹 디코딩 작업이므로 run_cpu로 실행합니다.
+    :return: {"width", "height", "blurhash", "phash"}
+    """
+    image = read_image(image_path)
+    height, width = image.shape[:2]
+    return {
+        "width": width,
+        "height": height,
+        "blurhash": encode_blurhash(image),
+        "phash": compute_phash(image),
+    }
+
+
+def get_video_metadata(video_path: str, thumbnail_path: str) -> Dict:
+    """
+    비디오의 화면 크기(회전 반영), 재생 시간과 썸네일의 BlurHash를 계산하는 함수
+    블로킹 디코딩 작업이므로 run_cpu로 실행합니다.
+    :return: {"width", "height", "duration", "blurhash"}
+    """
+    capture = cv2.VideoCapture(video_path)
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0
+        frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # OpenCV는 회전 정보를 반영해서 디코딩하지만 크기 속성은 저장된 크기를 반환함
+        if abs(int(capture.get(cv2.CAP_PROP_ORIENTATION_META) or 0)) % 180 == 90:
+            width, height = height, width
+    finally:
+        capture.release()
+
+    thumbnail = read_image(thumbnail_path)
+    return {
+        "width": width,
+        "height": height,
+        "duration": round(frame_count / fps, 3) if fps > 0 and frame_count > 0 else None,
+        "blurhash": encode_blurhash(thumbnail),
+    }
@@ -1,85 +1,182 @@
-import requests
-import os
-import firebase_admin
-from odmantic import AIOEngine, ObjectId
-from app.database.models.post import Post
-from app.database.models.user import User
-from app.database.models.token import FCMToken
-from firebase_admin import messaging, credentials
-
-from app.utils.user_utils import get_user_by_object_id
-
-# 현재 파일의 위치를 기준으로 프로젝트 루트 경로를 계산
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# 서비스 계정 키 파일의 절대 경로
-service_account_path = os.path.join(
-    project_root, "firebase_kawaii_gallery.json"
-)
-
-# Firebase Admin SDK 초기화
-print(service_account_path)
-cred = credentials.Certificate(service_account_path)
-default_app = firebase_admin.initialize_app(cred)
-
-
-async def send_fcm_notification(
-    engine: AIOEngine,
-    user_id: ObjectId,
-    post_id: ObjectId,
-    title: str,
-    body_template: str,
-):
-    # 게시글 데이터 가져오기
-    post = await engine.find_one(Post, Post.id == post_id)
+import json
+import logging
+import time
+from typing import Any, Dict, List
+from odmantic import ObjectId
+import redis.asyncio as aioredis
+
+from app.utils.settings import NOTIFICATION_COALESCE_WINDOW
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 전송 대기 중인 알림 이벤트 (LPUSH로 넣고 알림 전송 루프가 오른쪽에서 꺼냄)
+NOTIFICATION_QUEUE_KEY = "notifications:queue"
+# 일시적인 오류로 다시 보낼 알림 이벤트 (ZSET, 점수는 다시 보낼 시각)
+NOTIFICATION_RETRY_KEY = "notifications:retry"
+# 알림 전송 통계 (HASH, 항목별 누적 건수)
+NOTIFICATION_STATS_KEY = "notifications:stats"
+# 모으는 중인 알림 (게시글/종류별 HASH: 마지막으로 보낸 사용자, SET: 보낸 사용자 목록)
+NOTIFICATION_PENDING_KEY_PREFIX = "notifications:pending:"
+# 모으는 중인 알림을 보낼 시각 (ZSET, 멤버는 "{게시글ID}:{종류}", 점수는 보낼 시각)
+NOTIFICATION_WINDOWS_KEY = "notifications:windows"
+# 워커가 멈춰 보내지 못한 알림을 보관하는 시간(초)
+NOTIFICATION_PENDING_TTL = 24 * 60 * 60
+# 한 번에 보낼 시각이 된 알림을 꺼내는 최대 수
+NOTIFICATION_FLUSH_LIMIT = 500
+
+# 알림 종류
+LIKE_NOTIFICATION = "like"
+COMMENT_NOTIFICATION = "comment"
+
+# 알림 종류별 제목과 본문 ('{보낸 사용자 닉네임}', '{게시글 제목}')
+NOTIFICATION_TEMPLATES = {
+    LIKE_NOTIFICATION: ("좋아요!", "'{}'님이 당신의 게시글 '{}'을(를) 좋아합니다."),
+    COMMENT_NOTIFICATION: ("댓글!", "'{}'님이 당신의 게시글 '{}'에 댓글을 달았습니다."),
+}
+# 여러 사용자의 알림을 모아서 보낼 때의 본문 ('{마지막 사용자 닉네임}', '{나머지 사용자 수}', '{게시글 제목}')
+NOTIFICATION_SUMMARY_TEMPLATES = {
+    LIKE_NOTIFICATION: "'{}'님 외 {}명이 당신의 게시글 '{}'을(를) 좋아합니다.",
+    COMMENT_NOTIFICATION: "'{}'님 외 {}명이 당신의 게시글 '{}'에 댓글을 달았습니다.",
+}
+
+# 보낼 시각이 된 모으는 중인 알림을 꺼내는 스크립트
+# KEYS[1]: 보낼 시각 ZSET, ARGV[1]: 현재 시각, ARGV[2]: 최대 개수, ARGV[3]: 모으는 중인 알림 키 접두사
+# 반환: [멤버, 마지막 사용자 ID, 사용자 수, ...]
+_FLUSH_DUE_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local result = {}
+for _, member in ipairs(members) do
+    redis.call('ZREM', KEYS[1], member)
+    local key = ARGV[3] .. member
+    local user_id = redis.call('HGET', key, 'user_id')
+    local count = redis.call('SCARD', key .. ':users')
+    redis.call('DEL', key, key .. ':users')
+    if user_id then
+        table.insert(result, member)
+        table.insert(result, user_id)
+        table.insert(result, count)
+    end
+end
+return result
+"""
+
+
+def build_notification_event(
+    notification_type: str, user_id: ObjectId, post_id: ObjectId, count: int = 1
+) -> Dict[str, Any]:
+    """
+    알림 이벤트 페이로드를 생성하는 함수
+    :param user_id: 알림을 발생시킨 사용자 ID (좋아요를 누르거나 댓글을 단 사용자, 모은 알림은 마지막 사용자)
+    :param count: 모은 알림의 사용자 수
+    """
+    return {
+        "type": notification_type,
+        "user_id": str(user_id),
+        "post_id": str(post_id),
+        "count": count,
+        "created_at": int(time.time()),
+        "attempts": 0,
+    }
 
-    if not post:
-        print(f"Post not found for post_id: {post_id}")
-        return
 
-    # 작성자에게 등록된 FCM 토큰 가져오기
-    token = await engine.find_one(FCMToken, FCMToken.user_id == post.user_id)
+def dumps_notification_event(event: Dict[str, Any]) -> str:
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"))
 
-    if not token:
-        print("No FCM tokens found for user")
-        return
 
-    user: User = await get_user_by_object_id(engine, user_id)
+async def enqueue_notification(
+    redis: aioredis.Redis, notification_type: str, user_id: ObjectId, post_id: ObjectId
+) -> None:
+    """
+    알림 이벤트를 등록하는 함수 (Firebase 전송은 워커의 알림 전송 루프가 일괄 처리)
+    요청은 Firebase 응답을 기다리지 않으며, Firebase 장애가 요청 처리에 영향을 주지 않습니다.
 
-    # FCM 메시지 페이로드 구성
-    notification_data = {
-        "title": title,
-        "body": body_template.format(user.nick_name, post.title),
-    }
+    같은 게시글의 같은 종류 알림은 NOTIFICATION_COALESCE_WINDOW초 동안 모았다가
+    "'X'님 외 N명이 ..." 알림 하나로 보냅니다. (요청당 Redis 왕복 1회, DB 조회 없음)
+    """
+    if NOTIFICATION_COALESCE_WINDOW <= 0:
+        event = build_notification_event(notification_type, user_id, post_id)
+        pipe = redis.pipeline(transaction=False)
+        pipe.lpush(NOTIFICATION_QUEUE_KEY, dumps_notification_event(event))
+        pipe.hincrby(NOTIFICATION_STATS_KEY, "enqueued", 1)
+        await pipe.execute()
+        return
 
-    # 각 FCM 토큰으로 알림 전송
-    # 메시지 생성
-    message = messaging.Message(
-        notification=messaging.Notification(
-            title=notification_data["title"], body=notification_data["body"]
-        ),
-        token=token.fcm_token,
-        data={"post_id": str(post_id)},
+    member = f"{post_id}:{notification_type}"
+    key = NOTIFICATION_PENDING_KEY_PREFIX + member
+    pipe = redis.pipeline(transaction=True)
+    pipe.hset(key, "user_id", str(user_id))
+    pipe.sadd(f"{key}:users", str(user_id))
+    pipe.expire(key, NOTIFICATION_PENDING_TTL)
+    pipe.expire(f"{key}:users", NOTIFICATION_PENDING_TTL)
+    # 처음 모으기 시작한 알림만 보낼 시각을 정함 (이후 알림은 같은 시각에 함께 전송)
+    pipe.zadd(
+        NOTIFICATION_WINDOWS_KEY, {member: time.time() + NOTIFICATION_COALESCE_WINDOW}, nx=True
     )
+    pipe.hincrby(NOTIFICATION_STATS_KEY, "enqueued", 1)
+    await pipe.execute()
+
+
+async def flush_due_notifications(redis: aioredis.Redis) -> int:
+    """
+    보낼 시각이 된 모으는 중인 알림을 게시글/종류별 이벤트 하나로 만들어 대기열에 넣는 함수 (워커에서 주기적으로 호출)
+    :return: 대기열에 넣은 이벤트 수
+    """
+    script = redis.register_script(_FLUSH_DUE_SCRIPT)
+    result = await script(
+        keys=[NOTIFICATION_WINDOWS_KEY],
+        args=[time.time(), NOTIFICATION_FLUSH_LIMIT, NOTIFICATION_PENDING_KEY_PREFIX],
+    )
+
+    payloads = []
+    for index in range(0, len(result), 3):
+        member, user_id, count = result[index : index + 3]
+        post_id, notification_type = member.rsplit(":", 1)
+        event = build_notification_event(notification_type, user_id, post_id, int(count))
+        payloads.append(dumps_notification_event(event))
 
-    # 메시지 전송
-    response = messaging.send(message)
-    print(f"알림 전송 성공 : {response}")
+    if payloads:
+        pipe = redis.pipeline(transaction=False)
+        pipe.lpush(NOTIFICATION_QUEUE_KEY, *payloads)
+        pipe.hincrby(NOTIFICATION_STATS_KEY, "flushed", len(payloads))
+        await pipe.execute()
+    return len(payloads)
 
 
 # 좋아요 알림 전송 함수
 async def send_like_notification(
-    engine: AIOEngine, user_id: ObjectId, post_id: ObjectId
+    redis: aioredis.Redis, user_id: ObjectId, post_id: ObjectId
 ):
-    title = "좋아요!"
-    body_template = "'{}'님이 당신의 게시글 '{}'을(를) 좋아합니다."
-    await send_fcm_notification(engine, user_id, post_id, title, body_template)
+    await enqueue_notification(redis, LIKE_NOTIFICATION, user_id, post_id)
 
 
 # 댓글 알림 전송 함수
 async def send_comment_notification(
-    engine: AIOEngine, user_id: ObjectId, post_id: ObjectId
+    redis: aioredis.Redis, user_id: ObjectId, post_id: ObjectId
 ):
-    title = "댓글!"
-    body_template = "'{}'님이 당신의 게시글 '{}'에 댓글을 달았습니다."
-    await send_fcm_notification(engine, user_id, post_id, title, body_template)
+    await enqueue_notification(redis, COMMENT_NOTIFICATION, user_id, post_id)
+
+
+async def get_notification_stats(redis: aioredis.Redis) -> Dict[str, int]:
+    """
+    알림 전송 통계와 현재 대기 중인 알림 수를 반환하는 함수
+    """
+    pipe = redis.pipeline(transaction=False)
+    pipe.hgetall(NOTIFICATION_STATS_KEY)
+    pipe.llen(NOTIFICATION_QUEUE_KEY)
+    pipe.zcard(NOTIFICATION_RETRY_KEY)
+    pipe.zcard(NOTIFICATION_WINDOWS_KEY)
+    counters, queued, retrying, coalescing = await pipe.execute()
+    stats = {name: int(value) for name, value in counters.items()}
+    stats.update(queued=queued, retrying=retrying, coalescing=coalescing)
+    return stats
+
+
+def parse_notification_events(raws: List[str]) -> List[Dict[str, Any]]:
+    events = []
+    for raw in raws:
+        try:
+            events.append(json.loads(raw))
+        except ValueError:
+            logger.error(f"잘못된 알림 이벤트 페이로드: {raw}")
+    return events
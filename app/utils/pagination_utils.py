@@ -0,0 +1,124 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from odmantic import AIOEngine, ObjectId
+from odmantic.query import desc
+
+from app.database.models.post import Post
+
+# 한 페이지의 기본/최대 게시글 수
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+# 정렬 기준별 (커서 값 필드, 정렬 키) 매핑
+# 모든 정렬은 (값, _id) 내림차순으로 고정해서 동일한 값이 있어도 순서가 흔들리지 않습니다.
+POST_SORT_FIELDS = {
+    "created_at": "created_at",
+    "likes": "likes_count",
+}
+
+# 커서 값이 필요 없는 정렬 기준 (_id만으로 정렬)
+ID_ONLY_SORTS = ("recent",)
+
+
+def encode_cursor(sort_by: str, value: Any, object_id: ObjectId) -> str:
+    """
+    마지막 항목의 (정렬 값, _id)를 URL에 안전한 커서 문자열로 인코딩하는 함수
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "v": value, "id": str(object_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, ObjectId]:
+    """
+    커서 문자열을 (정렬 값, _id)로 디코딩하는 함수
+    정렬 기준이 다르거나 형식이 잘못된 커서는 400 에러를 발생시킵니다.
+    값은 그대로 쿼리에 들어가므로 정렬 기준에 맞는 타입만 허용합니다. (created_at은 문자열, 나머지는 숫자)
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["s"] != sort_by:
+            raise ValueError("sort mismatch")
+
+        value = payload["v"]
+        if sort_by in ID_ONLY_SORTS:
+            value = None
+        elif sort_by == "created_at":
+            if not isinstance(value, str):
+                raise TypeError("created_at cursor must be a string")
+            value = datetime.fromisoformat(value)
+        elif (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not math.isfinite(value)
+        ):
+            # {"$gt": null} 같은 연산자나 NaN이 쿼리에 들어가지 않도록 숫자만 허용
+            raise TypeError("numeric cursor must be a number")
+        return value, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def build_keyset_query(field: str, value: Any, object_id: ObjectId) -> dict:
+    """
+    (field, _id) 내림차순 기준으로 커서 이후의 항목만 조회하는 쿼리를 생성하는 함수
+    """
+    return {
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": object_id}},
+        ]
+    }
+
+
+async def paginate_posts(
+    engine: AIOEngine,
+    query: Optional[dict] = None,
+    sort_by: str = "created_at",
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Post], Optional[str]]:
+    """
+    게시글을 커서 기반(keyset)으로 페이지네이션하는 함수
+    skip 없이 인덱스 범위 조회만 하므로 N번째 페이지도 첫 페이지와 같은 비용이 듭니다.
+    :return: (게시글 목록, 다음 페이지 커서 또는 None)
+    """
+    field = POST_SORT_FIELDS[sort_by]
+    conditions = [query] if query else []
+
+    if cursor:
+        value, object_id = decode_cursor(cursor, sort_by)
+        conditions.append(build_keyset_query(field, value, object_id))
+
+    if not conditions:
+        filter_query = {}
+    elif len(conditions) == 1:
+        filter_query = conditions[0]
+    else:
+        filter_query = {"$and": conditions}
+
+    sort_field = Post.created_at if sort_by == "created_at" else Post.likes_count
+
+    # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+    posts = await engine.find(
+        Post,
+        filter_query,
+        sort=(desc(sort_field), desc(Post.id)),
+        limit=limit + 1,
+    )
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        next_cursor = encode_cursor(sort_by, getattr(last, field), last.id)
+
+    return posts, next_cursor
@@ -0,0 +1,58 @@
+from typing import Any, Dict, List, Optional
+from odmantic import AIOEngine, ObjectId
+import redis.asyncio as aioredis
+from app.database.models.post import Post
+from app.utils.cache_utils import invalidate_cache
+
+# 게시글 상세/댓글 목록 응답 캐시 만료 시간(초)
+POST_DETAIL_CACHE_TTL = 60
+POST_COMMENTS_CACHE_TTL = 60
+
+
+# 게시글 상세 응답 캐시 키
+def get_post_detail_cache_key(post_id: ObjectId) -> str:
+    return f"post:{post_id}:detail"
+
+
+# 게시글 댓글 목록 응답 캐시 키
+def get_post_comments_cache_key(post_id: ObjectId) -> str:
+    return f"post:{post_id}:comments"
+
+
+# 게시글이 수정/삭제되거나 좋아요 수, 작성자 닉네임이 바뀌었을 때 상세 캐시를 무효화하는 함수
+async def invalidate_post_cache(redis: aioredis.Redis, *post_ids: ObjectId) -> None:
+    await invalidate_cache(
+        redis, *(get_post_detail_cache_key(post_id) for post_id in post_ids)
+    )
+
+
+# 댓글이 작성/수정/블라인드되거나 게시글이 삭제되었을 때 댓글 목록 캐시를 무효화하는 함수
+async def invalidate_comments_cache(redis: aioredis.Redis, post_id: ObjectId) -> None:
+    await invalidate_cache(redis, get_post_comments_cache_key(post_id))
+
+
+# ID 목록의 게시글을 한 번의 쿼리로 가져와 ID 순서대로 정렬하는 함수
+async def get_posts_by_ids(engine: AIOEngine, post_ids: List[ObjectId]) -> List[Post]:
+    if not post_ids:
+        return []
+    posts = await engine.find(Post, Post.id.in_(post_ids))
+    by_id = {post.id: post for post in posts}
+    # 삭제된 게시글은 건너뜀
+    return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+
+# 게시글에 첨부된 미디어 파일 하나의 필드를 갱신하는 함수 (게시글 문서를 다시 저장하지 않음)
+# 게시글이나 파일이 삭제되었으면(url이 주어지면 파일 URL이 바뀌었어도) False를 반환
+async def update_media_file(
+    engine: AIOEngine,
+    post_id: ObjectId,
+    media_id: ObjectId,
+    fields: Dict[str, Any],
+    url: Optional[str] = None,
+) -> bool:
+    match = {"id": media_id} if url is None else {"id": media_id, "url": url}
+    result = await engine.get_collection(Post).update_one(
+        {"_id": post_id, "files": {"$elemMatch": match}},
+        {"$set": {f"files.$.{key}": value for key, value in fields.items()}},
+    )
+    return result.matched_count > 0
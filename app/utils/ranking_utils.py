@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+import redis.asyncio as aioredis
+
+from app.utils.redis_utils import increment_once
+from app.utils.time_util import KST, get_seconds_until_midnight_kst
+
+# 시간/일 단위 점수 버킷 ZSET 키 접두사
+HOUR_BUCKET_PREFIX = "popular_posts:hour"
+DAY_BUCKET_PREFIX = "popular_posts:day"
+
+# 버킷 만료 시간 (가장 긴 윈도우보다 조금 길게 유지)
+HOUR_BUCKET_TTL = 25 * 60 * 60
+DAY_BUCKET_TTL = 31 * 24 * 60 * 60
+
+# 윈도우별 집계 설정
+# - unit: 합산할 버킷 단위, size: 합산할 버킷 수
+# - decay: 한 버킷 지날 때마다 곱해지는 가중치 (1.0이면 감쇠 없음)
+POPULAR_WINDOWS = {
+    "24h": {"unit": "hour", "size": 24, "decay": 1.0},
+    "7d": {"unit": "day", "size": 7, "decay": 0.9},
+    "30d": {"unit": "day", "size": 30, "decay": 0.95},
+}
+DEFAULT_POPULAR_WINDOW = "24h"
+
+# 합산된 윈도우 ZSET을 재사용하는 시간(초)
+# 이 시간 동안은 ZREVRANGE만으로 순위를 조회합니다.
+POPULAR_WINDOW_TTL = 30
+
+# 윈도우별 인기 게시글 응답 캐시 (HASH, 필드는 limit) 만료 시간(초)
+POPULAR_POSTS_CACHE_TTL = 10
+
+
+def _bucket_key(unit: str, moment: datetime) -> str:
+    if unit == "hour":
+        return f"{HOUR_BUCKET_PREFIX}:{moment.strftime('%Y%m%d%H')}"
+    return f"{DAY_BUCKET_PREFIX}:{moment.strftime('%Y%m%d')}"
+
+
+def get_bucket_keys(unit: str, size: int, now: Optional[datetime] = None) -> List[str]:
+    """
+    현재(KST) 버킷부터 과거 순으로 size개의 버킷 키를 반환하는 함수
+    """
+    now = now or datetime.now(KST)
+    step = timedelta(hours=1) if unit == "hour" else timedelta(days=1)
+    return [_bucket_key(unit, now - step * age) for age in range(size)]
+
+
+def get_window_key(window: str) -> str:
+    return f"popular_posts:window:{window}"
+
+
+def get_popular_cache_key(window: str) -> str:
+    return f"popular_posts:cache:{window}"
+
+
+# 점수가 바뀔 때 무효화할 인기 게시글 응답 캐시 키 목록
+POPULAR_CACHE_KEYS = [get_popular_cache_key(window) for window in POPULAR_WINDOWS]
+
+
+async def record_like_score(
+    redis: aioredis.Redis, post_id: str, user_id: str
+) -> bool:
+    """
+    사용자가 오늘 처음 누른 좋아요일 때만 현재 시간/일 버킷에 인기 점수를 1 올리는 함수
+    중복 체크와 두 버킷 증가, 응답 캐시 무효화를 한 번의 Redis 호출로 처리합니다.
+    :return: 오늘 처음 누른 좋아요면 True
+    """
+    now = datetime.now(KST)
+    return await increment_once(
+        redis,
+        dedupe_key=f"post:{post_id}:like_user",
+        dedupe_field=user_id,
+        dedupe_value="notified",
+        # 같은 사용자의 좋아요는 자정까지 한 번만 집계
+        dedupe_ttl=get_seconds_until_midnight_kst(),
+        score_keys=[
+            (_bucket_key("hour", now), HOUR_BUCKET_TTL),
+            (_bucket_key("day", now), DAY_BUCKET_TTL),
+        ],
+        member=post_id,
+        invalidate_keys=POPULAR_CACHE_KEYS,
+    )
+
+
+async def get_top_post_ids(
+    redis: aioredis.Redis, window: str, limit: int
+) -> List[str]:
+    """
+    윈도우 기간 동안 점수가 높은 게시글 ID를 순서대로 반환하는 함수
+    합산된 윈도우 ZSET이 있으면 ZREVRANGE(O(log N + limit))만 수행하고,
+    없으면 버킷들을 ZUNIONSTORE(감쇠 가중치 적용)로 합산해 잠시 저장합니다.
+    """
+    config = POPULAR_WINDOWS[window]
+    window_key = get_window_key(window)
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.exists(window_key)
+    pipe.zrevrange(window_key, 0, limit - 1)
+    exists, post_ids = await pipe.execute()
+    if exists:
+        return post_ids
+
+    bucket_keys = get_bucket_keys(config["unit"], config["size"])
+    weights = {key: config["decay"] ** age for age, key in enumerate(bucket_keys)}
+
+    pipe = redis.pipeline(transaction=True)
+    pipe.zunionstore(window_key, weights)
+    pipe.expire(window_key, POPULAR_WINDOW_TTL)
+    pipe.zrevrange(window_key, 0, limit - 1)
+    _, _, post_ids = await pipe.execute()
+    return post_ids
+
+
+async def remove_post_from_rankings(redis: aioredis.Redis, post_id: str) -> None:
+    """
+    삭제된 게시글을 모든 버킷에서 제거하고 합산된 윈도우와 응답 캐시를 지우는 함수
+    윈도우 ZSET은 다음 조회 때 버킷에서 다시 합산되므로, 삭제된 게시글이 POPULAR_WINDOW_TTL 동안
+    인기 게시글에 다시 나타나지 않습니다. (버킷 제거와 윈도우 삭제는 한 트랜잭션으로 처리)
+    """
+    keys = set(get_bucket_keys("hour", POPULAR_WINDOWS["24h"]["size"]))
+    keys.update(get_bucket_keys("day", max(c["size"] for c in POPULAR_WINDOWS.values())))
+
+    pipe = redis.pipeline(transaction=True)
+    for key in keys:
+        pipe.zrem(key, post_id)
+    pipe.delete(*(get_window_key(window) for window in POPULAR_WINDOWS), *POPULAR_CACHE_KEYS)
+    await pipe.execute()
@@ -0,0 +1,60 @@
+from typing import Iterable, Sequence, Tuple
+import redis.asyncio as aioredis
+
+# 중복 체크 HASH에 처음 기록될 때만 ZSET 점수들을 올리는 스크립트
+# KEYS[1]: 중복 체크용 HASH, KEYS[2..n+1]: 점수 ZSET, KEYS[n+2..]: 함께 삭제할 캐시 키
+# ARGV[1]: HASH 필드, ARGV[2]: HASH 값, ARGV[3]: HASH 만료(초)
+# ARGV[4]: ZSET 멤버, ARGV[5]: 증가량, ARGV[6]: ZSET 개수(n)
+# ARGV[7..n+6]: 각 ZSET 만료(초, 0이면 설정하지 않음)
+_INCREMENT_ONCE_SCRIPT = """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+local n = tonumber(ARGV[6])
+for i = 1, n do
+    redis.call('ZINCRBY', KEYS[1 + i], ARGV[5], ARGV[4])
+    local ttl = tonumber(ARGV[6 + i])
+    if ttl > 0 then
+        redis.call('EXPIRE', KEYS[1 + i], ttl)
+    end
+end
+for i = n + 2, #KEYS do
+    redis.call('DEL', KEYS[i])
+end
+return 1
+"""
+
+
+async def increment_once(
+    redis: aioredis.Redis,
+    dedupe_key: str,
+    dedupe_field: str,
+    dedupe_ttl: int,
+    score_keys: Sequence[Tuple[str, int]],
+    member: str,
+    amount: float = 1,
+    invalidate_keys: Iterable[str] = (),
+    dedupe_value: str = "1",
+) -> bool:
+    """
+    dedupe_key HASH에 dedupe_field가 없을 때만 기록하고 score_keys의 각 ZSET에서 member 점수를 올리는 함수
+    중복 체크, 만료 설정, 점수 증가, 캐시 무효화를 Lua 스크립트 하나로 원자적으로 처리하므로
+    Redis 왕복은 한 번입니다. (예: 사용자별 하루 한 번만 집계되는 카운터)
+    :param score_keys: (ZSET 키, 만료 초) 목록. 만료가 0이면 만료를 설정하지 않습니다.
+    :return: 이번 호출로 처음 기록되어 점수가 올랐으면 True, 이미 기록되어 있었으면 False
+    """
+    script = redis.register_script(_INCREMENT_ONCE_SCRIPT)
+    result = await script(
+        keys=[dedupe_key, *(key for key, _ in score_keys), *invalidate_keys],
+        args=[
+            dedupe_field,
+            dedupe_value,
+            dedupe_ttl,
+            member,
+            amount,
+            len(score_keys),
+            *(ttl for _, ttl in score_keys),
+        ],
+    )
+    return bool(result)
@@ -0,0 +1,266 @@
+import logging
+import math
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+from odmantic import AIOEngine, ObjectId
+
+from app.database.models.post import Post
+from app.database.models.search import PostSearchIndex
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+from app.utils.post_utils import get_posts_by_ids
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# n-gram 크기 (한국어는 형태소 분석 없이도 2-gram으로 부분 일치 검색이 가능)
+NGRAM_SIZE = 2
+# 검색어 토큰 중 최소 이 비율 이상이 일치해야 결과에 포함
+MIN_MATCH_RATIO = 0.6
+# 태그와 정확히 일치할 때 부여하는 가중치
+TAG_MATCH_BOOST = 5
+# 검색어 최대 길이 (과도한 토큰 생성 방지)
+MAX_QUERY_LENGTH = 100
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _normalize(text: str) -> str:
+    """
+    전각/반각, 호환 자모 등을 통일하고 소문자로 변환하는 함수
+    """
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _split_words(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(_normalize(text))
+
+
+def _ngrams(word: str, n: int = NGRAM_SIZE) -> List[str]:
+    if len(word) <= n:
+        return [word]
+    return [word[i : i + n] for i in range(len(word) - n + 1)]
+
+
+def _tag_token(tag: str) -> str:
+    return "#" + "".join(_split_words(tag))
+
+
+def build_document_tokens(title: str, tags: Iterable[str]) -> List[str]:
+    """
+    게시글 제목과 태그로부터 색인용 토큰 집합을 생성하는 함수
+    - 각 단어의 1-gram, 2-gram (한 글자 검색어도 일치하도록 1-gram 포함)
+    - 태그 전체를 나타내는 "#태그" 토큰 (태그 완전 일치 가중치용)
+    """
+    tokens = set()
+    words = _split_words(title)
+    for tag in tags:
+        words.extend(_split_words(tag))
+        tokens.add(_tag_token(tag))
+
+    for word in words:
+        tokens.update(word)
+        tokens.update(_ngrams(word))
+
+    tokens.discard("#")
+    return sorted(tokens)
+
+
+def build_query_tokens(search: str) -> Tuple[List[str], List[str]]:
+    """
+    검색어로부터 (n-gram 토큰 목록, 태그 일치용 토큰 목록)을 생성하는 함수
+    """
+    words = _split_words(search[:MAX_QUERY_LENGTH])
+    grams = set()
+    for word in words:
+        grams.update(_ngrams(word))
+
+    tag_tokens = {"#" + word for word in words}
+    if len(words) > 1:
+        tag_tokens.add("#" + "".join(words))
+    return sorted(grams), sorted(tag_tokens)
+
+
+async def index_post(engine: AIOEngine, post: Post) -> None:
+    """
+    게시글을 검색 색인에 추가하거나 갱신하는 함수 (게시글 생성/수정 시 호출)
+    """
+    collection = engine.get_collection(PostSearchIndex)
+    await collection.update_one(
+        {"post_id": post.id},
+        {"$set": {"tokens": build_document_tokens(post.title, post.tags)}},
+        upsert=True,
+    )
+
+
+async def remove_post_index(engine: AIOEngine, post_id: ObjectId) -> None:
+    """
+    게시글을 검색 색인에서 제거하는 함수 (게시글 삭제 시 호출)
+    """
+    collection = engine.get_collection(PostSearchIndex)
+    await collection.delete_one({"post_id": post_id})
+
+
+async def sync_search_index(engine: AIOEngine, batch_size: int = 500) -> int:
+    """
+    검색 색인을 게시글과 맞추는 함수 (앱 시작 시 호출)
+    - 색인되지 않았거나 제목/태그가 바뀐 게시글은 다시 색인 (저장된 토큰과 지금 만든 토큰을 비교)
+    - 삭제된 게시글의 색인은 제거
+    게시글 수가 같아도 수정/삭제된 게시글이 있을 수 있으므로 배치 단위로 모두 비교합니다.
+    :return: 새로 색인하거나 다시 색인한 게시글 수
+    """
+    index_collection = engine.get_collection(PostSearchIndex)
+    post_collection = engine.get_collection(Post)
+
+    indexed = 0
+    batch = []
+
+    async def flush():
+        nonlocal indexed
+        ids = [doc["_id"] for doc in batch]
+        indexed_tokens = {
+            doc["post_id"]: doc.get("tokens")
+            async for doc in index_collection.find(
+                {"post_id": {"$in": ids}}, {"post_id": 1, "tokens": 1}
+            )
+        }
+        for doc in batch:
+            tokens = build_document_tokens(doc.get("title", ""), doc.get("tags", []))
+            if indexed_tokens.get(doc["_id"]) == tokens:
+                continue
+            await index_collection.update_one(
+                {"post_id": doc["_id"]}, {"$set": {"tokens": tokens}}, upsert=True
+            )
+            indexed += 1
+        batch.clear()
+
+    async for doc in post_collection.find({}, {"title": 1, "tags": 1}):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    removed = 0
+    post_ids = []
+
+    async def remove_orphans():
+        nonlocal removed
+        existing = {
+            doc["_id"]
+            async for doc in post_collection.find({"_id": {"$in": post_ids}}, {"_id": 1})
+        }
+        orphans = [post_id for post_id in post_ids if post_id not in existing]
+        if orphans:
+            result = await index_collection.delete_many({"post_id": {"$in": orphans}})
+            removed += result.deleted_count
+        post_ids.clear()
+
+    async for doc in index_collection.find({}, {"post_id": 1}):
+        post_ids.append(doc["post_id"])
+        if len(post_ids) >= batch_size:
+            await remove_orphans()
+    if post_ids:
+        await remove_orphans()
+
+    logger.info(
+        f"검색 색인 동기화 완료: {indexed}개 게시글 색인, 삭제된 게시글 색인 {removed}개 제거"
+    )
+    return indexed
+
+
+async def search_posts(
+    engine: AIOEngine,
+    search: str,
+    sort_by: str = "relevance",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Post], Optional[str]]:
+    """
+    역색인을 이용해 게시글을 검색하는 함수
+    토큰 인덱스로 후보만 조회하므로 전체 게시글 수가 아닌 일치하는 게시글 수에 비례한 비용이 듭니다.
+    - relevance: 일치한 토큰 수 + 태그 완전 일치 가중치 순
+    - created_at: 최신순 (ObjectId가 생성 시각 순이므로 post_id로 정렬)
+    - likes: 좋아요 많은 순 (일치한 게시글 전체의 좋아요 수를 게시글 컬렉션에서 가져와 정렬)
+    :return: (게시글 목록, 다음 페이지 커서 또는 None)
+    """
+    grams, tag_tokens = build_query_tokens(search)
+    if not grams:
+        return [], None
+
+    min_matched = max(1, math.ceil(len(grams) * MIN_MATCH_RATIO))
+    pipeline = [
+        {"$match": {"tokens": {"$in": grams + tag_tokens}}},
+        {
+            "$project": {
+                "post_id": 1,
+                "matched": {"$size": {"$setIntersection": ["$tokens", grams]}},
+                "tag_matched": {"$size": {"$setIntersection": ["$tokens", tag_tokens]}},
+            }
+        },
+        {"$match": {"$or": [{"matched": {"$gte": min_matched}}, {"tag_matched": {"$gt": 0}}]}},
+    ]
+
+    if sort_by == "likes":
+        # 일부 후보만 잘라서 정렬하지 않도록 일치한 게시글 전체의 좋아요 수를 _id 인덱스로 가져옴
+        # (삭제되었지만 아직 색인에 남은 게시글은 제외)
+        pipeline += [
+            {
+                "$lookup": {
+                    "from": engine.get_collection(Post).name,
+                    "localField": "post_id",
+                    "foreignField": "_id",
+                    "as": "post",
+                }
+            },
+            {"$unwind": "$post"},
+            {"$project": {"post_id": 1, "score": "$post.likes_count"}},
+        ]
+        sort_stage = {"score": -1, "post_id": -1}
+    elif sort_by == "relevance":
+        pipeline.append(
+            {
+                "$addFields": {
+                    "score": {
+                        "$add": [
+                            "$matched",
+                            {"$multiply": ["$tag_matched", TAG_MATCH_BOOST]},
+                        ]
+                    }
+                }
+            }
+        )
+        sort_stage = {"score": -1, "post_id": -1}
+    else:
+        sort_by = "recent"
+        sort_stage = {"post_id": -1}
+
+    if cursor:
+        value, object_id = decode_cursor(cursor, sort_by)
+        if sort_by in ("relevance", "likes"):
+            pipeline.append(
+                {
+                    "$match": {
+                        "$or": [
+                            {"score": {"$lt": value}},
+                            {"score": value, "post_id": {"$lt": object_id}},
+                        ]
+                    }
+                }
+            )
+        else:
+            pipeline.append({"$match": {"post_id": {"$lt": object_id}}})
+
+    pipeline += [{"$sort": sort_stage}, {"$limit": limit + 1}]
+
+    collection = engine.get_collection(PostSearchIndex)
+    hits = [doc async for doc in collection.aggregate(pipeline)]
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        last = hits[-1]
+        next_cursor = encode_cursor(sort_by, last.get("score"), last["post_id"])
+
+    posts = await get_posts_by_ids(engine, [hit["post_id"] for hit in hits])
+    return posts, next_cursor
@@ -1,5 +1,25 @@
 import os
 
 UPLOAD_DIRECTORY = "./uploads"
+# 업로드 파일을 제공하는 정적 파일 URL 경로
+STATIC_URL_PREFIX = "/static/"
+
+# 업로드된 비디오를 HLS 화질 단계로 변환할지 여부 (ffmpeg 인코딩 부하가 크므로 끌 수 있음)
+HLS_ENABLED = os.environ.get("HLS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# 같은 게시글의 좋아요/댓글 알림을 모아서 한 번에 보내는 시간(초) (0이면 모으지 않고 바로 전송)
+NOTIFICATION_COALESCE_WINDOW = int(os.environ.get("NOTIFICATION_COALESCE_WINDOW", "60"))
+
+# 미디어 파일 저장소 종류 (local: 업로드 디렉터리, s3: S3 호환 오브젝트 스토리지)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local").lower()
+# S3 호환 저장소 설정 (MinIO 등은 S3_ENDPOINT_URL 지정)
+S3_BUCKET = os.environ.get("S3_BUCKET", "")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+S3_REGION = os.environ.get("S3_REGION") or None
+S3_ACCESS_KEY_ID = os.environ.get("S3_ACCESS_KEY_ID") or None
+S3_SECRET_ACCESS_KEY = os.environ.get("S3_SECRET_ACCESS_KEY") or None
+# 파일 URL의 기준 주소 (CDN 등, 지정하지 않으면 "{엔드포인트}/{버킷}")
+S3_PUBLIC_URL = os.environ.get("S3_PUBLIC_URL") or None
+
 if not os.path.exists(UPLOAD_DIRECTORY):
     os.makedirs(UPLOAD_DIRECTORY)
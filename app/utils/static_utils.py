@@ -0,0 +1,252 @@
+import mimetypes
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from typing import List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+# 한 번에 읽어서 보내는 크기 (zero-copy 전송을 지원하지 않는 서버에서 사용)
+MEDIA_SEND_CHUNK_SIZE = 256 * 1024  # 256KB
+
+# 내용 해시로 주소가 정해지는 파일은 내용이 바뀌지 않으므로 1년간 재검증 없이 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 같은 경로에 다른 내용이 저장될 수 있는 이전 방식 파일은 매번 재검증
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# 내용 해시로 주소가 정해지는 파일이 저장된 디렉터리 (업로드 디렉터리 기준)
+IMMUTABLE_DIRECTORIES = ("blobs/",)
+# 저장 중인 임시 파일 디렉터리 (제공하지 않음)
+PRIVATE_DIRECTORIES = ("blobs/tmp/",)
+
+# 시스템 MIME 데이터베이스에 따라 .ts가 비디오로 인식되지 않는 경우가 있어 HLS 형식을 직접 등록
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+
+_BLOB_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})")
+_RANGE_PATTERN = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def parse_range_header(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Range 헤더를 (시작, 끝) 바이트 구간 목록으로 변환하는 함수 (끝 포함)
+    :return: 만족 가능한 구간 목록 (빈 목록이면 416), 해석할 수 없는 헤더면 None (전체 응답)
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or not ranges:
+        return None
+
+    result = []
+    for spec in ranges.split(","):
+        match = _RANGE_PATTERN.match(spec)
+        if not match or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first == "":
+            # bytes=-500: 마지막 500바이트
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+            if start >= size:
+                continue
+        result.append((start, end))
+    return result
+
+
+class MediaFiles:
+    """
+    업로드 디렉터리의 파일을 제공하는 ASGI 앱 (StaticFiles 대체)
+
+    - Range 요청(206/416)과 If-Range를 지원해 비디오 탐색 시 필요한 부분만 전송
+    - 내용 해시로 저장된 파일은 immutable 캐시, 나머지는 ETag/Last-Modified로 재검증
+    - 서버가 zero-copy 전송 확장(http.response.zerocopysend)을 지원하면 sendfile로 전송
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.realpath(directory)
+        # 경로 검사는 정규화한 실제 경로로 함 ("blobs//tmp", "blobs/./tmp", "blobs/x/../tmp" 등 우회 방지)
+        self.immutable_directories = self._to_real_directories(IMMUTABLE_DIRECTORIES)
+        self.private_directories = self._to_real_directories(PRIVATE_DIRECTORIES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._send_empty(send, 405, [(b"allow", b"GET, HEAD")])
+            return
+
+        relative = scope["path"][len(scope.get("root_path", "")):].lstrip("/")
+        full_path = self._resolve(relative)
+        if full_path is not None and self._is_under(full_path, self.private_directories):
+            full_path = None
+        file_stat = await run_in_threadpool(self._stat, full_path) if full_path else None
+        if file_stat is None:
+            await self._send_text(send, 404, b"Not Found")
+            return
+
+        size = file_stat.st_size
+        etag = self._make_etag(full_path, file_stat)
+        last_modified = formatdate(file_stat.st_mtime, usegmt=True)
+        content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        headers = [
+            (b"accept-ranges", b"bytes"),
+            (b"etag", etag.encode("latin-1")),
+            (b"last-modified", last_modified.encode("latin-1")),
+            (b"cache-control", self._cache_control(full_path).encode("latin-1")),
+        ]
+
+        request_headers = Headers(scope=scope)
+        if self._is_not_modified(request_headers, etag, file_stat.st_mtime):
+            await self._send_empty(send, 304, headers)
+            return
+
+        start, end, status = 0, size - 1, 200
+        range_header = request_headers.get("range")
+        if range_header and self._range_applies(request_headers, etag, last_modified):
+            ranges = parse_range_header(range_header, size)
+            if ranges is not None and not ranges:
+                headers.append((b"content-range", f"bytes */{size}".encode("latin-1")))
+                await self._send_empty(send, 416, headers)
+                return
+            # 여러 구간 요청(multipart/byteranges)은 지원하지 않고 전체 파일로 응답
+            if ranges is not None and len(ranges) == 1:
+                (start, end), status = ranges[0], 206
+                headers.append(
+                    (b"content-range", f"bytes {start}-{end}/{size}".encode("latin-1"))
+                )
+
+        length = max(0, end - start + 1)
+        headers += [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(length).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        if method == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await self._send_file(scope, send, full_path, start, length)
+
+    def _resolve(self, relative: str) -> Optional[str]:
+        # 업로드 디렉터리 밖을 가리키는 경로(../ 등)는 거절
+        full_path = os.path.realpath(os.path.join(self.directory, relative))
+        if os.path.commonpath([self.directory, full_path]) != self.directory:
+            return None
+        return full_path
+
+    def _to_real_directories(self, directories: Tuple[str, ...]) -> Tuple[str, ...]:
+        return tuple(os.path.realpath(os.path.join(self.directory, name)) for name in directories)
+
+    @staticmethod
+    def _is_under(full_path: str, directories: Tuple[str, ...]) -> bool:
+        return any(
+            os.path.commonpath([directory, full_path]) == directory for directory in directories
+        )
+
+    @staticmethod
+    def _stat(full_path: str) -> Optional[os.stat_result]:
+        try:
+            file_stat = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return file_stat if stat.S_ISREG(file_stat.st_mode) else None
+
+    def _is_immutable(self, full_path: str) -> bool:
+        return self._is_under(full_path, self.immutable_directories)
+
+    def _cache_control(self, full_path: str) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self._is_immutable(full_path) else REVALIDATE_CACHE_CONTROL
+
+    def _make_etag(self, full_path: str, file_stat: os.stat_result) -> str:
+        # 내용 해시로 저장된 파일(파생본 포함)은 파일명으로 강한 ETag 생성
+        if self._is_immutable(full_path):
+            name = os.path.basename(full_path)
+            match = _BLOB_NAME_PATTERN.match(name)
+            if match:
+                return f'"{name}"'
+        return f'"{int(file_stat.st_mtime_ns):x}-{file_stat.st_size:x}"'
+
+    @staticmethod
+    def _is_not_modified(headers: Headers, etag: str, mtime: float) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            # If-None-Match는 약한 비교를 사용하므로 W/ 접두사는 무시
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in candidates or etag in candidates
+
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _range_applies(headers: Headers, etag: str, last_modified: str) -> bool:
+        # If-Range가 현재 파일과 다르면 Range를 무시하고 전체 파일로 응답
+        if_range = headers.get("if-range")
+        if not if_range:
+            return True
+        return if_range.strip() in (etag, last_modified)
+
+    async def _send_file(
+        self, scope: Scope, send: Send, full_path: str, offset: int, count: int
+    ) -> None:
+        file = await run_in_threadpool(open, full_path, "rb")
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                # 서버가 sendfile로 커널에서 바로 전송
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": offset,
+                        "count": count,
+                    }
+                )
+                return
+
+            # 파일 위치를 공유하지 않도록 pread로 구간만 읽어서 전송
+            end = offset + count
+            while offset < end:
+                size = min(MEDIA_SEND_CHUNK_SIZE, end - offset)
+                chunk = await run_in_threadpool(os.pread, file.fileno(), size, offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": offset < end,
+                    }
+                )
+            if offset < end:
+                # 전송 중 파일이 줄어든 경우 응답 종료
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await run_in_threadpool(file.close)
+
+    @staticmethod
+    async def _send_empty(send: Send, status: int, headers: list) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _send_text(send: Send, status: int, body: bytes) -> None:
+        headers = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,475 @@
+import glob
+import logging
+import mimetypes
+import os
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Dict, Optional
+
+from app.utils.executor_utils import run_io
+from app.utils.settings import (
+    S3_ACCESS_KEY_ID,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_PUBLIC_URL,
+    S3_REGION,
+    S3_SECRET_ACCESS_KEY,
+    STATIC_URL_PREFIX,
+    STORAGE_BACKEND,
+    UPLOAD_DIRECTORY,
+)
+from app.utils.static_utils import (
+    IMMUTABLE_CACHE_CONTROL,
+    IMMUTABLE_DIRECTORIES,
+    MEDIA_SEND_CHUNK_SIZE,
+    REVALIDATE_CACHE_CONTROL,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# S3 멀티파트 업로드의 조각 크기 (마지막 조각을 제외하고 5MB 이상이어야 함)
+S3_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+# 미리 서명된 URL의 기본 유효 시간(초)
+PRESIGNED_URL_EXPIRES = 60 * 60
+
+
+class StorageBackend(ABC):
+    """
+    미디어 파일 저장소 인터페이스
+
+    파일은 업로드 디렉터리 기준 상대 경로("blobs/ab/cd/{sha256}.jpg")를 키로 저장합니다.
+    썸네일 생성, 비디오 변환 등 로컬 파일이 필요한 작업은 업로드 디렉터리의 같은 경로를 작업 사본으로 사용합니다.
+    """
+
+    # 업로드 디렉터리가 곧 저장소인지 여부 (아니면 작업 사본을 받아오고 결과를 올려야 함)
+    is_local = False
+    # 저장된 파일 URL의 기준 주소
+    url_prefix = STATIC_URL_PREFIX
+
+    @abstractmethod
+    async def put(
+        self, key: str, chunks: AsyncIterable[bytes], content_type: Optional[str] = None
+    ) -> int:
+        """
+        청크 스트림을 파일로 저장하는 함수 (전체 내용을 메모리에 올리지 않음)
+        :return: 저장한 크기(바이트)
+        """
+
+    @abstractmethod
+    async def put_file(self, key: str, file_path: str, move: bool = False) -> None:
+        """
+        로컬 파일을 저장하는 함수 (move면 원본 파일은 이동되거나 삭제됨)
+        """
+
+    @abstractmethod
+    async def move(self, src_key: str, dst_key: str) -> None:
+        """
+        저장된 파일의 키를 바꾸는 함수 (같은 키의 파일이 있으면 덮어씀)
+        """
+
+    @abstractmethod
+    def get_range(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        파일의 start부터 end까지(끝 포함)를 청크 단위로 읽는 함수
+        """
+
+    @abstractmethod
+    async def download(self, key: str, file_path: str) -> None:
+        """
+        저장된 파일을 로컬 파일로 받아오는 함수
+        """
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def get_size(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        파일을 삭제하는 함수 (없으면 무시)
+        """
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """
+        키가 prefix로 시작하는 파일을 모두 삭제하는 함수 (파생본 삭제에 사용)
+        """
+
+    @abstractmethod
+    async def get_presigned_url(self, key: str, expires: int = PRESIGNED_URL_EXPIRES) -> str:
+        """
+        일정 시간 동안 인증 없이 파일을 받을 수 있는 URL을 반환하는 함수
+        """
+
+    def get_url(self, key: str) -> str:
+        """
+        게시글, 프로필에 저장하는 파일 URL을 반환하는 함수
+        """
+        return self.url_prefix + key
+
+    def get_key(self, url: str) -> str:
+        """
+        파일 URL을 키로 변환하는 함수
+        저장소를 바꾸기 전에 저장된 URL("/static/...")도 같은 키로 변환합니다.
+        """
+        for prefix in (self.url_prefix, STATIC_URL_PREFIX):
+            if url.startswith(prefix):
+                return url[len(prefix):]
+        raise ValueError(f"업로드 파일 URL이 아닙니다: {url}")
+
+
+def get_cache_control(key: str) -> str:
+    # 내용 해시로 주소가 정해지는 파일은 내용이 바뀌지 않으므로 immutable 캐시
+    if key.startswith(IMMUTABLE_DIRECTORIES):
+        return IMMUTABLE_CACHE_CONTROL
+    return REVALIDATE_CACHE_CONTROL
+
+
+def get_content_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+def _write_chunk(buffer, chunk: bytes) -> None:
+    buffer.write(chunk)
+
+
+def _remove_path(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    업로드 디렉터리에 파일을 저장하는 저장소 (MediaFiles가 /static으로 제공)
+    """
+
+    is_local = True
+
+    def __init__(self, directory: str = UPLOAD_DIRECTORY, url_prefix: str = STATIC_URL_PREFIX):
+        self.directory = directory
+        self.url_prefix = url_prefix
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, *key.split("/"))
+
+    async def put(
+        self, key: str, chunks: AsyncIterable[bytes], content_type: Optional[str] = None
+    ) -> int:
+        file_path = self.get_path(key)
+        await run_io(os.makedirs, os.path.dirname(file_path), exist_ok=True)
+        written = 0
+        buffer = await run_io(open, file_path, "wb")
+        try:
+            async for chunk in chunks:
+                await run_io(_write_chunk, buffer, chunk)
+                written += len(chunk)
+        finally:
+            await run_io(buffer.close)
+        return written
+
+    async def put_file(self, key: str, file_path: str, move: bool = False) -> None:
+        target = self.get_path(key)
+        if os.path.abspath(target) == os.path.abspath(file_path):
+            return
+        await run_io(os.makedirs, os.path.dirname(target), exist_ok=True)
+        # 같은 파일시스템이면 rename으로 한 번에 이동
+        await run_io(shutil.move if move else shutil.copyfile, file_path, target)
+
+    async def move(self, src_key: str, dst_key: str) -> None:
+        target = self.get_path(dst_key)
+        await run_io(os.makedirs, os.path.dirname(target), exist_ok=True)
+        await run_io(os.replace, self.get_path(src_key), target)
+
+    async def get_range(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        file = await run_io(open, self.get_path(key), "rb")
+        try:
+            if end is None:
+                end = os.fstat(file.fileno()).st_size - 1
+            offset = start
+            while offset <= end:
+                size = min(MEDIA_SEND_CHUNK_SIZE, end - offset + 1)
+                chunk = await run_io(os.pread, file.fileno(), size, offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+        finally:
+            await run_io(file.close)
+
+    async def download(self, key: str, file_path: str) -> None:
+        source = self.get_path(key)
+        if os.path.abspath(source) == os.path.abspath(file_path):
+            return
+        await run_io(os.makedirs, os.path.dirname(file_path), exist_ok=True)
+        await run_io(shutil.copyfile, source, file_path)
+
+    async def exists(self, key: str) -> bool:
+        return await run_io(os.path.exists, self.get_path(key))
+
+    async def get_size(self, key: str) -> int:
+        return await run_io(os.path.getsize, self.get_path(key))
+
+    async def delete(self, key: str) -> None:
+        await run_io(_remove_path, self.get_path(key))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        pattern = glob.escape(self.get_path(prefix)) + "*"
+        for path in await run_io(glob.glob, pattern):
+            await run_io(_remove_path, path)
+
+    async def get_presigned_url(self, key: str, expires: int = PRESIGNED_URL_EXPIRES) -> str:
+        # 업로드 디렉터리의 파일은 인증 없이 제공되므로 일반 URL과 같음
+        return self.get_url(key)
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    S3 호환 오브젝트 스토리지(AWS S3, MinIO 등)에 파일을 저장하는 저장소
+    boto3 클라이언트는 블로킹 함수이므로 모든 호출을 I/O 스레드 풀에서 실행합니다.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+        client=None,
+    ):
+        if not bucket:
+            raise ValueError("S3 저장소를 사용하려면 S3_BUCKET을 설정해야 합니다.")
+        self.bucket = bucket
+        if client is None:
+            # S3 저장소를 사용할 때만 필요한 의존성
+            import boto3
+            from botocore.config import Config
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                # MinIO 등 버킷 서브도메인을 지원하지 않는 서버도 사용할 수 있도록 경로 방식 사용
+                config=Config(s3={"addressing_style": "path"}, retries={"mode": "standard"}),
+            )
+        self.client = client
+
+        if public_url is None:
+            if endpoint_url:
+                public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+            else:
+                public_url = f"https://{bucket}.s3.{region or 'us-east-1'}.amazonaws.com"
+        self.url_prefix = public_url.rstrip("/") + "/"
+
+    def _object_args(self, key: str, content_type: Optional[str] = None) -> Dict[str, str]:
+        return {
+            "ContentType": content_type or get_content_type(key),
+            "CacheControl": get_cache_control(key),
+        }
+
+    async def _upload_part(self, key: str, upload_id: str, number: int, body: bytes) -> Dict:
+        result = await run_io(
+            self.client.upload_part,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        return {"PartNumber": number, "ETag": result["ETag"]}
+
+    async def put(
+        self, key: str, chunks: AsyncIterable[bytes], content_type: Optional[str] = None
+    ) -> int:
+        # 조각 크기만큼 모이면 멀티파트로 올려, 메모리에는 조각 하나 분량만 유지
+        buffer = bytearray()
+        written = 0
+        upload_id = None
+        parts = []
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                written += len(chunk)
+                if len(buffer) < S3_MULTIPART_CHUNK_SIZE:
+                    continue
+                if upload_id is None:
+                    result = await run_io(
+                        self.client.create_multipart_upload,
+                        Bucket=self.bucket,
+                        Key=key,
+                        **self._object_args(key, content_type),
+                    )
+                    upload_id = result["UploadId"]
+                parts.append(
+                    await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer))
+                )
+                buffer = bytearray()
+
+            if upload_id is None:
+                # 조각 크기보다 작은 파일은 한 번에 저장
+                await run_io(
+                    self.client.put_object,
+                    Bucket=self.bucket,
+                    Key=key,
+                    Body=bytes(buffer),
+                    **self._object_args(key, content_type),
+                )
+                return written
+
+            if buffer:
+                parts.append(
+                    await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer))
+                )
+            await run_io(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            # 완료하지 못한 멀티파트 업로드는 조각이 저장 공간을 차지하므로 취소
+            if upload_id is not None:
+                await run_io(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+            raise
+        return written
+
+    async def put_file(self, key: str, file_path: str, move: bool = False) -> None:
+        await run_io(
+            self.client.upload_file,
+            file_path,
+            self.bucket,
+            key,
+            ExtraArgs=self._object_args(key),
+        )
+        if move:
+            await run_io(_remove_path, file_path)
+
+    async def move(self, src_key: str, dst_key: str) -> None:
+        # 서버 쪽에서 복사하므로 파일 내용이 API 서버를 거치지 않음
+        await run_io(
+            self.client.copy_object,
+            Bucket=self.bucket,
+            Key=dst_key,
+            CopySource={"Bucket": self.bucket, "Key": src_key},
+            MetadataDirective="REPLACE",
+            **self._object_args(dst_key),
+        )
+        await self.delete(src_key)
+
+    async def get_range(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        result = await run_io(
+            self.client.get_object, Bucket=self.bucket, Key=key, Range=byte_range
+        )
+        body = result["Body"]
+        try:
+            while chunk := await run_io(body.read, MEDIA_SEND_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await run_io(body.close)
+
+    async def download(self, key: str, file_path: str) -> None:
+        await run_io(os.makedirs, os.path.dirname(file_path), exist_ok=True)
+        await run_io(self.client.download_file, self.bucket, key, file_path)
+
+    async def _head(self, key: str) -> Optional[Dict]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return await run_io(self.client.head_object, Bucket=self.bucket, Key=key)
+        except ClientError as ex:
+            if ex.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def exists(self, key: str) -> bool:
+        return await self._head(key) is not None
+
+    async def get_size(self, key: str) -> int:
+        head = await self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head["ContentLength"]
+
+    async def delete(self, key: str) -> None:
+        await run_io(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = await run_io(
+            lambda: list(paginator.paginate(Bucket=self.bucket, Prefix=prefix))
+        )
+        for page in pages:
+            # 목록 한 페이지(최대 1000개)를 한 번에 삭제
+            objects = [{"Key": item["Key"]} for item in page.get("Contents", [])]
+            if objects:
+                await run_io(
+                    self.client.delete_objects,
+                    Bucket=self.bucket,
+                    Delete={"Objects": objects, "Quiet": True},
+                )
+
+    async def get_presigned_url(self, key: str, expires: int = PRESIGNED_URL_EXPIRES) -> str:
+        return await run_io(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_storage_backend() -> StorageBackend:
+    """
+    설정(STORAGE_BACKEND)에 따른 미디어 파일 저장소를 반환하는 함수
+    """
+    if STORAGE_BACKEND == "local":
+        return LocalStorageBackend()
+    if STORAGE_BACKEND == "s3":
+        return S3StorageBackend(
+            S3_BUCKET,
+            endpoint_url=S3_ENDPOINT_URL,
+            region=S3_REGION,
+            access_key_id=S3_ACCESS_KEY_ID,
+            secret_access_key=S3_SECRET_ACCESS_KEY,
+            public_url=S3_PUBLIC_URL,
+        )
+    raise ValueError(f"알 수 없는 저장소 종류: {STORAGE_BACKEND}")
+
+
+def to_storage_key(file_path: str) -> str:
+    """
+    업로드 디렉터리 안의 파일 경로(작업 사본 경로)를 저장소 키로 변환하는 함수
+    """
+    return os.path.relpath(file_path, UPLOAD_DIRECTORY).replace(os.sep, "/")
+
+
+def to_local_path(key: str) -> str:
+    """
+    저장소 키를 업로드 디렉터리 안의 파일 경로(작업 사본 경로)로 변환하는 함수
+    """
+    return os.path.join(UPLOAD_DIRECTORY, *key.split("/"))
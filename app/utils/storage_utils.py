@@ -0,0 +1,341 @@
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
+from fastapi import UploadFile
+from odmantic import AIOEngine
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.database.models.media import MediaBlob
+from app.utils.executor_utils import media_cleanup, run_io
+from app.utils.settings import UPLOAD_DIRECTORY
+from app.utils.storage_backend_utils import get_storage_backend, to_storage_key
+from app.utils.time_util import get_current_time
+from app.utils.upload_utils import (
+    UPLOAD_CHUNK_SIZE,
+    read_upload_chunks,
+    remove_file,
+    to_static_url,
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 내용 해시로 주소를 정하는 파일 저장소
+# 파일은 "{sha256[:2]}/{sha256[2:4]}/{sha256}{확장자}"에 저장되어 디렉터리당 파일 수가 적게 유지됩니다.
+BLOB_DIRECTORY = os.path.join(UPLOAD_DIRECTORY, "blobs")
+# 해시 계산이 끝나기 전까지 업로드를 임시로 쓰는 디렉터리 (저장소와 같은 파일시스템이어야 rename이 원자적)
+# 원격 저장소를 사용하면 업로드는 저장소의 같은 키 아래에 임시로 저장됩니다.
+BLOB_TMP_DIRECTORY = os.path.join(BLOB_DIRECTORY, "tmp")
+
+# 다른 요청이 삭제 중인 파일을 다시 참조할 때 삭제가 끝났는지 확인하는 간격(초)
+BLOB_DELETE_POLL_INTERVAL = 0.1
+# 삭제 표시가 이 시간(초)보다 오래되면 삭제하던 쪽이 중단된 것으로 보고 표시를 지움
+BLOB_DELETE_TIMEOUT = 5 * 60
+
+_EXTENSION_PATTERN = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+def get_blob_extension(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """
+    저장할 파일 확장자를 정하는 함수 (정적 파일 응답의 Content-Type 판별에 사용)
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if _EXTENSION_PATTERN.match(extension):
+        return extension
+    return mimetypes.guess_extension(content_type or "") or ""
+
+
+def get_blob_key(sha256: str, extension: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def get_blob_path(key: str) -> str:
+    return os.path.join(BLOB_DIRECTORY, *key.split("/"))
+
+
+def get_blob_key_from_path(file_path: str) -> Optional[str]:
+    """
+    파일 경로가 저장소 안의 파일이면 키를, 아니면(이전 방식으로 저장된 파일) None을 반환하는 함수
+    """
+    relative = os.path.relpath(file_path, BLOB_DIRECTORY)
+    if relative.startswith("..") or os.path.isabs(relative):
+        return None
+    return relative.replace(os.sep, "/")
+
+
+def get_derived_path(blob_path: str, suffix: str) -> str:
+    """
+    원본 파일에서 만든 썸네일, 파생본 경로를 반환하는 함수
+    원본과 같은 디렉터리에 "{sha256}_{suffix}"로 저장되어 같은 원본의 파생본도 한 번만 만들어집니다.
+    """
+    stem = os.path.splitext(blob_path)[0]
+    return f"{stem}_{suffix}"
+
+
+def _hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as buffer:
+        while chunk := buffer.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _delete_blob_files(blob_path: str) -> None:
+    """
+    원본 파일과 파생본("{sha256}_*", HLS처럼 디렉터리인 파생본 포함)을 저장소에서 삭제하는 함수
+    """
+    backend = get_storage_backend()
+    await backend.delete(to_storage_key(blob_path))
+    await backend.delete_prefix(to_storage_key(os.path.splitext(blob_path)[0]) + "_")
+
+
+def _remove_local_copies(blob_path: str) -> None:
+    """
+    원격 저장소에서 받아온 작업 사본(원본과 파생본)을 삭제하는 함수
+    """
+    remove_file(blob_path)
+    directory = os.path.dirname(blob_path)
+    prefix = os.path.basename(os.path.splitext(blob_path)[0]) + "_"
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.startswith(prefix):
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                remove_file(path)
+
+
+async def acquire_blob(engine: AIOEngine, key: str, size: int) -> None:
+    """
+    파일의 참조 수를 1 올리는 함수 (처음 참조하면 기록 생성)
+    참조가 없어져 삭제 중인 파일이면 삭제가 끝난 뒤 새로 기록하므로, 호출한 쪽은 참조를 올린 뒤에 파일을 저장해야 합니다.
+    """
+    collection = engine.get_collection(MediaBlob)
+    while True:
+        try:
+            # 삭제 중인 기록은 조건에 맞지 않아 같은 키로 새로 만들려다 DuplicateKeyError 발생
+            await collection.update_one(
+                {"_id": key, "deleting": None},
+                {
+                    "$inc": {"ref_count": 1},
+                    "$set": {"updated_at": get_current_time()},
+                    "$setOnInsert": {"size": size, "created_at": get_current_time()},
+                },
+                upsert=True,
+            )
+            return
+        except DuplicateKeyError:
+            blob = await collection.find_one({"_id": key})
+
+        if blob is not None and blob.get("deleting") and blob["deleting_at"] < (
+            get_current_time() - timedelta(seconds=BLOB_DELETE_TIMEOUT)
+        ):
+            # 삭제하던 쪽이 중단된 경우 표시를 지우고 새로 기록 (남은 파일은 호출한 쪽이 다시 저장)
+            logger.warning(f"중단된 미디어 파일 삭제 표시 제거: {key}")
+            await collection.delete_one({"_id": key, "deleting": blob["deleting"]})
+        elif blob is not None:
+            await asyncio.sleep(BLOB_DELETE_POLL_INTERVAL)
+
+
+async def begin_blob_delete(engine: AIOEngine, key: str, query: dict) -> Optional[str]:
+    """
+    참조가 없는 파일의 기록에 삭제 중 표시를 하는 함수 (표시가 있는 동안 acquire_blob은 삭제가 끝나기를 기다림)
+    :param query: 기록이 이 조건에 맞을 때만 표시 (조회 이후 다시 참조되었는지 확인)
+    :return: 삭제 토큰 (표시하지 못했으면 None), 파일 삭제 후 finish_blob_delete로 기록을 삭제해야 합니다.
+    """
+    token = uuid.uuid4().hex
+    result = await engine.get_collection(MediaBlob).update_one(
+        {**query, "_id": key, "deleting": None},
+        {"$set": {"deleting": token, "deleting_at": get_current_time()}},
+    )
+    return token if result.modified_count else None
+
+
+async def finish_blob_delete(engine: AIOEngine, key: str, token: str) -> None:
+    await engine.get_collection(MediaBlob).delete_one({"_id": key, "deleting": token})
+
+
+async def store_upload(engine: AIOEngine, file: UploadFile, max_size: int) -> str:
+    """
+    업로드 파일을 저장소에 바로 스트리밍하면서 내용 해시를 계산해, 같은 내용의 파일이 있으면 그 파일을 공유하는 함수
+    반환된 파일은 참조 수가 1 올라가므로 사용하지 않게 되면 release_blob을 호출해야 합니다.
+    :return: 저장된 파일 경로 (원격 저장소는 작업 사본 경로)
+    """
+    backend = get_storage_backend()
+    extension = get_blob_extension(file.filename, file.content_type)
+    tmp_key = to_storage_key(os.path.join(BLOB_TMP_DIRECTORY, uuid.uuid4().hex))
+    digest = hashlib.sha256()
+    try:
+        size = await backend.put(
+            tmp_key, read_upload_chunks(file, max_size, digest), file.content_type
+        )
+        key = get_blob_key(digest.hexdigest(), extension)
+        # 참조를 먼저 기록한 뒤 파일을 옮겨, 참조 수가 0이 된 같은 파일을 지우는 중이어도 다시 채워지도록 함
+        await acquire_blob(engine, key, size)
+        try:
+            await backend.move(tmp_key, to_storage_key(get_blob_path(key)))
+        except BaseException:
+            # 파일을 옮기지 못했으면 올린 참조를 되돌림
+            await release_blob(engine, get_blob_path(key))
+            raise
+        return get_blob_path(key)
+    finally:
+        # 쓰다 만 파일 정리 (옮긴 뒤에는 없으므로 무시됨)
+        with media_cleanup():
+            await backend.delete(tmp_key)
+
+
+def _link_or_copy(file_path: str, target: str) -> None:
+    # 같은 파일시스템이면 하드 링크로 복사 없이 원본을 남겨 둠
+    try:
+        os.link(file_path, target)
+    except OSError:
+        shutil.copyfile(file_path, target)
+
+
+async def store_local_file(
+    engine: AIOEngine, file_path: str, extension: str, keep_source: bool = False
+) -> str:
+    """
+    서버에서 만든 파일(비디오 변환 결과 등)을 저장소로 옮기는 함수
+    원본 파일은 이동 또는 삭제되며, keep_source면 그대로 남겨 둡니다.
+    :return: 저장된 파일 경로 (원격 저장소는 작업 사본 경로)
+    """
+    tmp_path = os.path.join(BLOB_TMP_DIRECTORY, uuid.uuid4().hex)
+    await run_io(os.makedirs, BLOB_TMP_DIRECTORY, exist_ok=True)
+    await run_io(_link_or_copy if keep_source else shutil.move, file_path, tmp_path)
+    try:
+        sha256 = await run_io(_hash_file, tmp_path)
+        size = await run_io(os.path.getsize, tmp_path)
+        key = get_blob_key(sha256, extension)
+        await acquire_blob(engine, key, size)
+        try:
+            await get_storage_backend().put_file(
+                to_storage_key(get_blob_path(key)), tmp_path, move=True
+            )
+        except BaseException:
+            # 파일을 저장하지 못했으면 올린 참조를 되돌림
+            await release_blob(engine, get_blob_path(key))
+            raise
+        return get_blob_path(key)
+    finally:
+        with media_cleanup():
+            await run_io(remove_file, tmp_path)
+
+
+async def get_blob_size(file_path: str) -> int:
+    """
+    저장된 파일 크기(바이트)를 반환하는 함수
+    """
+    return await get_storage_backend().get_size(to_storage_key(file_path))
+
+
+@asynccontextmanager
+async def open_local_blob(file_path: str) -> AsyncIterator[str]:
+    """
+    저장된 파일을 로컬 파일로 다루는 구간을 만드는 함수 (썸네일 생성, 변환 등)
+    원격 저장소면 작업 사본을 받아오고, 구간이 끝나면 작업 사본과 그 사이 만든 파생본 사본을 삭제합니다.
+    파생본은 구간 안에서 publish_derived_file로 저장소에 올려야 합니다.
+    """
+    backend = get_storage_backend()
+    if backend.is_local:
+        yield file_path
+        return
+
+    await backend.download(to_storage_key(file_path), file_path)
+    try:
+        yield file_path
+    finally:
+        with media_cleanup():
+            await run_io(_remove_local_copies, file_path)
+
+
+async def fetch_derived_file(derived_path: str) -> bool:
+    """
+    이미 만들어진 파생본이 있으면 로컬에서 쓸 수 있게 하는 함수 (원격 저장소면 작업 사본을 받아옴)
+    :return: 파생본이 있으면 True
+    """
+    backend = get_storage_backend()
+    key = to_storage_key(derived_path)
+    if not await backend.exists(key):
+        return False
+    await backend.download(key, derived_path)
+    return True
+
+
+async def derived_file_exists(derived_path: str) -> bool:
+    return await get_storage_backend().exists(to_storage_key(derived_path))
+
+
+def _list_files(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+    return [
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(path)
+        for name in names
+    ]
+
+
+async def publish_derived_file(derived_path: str) -> str:
+    """
+    로컬에서 만든 파생본(파일 또는 HLS처럼 디렉터리)을 저장소에 올리는 함수 (로컬 저장소는 그대로 사용)
+    :return: 파생본 URL
+    """
+    backend = get_storage_backend()
+    if not backend.is_local:
+        for file_path in await run_io(_list_files, derived_path):
+            await backend.put_file(to_storage_key(file_path), file_path)
+    return to_static_url(derived_path)
+
+
+async def release_blob(engine: AIOEngine, file_path: Optional[str]) -> None:
+    """
+    파일의 참조 수를 1 내리고, 더 이상 참조하는 곳이 없으면 파일과 파생본을 삭제하는 함수
+    저장소 밖의 파일(이전 방식으로 저장된 파일)은 공유되지 않으므로 바로 삭제합니다.
+    정리 작업이므로 미디어 작업 대기열이 가득 차도 거절하지 않습니다. (media_cleanup)
+    """
+    if not file_path:
+        return
+
+    with media_cleanup():
+        await _release_blob(engine, file_path)
+
+
+async def _release_blob(engine: AIOEngine, file_path: str) -> None:
+    key = get_blob_key_from_path(file_path)
+    if key is None:
+        await get_storage_backend().delete(to_storage_key(file_path))
+        return
+
+    doc = await engine.get_collection(MediaBlob).find_one_and_update(
+        {"_id": key, "ref_count": {"$gt": 0}},
+        {"$inc": {"ref_count": -1}, "$set": {"updated_at": get_current_time()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None or doc["ref_count"] > 0:
+        return
+
+    # 그 사이 다시 참조되지 않았을 때만 삭제 중으로 표시하고 파일 삭제
+    # (표시가 남아 있는 동안 같은 파일을 올리는 요청은 삭제가 끝난 뒤 파일을 다시 저장)
+    token = await begin_blob_delete(engine, key, {"ref_count": {"$lte": 0}})
+    if token is None:
+        return
+    try:
+        await _delete_blob_files(get_blob_path(key))
+        logger.info(f"참조가 없는 미디어 파일 삭제: {key}")
+    finally:
+        await finish_blob_delete(engine, key, token)
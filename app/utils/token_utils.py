@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 import logging
+from typing import Optional
 from fastapi import Depends, HTTPException, Request
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
@@ -52,6 +53,16 @@ async def get_current_user_id(request: Request) -> ObjectId:
         logger.error(f"JWTError occurred: {str(e)}", exc_info=True)
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# 로그인하지 않아도 되는 엔드포인트에서 ID를 추출하는 함수
+async def get_optional_user_id(request: Request) -> Optional[ObjectId]:
+    """
+    Authorization 헤더가 없으면 None을 반환합니다.
+    헤더가 있지만 토큰이 유효하지 않으면 get_current_user_id와 동일하게 401을 반환합니다.
+    """
+    if not request.headers.get("Authorization"):
+        return None
+    return await get_current_user_id(request)
+
 # 사용자가 관리자인지 확인하는 메서드
 async def verify_admin(engine: AIOEngine, user_id: ObjectId) -> bool:
     user = await engine.find_one(User, User.id == user_id)
@@ -0,0 +1,335 @@
+import os
+import time
+import uuid
+from typing import AsyncIterator, Dict
+from fastapi import HTTPException
+from odmantic import AIOEngine, ObjectId
+import redis.asyncio as aioredis
+
+from app.utils.executor_utils import media_cleanup, run_io
+from app.utils.storage_utils import BLOB_TMP_DIRECTORY, get_blob_extension, store_local_file
+from app.utils.time_util import get_current_time
+from app.utils.upload_utils import (
+    MAX_UPLOAD_SIZES,
+    UPLOAD_CHUNK_SIZE,
+    get_upload_kind,
+    remove_file,
+)
+
+# 이어 올리기 업로드 상태
+UPLOAD_STATUS_UPLOADING = "uploading"  # 조각을 받는 중
+UPLOAD_STATUS_COMPLETE = "complete"  # 모든 조각을 받아 게시글에 첨부할 수 있음
+UPLOAD_STATUS_ATTACHING = "attaching"  # 게시글에 첨부하는 중 (게시글 저장에 실패하면 다시 complete)
+
+# 업로드 세션 유지 시간(초) - 조각을 받을 때마다 연장
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+# 같은 세션에 조각을 동시에 보내지 못하도록 잠그는 시간(초)
+UPLOAD_SESSION_LOCK_TTL = 60
+# 받은 조각을 이어 붙이는 디렉터리 (저장소와 같은 파일시스템이어야 첨부 시 rename으로 이동)
+UPLOAD_SESSION_DIRECTORY = os.path.join(BLOB_TMP_DIRECTORY, "sessions")
+
+# 잠금을 가진 요청만 잠금 시간을 연장하는 스크립트 (KEYS[1]: 잠금, ARGV[1]: 잠금 토큰, ARGV[2]: 잠금 시간)
+_REFRESH_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# 잠금을 가진 요청만 잠금을 푸는 스크립트 (KEYS[1]: 잠금, ARGV[1]: 잠금 토큰)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 받은 크기를 기록하고 잠금을 푸는 스크립트
+# 세션이 그 사이 삭제되었거나 완료되었으면 기록하지 않음 (만료된 세션이 일부 필드만으로 다시 생기지 않도록)
+# KEYS[1]: 세션, KEYS[2]: 잠금, ARGV[1]: 잠금 토큰, ARGV[2]: 받은 크기, ARGV[3]: 세션 유지 시간
+# 반환: 1 기록, 0 세션 없음(또는 완료됨), -1 잠금을 잃음
+_RECORD_OFFSET_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return -1
+end
+redis.call('DEL', KEYS[2])
+if redis.call('HGET', KEYS[1], 'status') ~= 'uploading' then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'offset', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# 세션 상태가 ARGV[1]일 때만 ARGV[2]로 바꾸는 스크립트 (KEYS[1]: 세션)
+_SET_STATUS_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[2])
+return 1
+"""
+
+# 모든 조각을 받았고 전송 중인 조각이 없을 때만 완료 처리하는 스크립트
+# KEYS[1]: 세션, KEYS[2]: 잠금 / 반환: 0 완료, -1 세션 없음, -2 받지 못한 조각 있음, -3 전송 중
+_COMPLETE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status then
+    return -1
+end
+if status ~= 'uploading' then
+    return 0
+end
+if redis.call('HGET', KEYS[1], 'offset') ~= redis.call('HGET', KEYS[1], 'size') then
+    return -2
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return -3
+end
+redis.call('HSET', KEYS[1], 'status', 'complete')
+return 0
+"""
+
+
+def get_upload_session_key(upload_id: str) -> str:
+    return f"upload:{upload_id}"
+
+
+def get_upload_session_lock_key(upload_id: str) -> str:
+    return f"upload:{upload_id}:lock"
+
+
+def get_upload_session_path(upload_id: str) -> str:
+    return os.path.join(UPLOAD_SESSION_DIRECTORY, upload_id)
+
+
+def _touch(file_path: str) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    open(file_path, "wb").close()
+
+
+def to_upload_session_response(upload_id: str, session: Dict[str, str]) -> Dict:
+    return {
+        "upload_id": upload_id,
+        "offset": int(session["offset"]),
+        "size": int(session["size"]),
+        "status": session["status"],
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+    }
+
+
+async def create_upload_session(
+    redis: aioredis.Redis,
+    user_id: ObjectId,
+    filename: str,
+    content_type: str,
+    size: int,
+) -> str:
+    """
+    이어 올리기 업로드 세션을 생성하는 함수 (파일 종류별 최대 크기를 넘으면 413)
+    :return: 업로드 ID
+    """
+    kind = get_upload_kind(content_type)
+    max_size = MAX_UPLOAD_SIZES[kind]
+    if size > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"파일은 {max_size // (1024 * 1024)}MB를 초과할 수 없습니다.",
+        )
+
+    upload_id = uuid.uuid4().hex
+    await run_io(_touch, get_upload_session_path(upload_id))
+
+    key = get_upload_session_key(upload_id)
+    pipe = redis.pipeline(transaction=True)
+    pipe.hset(
+        key,
+        mapping={
+            "user_id": str(user_id),
+            "filename": filename,
+            "content_type": content_type,
+            "kind": kind,
+            "size": size,
+            "offset": 0,
+            "status": UPLOAD_STATUS_UPLOADING,
+            "created_at": get_current_time().isoformat(),
+        },
+    )
+    pipe.expire(key, UPLOAD_SESSION_TTL)
+    await pipe.execute()
+    return upload_id
+
+
+async def get_upload_session(
+    redis: aioredis.Redis, upload_id: str, user_id: ObjectId
+) -> Dict[str, str]:
+    """
+    요청한 사용자의 업로드 세션을 조회하는 함수 (없거나 만료되었거나 다른 사용자의 세션이면 404)
+    """
+    session = await redis.hgetall(get_upload_session_key(upload_id))
+    if not session or session.get("user_id") != str(user_id):
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    return session
+
+
+async def append_upload_chunk(
+    redis: aioredis.Redis,
+    upload_id: str,
+    user_id: ObjectId,
+    offset: int,
+    stream: AsyncIterator[bytes],
+) -> Dict[str, str]:
+    """
+    업로드 세션의 offset 위치부터 조각을 이어 붙이는 함수
+    - offset이 서버가 받은 크기와 다르면 409 (클라이언트는 응답의 offset부터 다시 전송)
+    - 전송이 중간에 끊겨도 디스크에 쓴 부분까지는 받은 것으로 기록해, 재시도 시 나머지만 보내면 됩니다.
+    :return: 갱신된 세션
+    """
+    session = await get_upload_session(redis, upload_id, user_id)
+    if session["status"] != UPLOAD_STATUS_UPLOADING:
+        raise HTTPException(status_code=409, detail="이미 완료된 업로드입니다.")
+
+    key = get_upload_session_key(upload_id)
+    lock_key = get_upload_session_lock_key(upload_id)
+    token = uuid.uuid4().hex
+    if not await redis.set(lock_key, token, nx=True, ex=UPLOAD_SESSION_LOCK_TTL):
+        raise HTTPException(status_code=409, detail="같은 업로드의 조각을 전송 중입니다.")
+
+    # 잠금을 얻은 뒤 상태와 위치를 다시 확인 (먼저 끝난 같은 위치의 요청이 기록한 조각을 덮어쓰지 않도록)
+    status, current = await redis.hmget(key, "status", "offset")
+    if status != UPLOAD_STATUS_UPLOADING or int(current) != offset:
+        await redis.register_script(_RELEASE_LOCK_SCRIPT)(keys=[lock_key], args=[token])
+        if status is None:
+            raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+        if status != UPLOAD_STATUS_UPLOADING:
+            raise HTTPException(status_code=409, detail="이미 완료된 업로드입니다.")
+        raise HTTPException(
+            status_code=409,
+            detail=f"업로드 위치가 맞지 않습니다. 현재 위치: {current}",
+            headers={"Upload-Offset": current},
+        )
+
+    refresh_lock = redis.register_script(_REFRESH_LOCK_SCRIPT)
+    lock_refreshed_at = time.monotonic()
+    remaining = int(session["size"]) - offset
+    written = 0
+    try:
+        buffer = await run_io(open, get_upload_session_path(upload_id), "r+b")
+        try:
+            # 이전 요청에서 기록되지 않은 채 남은 바이트는 버리고 이어 씀
+            await run_io(buffer.truncate, offset)
+            await run_io(buffer.seek, offset)
+            async for chunk in stream:
+                if written + len(chunk) > remaining:
+                    raise HTTPException(
+                        status_code=413, detail="선언한 파일 크기를 초과했습니다."
+                    )
+                # 조각이 오래 걸려도 다른 요청이 잠금을 얻지 못하도록 잠금 시간 연장
+                if time.monotonic() - lock_refreshed_at > UPLOAD_SESSION_LOCK_TTL / 3:
+                    if not await refresh_lock(
+                        keys=[lock_key], args=[token, UPLOAD_SESSION_LOCK_TTL]
+                    ):
+                        raise HTTPException(
+                            status_code=409, detail="업로드 잠금이 만료되었습니다."
+                        )
+                    lock_refreshed_at = time.monotonic()
+                await run_io(buffer.write, chunk)
+                written += len(chunk)
+        finally:
+            await run_io(buffer.close)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    finally:
+        # 실패하거나 연결이 끊겨도 완전히 쓴 바이트까지는 받은 것으로 기록
+        recorded = await redis.register_script(_RECORD_OFFSET_SCRIPT)(
+            keys=[key, lock_key], args=[token, offset + written, UPLOAD_SESSION_TTL]
+        )
+
+    if recorded == -1:
+        # 잠금이 만료되어 다른 요청이 이어 쓰고 있을 수 있으므로 받은 크기를 기록하지 않음
+        raise HTTPException(status_code=409, detail="업로드 잠금이 만료되었습니다.")
+    if recorded == 0:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    session["offset"] = str(offset + written)
+    return session
+
+
+async def complete_upload_session(
+    redis: aioredis.Redis, upload_id: str, user_id: ObjectId
+) -> Dict[str, str]:
+    """
+    모든 조각을 받은 업로드를 완료 처리하는 함수 (완료된 업로드만 게시글에 첨부할 수 있음)
+    """
+    session = await get_upload_session(redis, upload_id, user_id)
+    # 확인과 완료 처리를 한 번에 실행 (그 사이 세션이 삭제되거나 조각이 들어오지 않도록)
+    result = await redis.register_script(_COMPLETE_SCRIPT)(
+        keys=[get_upload_session_key(upload_id), get_upload_session_lock_key(upload_id)]
+    )
+    if result == -1:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    if result == -2:
+        raise HTTPException(
+            status_code=409,
+            detail=f"아직 받지 못한 조각이 있습니다. 현재 위치: {session['offset']}",
+            headers={"Upload-Offset": session["offset"]},
+        )
+    if result == -3:
+        # 전송 중인 조각이 있으면 완료하지 않음
+        raise HTTPException(status_code=409, detail="같은 업로드의 조각을 전송 중입니다.")
+
+    # 이미 완료되었거나 첨부 중인 업로드는 상태를 그대로 반환
+    if session["status"] == UPLOAD_STATUS_UPLOADING:
+        session["status"] = UPLOAD_STATUS_COMPLETE
+    return session
+
+
+async def delete_upload_session(redis: aioredis.Redis, upload_id: str) -> None:
+    """
+    업로드 세션과 받은 조각 파일을 삭제하는 함수 (세션을 지운 뒤이므로 대기열이 가득 차도 파일 삭제는 거절하지 않음)
+    """
+    await redis.delete(get_upload_session_key(upload_id))
+    with media_cleanup():
+        await run_io(remove_file, get_upload_session_path(upload_id))
+
+
+async def claim_completed_upload(
+    redis: aioredis.Redis, upload_id: str, user_id: ObjectId
+) -> Dict[str, str]:
+    """
+    완료된 업로드를 게시글에 첨부하기 위해 첨부 중 상태로 바꾸는 함수
+    상태를 바꾼 요청만 성공하므로 같은 업로드를 두 게시글에 동시에 첨부할 수 없습니다.
+    게시글을 저장하면 delete_upload_session, 저장에 실패하면 release_claimed_upload를 호출해야 합니다.
+    """
+    session = await get_upload_session(redis, upload_id, user_id)
+    claimed = await redis.register_script(_SET_STATUS_SCRIPT)(
+        keys=[get_upload_session_key(upload_id)],
+        args=[UPLOAD_STATUS_COMPLETE, UPLOAD_STATUS_ATTACHING],
+    )
+    if not claimed:
+        raise HTTPException(status_code=409, detail="완료되지 않은 업로드입니다.")
+    return session
+
+
+async def release_claimed_upload(redis: aioredis.Redis, upload_id: str) -> None:
+    """
+    게시글 저장에 실패한 업로드를 다시 첨부할 수 있도록 완료 상태로 되돌리는 함수
+    """
+    await redis.register_script(_SET_STATUS_SCRIPT)(
+        keys=[get_upload_session_key(upload_id)],
+        args=[UPLOAD_STATUS_ATTACHING, UPLOAD_STATUS_COMPLETE],
+    )
+
+
+async def store_completed_upload(
+    engine: AIOEngine, upload_id: str, session: Dict[str, str]
+) -> str:
+    """
+    완료된 업로드 파일을 저장소에 저장하는 함수 (참조 수가 1 올라감)
+    게시글 저장에 실패해도 다시 첨부할 수 있도록 받은 파일은 세션을 삭제할 때까지 남겨 둡니다.
+    :return: 저장된 파일 경로
+    """
+    extension = get_blob_extension(session["filename"], session["content_type"])
+    return await store_local_file(
+        engine, get_upload_session_path(upload_id), extension, keep_source=True
+    )
@@ -0,0 +1,115 @@
+import os
+from fastapi import HTTPException, UploadFile
+
+from typing import AsyncIterator
+
+from app.utils.settings import STATIC_URL_PREFIX
+from app.utils.storage_backend_utils import (
+    get_storage_backend,
+    to_local_path,
+    to_storage_key,
+)
+
+# 업로드 파일을 읽고 쓰는 단위 (요청당 메모리 사용량은 이 크기 몇 개 수준으로 유지)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# 파일 종류별 최대 크기
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_VIDEO_SIZE = 30 * 1024 * 1024  # 30MB
+MAX_UPLOAD_SIZES = {
+    "image": MAX_IMAGE_SIZE,
+    "video": MAX_VIDEO_SIZE,
+}
+
+# 게시글 하나에 첨부할 수 있는 최대 이미지 수
+MAX_IMAGE_COUNT = 5
+
+# 요청 본문 최대 크기 (Content-Length로 본문을 받기 전에 거절)
+# 이미지 최대 개수와 비디오 하나, 폼 필드 여유분을 합한 크기
+MAX_UPLOAD_REQUEST_SIZE = (
+    MAX_IMAGE_COUNT * MAX_IMAGE_SIZE + MAX_VIDEO_SIZE + UPLOAD_CHUNK_SIZE
+)
+
+
+def to_static_url(file_path: str) -> str:
+    """
+    업로드 디렉터리 안의 파일 경로를 저장소의 파일 URL로 변환하는 함수
+    (로컬 저장소는 "/static/...", S3 저장소는 버킷/CDN 주소)
+    """
+    return get_storage_backend().get_url(to_storage_key(file_path))
+
+
+def to_upload_path(url: str) -> str:
+    """
+    파일 URL을 업로드 디렉터리 안의 파일 경로(원격 저장소는 작업 사본 경로)로 변환하는 함수
+    """
+    return to_local_path(get_storage_backend().get_key(url))
+
+
+def _size_in_mb(size: int) -> int:
+    return size // (1024 * 1024)
+
+
+def remove_file(file_path: str) -> bool:
+    """
+    파일이 있으면 삭제하는 함수 (블로킹 함수이므로 run_io로 실행)
+    :return: 삭제했으면 True
+    """
+    try:
+        os.remove(file_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def get_upload_kind(content_type: str) -> str:
+    """
+    MIME 타입으로 업로드 파일 종류(image/video)를 반환하는 함수
+    """
+    kind = (content_type or "").split("/")[0]
+    if kind not in MAX_UPLOAD_SIZES:
+        raise HTTPException(
+            status_code=400, detail=f"{content_type} is an unsupported file type"
+        )
+    return kind
+
+
+def check_content_length(content_length: str, max_size: int) -> None:
+    """
+    요청 헤더의 Content-Length가 최대 크기를 넘으면 본문을 읽기 전에 413을 발생시키는 함수
+    """
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"요청 크기는 {_size_in_mb(max_size)}MB를 초과할 수 없습니다.",
+        )
+
+
+async def read_upload_chunks(
+    file: UploadFile, max_size: int, digest=None
+) -> AsyncIterator[bytes]:
+    """
+    업로드 파일을 고정 크기 청크 단위로 읽는 함수 (저장소에 바로 스트리밍할 때 사용)
+    읽는 중 최대 크기를 넘으면 413을 발생시킵니다.
+    :param digest: 읽으면서 내용 해시를 계산할 hashlib 객체 (선택)
+    """
+    # 업로드 파일 크기를 알 수 있으면 쓰기 전에 거절
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"파일은 {_size_in_mb(max_size)}MB를 초과할 수 없습니다.",
+        )
+
+    written = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        written += len(chunk)
+        if written > max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"파일은 {_size_in_mb(max_size)}MB를 초과할 수 없습니다.",
+            )
+        if digest is not None:
+            # 청크 하나의 해시 계산은 1ms 안팎이라 스레드 풀을 거치지 않고 바로 계산
+            # (청크마다 풀에 작업을 넣으면 큰 업로드 몇 개가 풀 대기열을 채움)
+            digest.update(chunk)
+        yield chunk
@@ -1,6 +1,21 @@
 from fastapi import HTTPException
 from odmantic import AIOEngine, ObjectId
+import redis.asyncio as aioredis
 from app.database.models.user import User
+from app.utils.cache_utils import invalidate_cache
+
+# 사용자 조회 응답 캐시 만료 시간(초)
+USER_CACHE_TTL = 60
+
+
+# 사용자 조회 응답 캐시 키
+def get_user_cache_key(user_id: ObjectId) -> str:
+    return f"user:{user_id}:detail"
+
+
+# 닉네임, 깃털, 프로필 이미지 등 사용자 정보가 바뀌었을 때 조회 캐시를 무효화하는 함수
+async def invalidate_user_cache(redis: aioredis.Redis, user_id: ObjectId) -> None:
+    await invalidate_cache(redis, get_user_cache_key(user_id))
 
 
 # id를 이용해 사용자를 가져오는 함수
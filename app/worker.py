@@ -0,0 +1,159 @@
+"""
+미디어 작업 워커
+
+업로드 요청에서 분리된 썸네일 생성, 변환 등의 미디어 작업을 Redis 대기열에서 꺼내 처리합니다.
+좋아요, 댓글 알림도 대기열에서 모아 Firebase로 일괄 전송합니다.
+처리량이 부족하면 워커 프로세스(컨테이너)를 늘리면 됩니다.
+
+실행: python -m app.worker
+"""
+
+import asyncio
+import logging
+import signal
+import time
+
+from app.common.config import conf
+from app.database.conn import close_mongo, close_redis, init_mongo, init_redis
+from app.utils.executor_utils import (
+    MEDIA_CPU_WORKERS,
+    init_media_executors,
+    shutdown_media_executors,
+)
+from app.utils.fcm_utils import (
+    claim_notification_events,
+    requeue_due_notifications,
+    schedule_notification_retries,
+    send_notification_batch,
+)
+from app.utils.job_utils import (
+    claim_media_job,
+    complete_media_job,
+    fail_media_job,
+    media_job_heartbeat,
+    requeue_stale_media_jobs,
+)
+from app.utils.media_job_utils import mark_media_job_failed, run_media_job
+from app.utils.notification_utils import flush_due_notifications
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 하나에서 동시에 처리할 작업 수
+WORKER_CONCURRENCY = MEDIA_CPU_WORKERS
+# 대기열이 비었을 때 한 번에 기다리는 시간(초) (종료 신호 확인 주기)
+WORKER_POLL_TIMEOUT = 5
+# 시간 초과된 작업을 점검하는 주기(초)
+STALE_JOB_CHECK_INTERVAL = 60
+# 알림 전송 처리량을 로그로 남기는 주기(초)
+NOTIFICATION_STATS_LOG_INTERVAL = 60
+
+
+async def consume(engine, redis, stop: asyncio.Event) -> None:
+    """
+    종료 신호를 받을 때까지 대기열에서 작업을 꺼내 처리하는 루프
+    """
+    while not stop.is_set():
+        claimed = await claim_media_job(redis, WORKER_POLL_TIMEOUT)
+        if claimed is None:
+            continue
+
+        raw, job = claimed
+        try:
+            # 처리하는 동안 갱신 시각을 기록해 오래 걸리는 작업이 다시 대기열에 들어가지 않도록 함
+            async with media_job_heartbeat(redis, job):
+                await run_media_job(engine, redis, job)
+            await complete_media_job(redis, raw, job)
+            logger.info(f"미디어 작업 완료: {job['type']} {job['id']}")
+        except Exception:
+            logger.error(f"미디어 작업 실패: {job['type']} {job['id']}", exc_info=True)
+            if not await fail_media_job(redis, raw, job):
+                await mark_media_job_failed(engine, redis, job)
+
+
+async def requeue_stale_jobs(redis, stop: asyncio.Event) -> None:
+    """
+    작업 도중 종료된 워커의 작업을 주기적으로 대기열에 되돌리는 루프
+    """
+    while not stop.is_set():
+        try:
+            await requeue_stale_media_jobs(redis)
+        except Exception:
+            logger.error("시간 초과 미디어 작업 점검 실패", exc_info=True)
+        try:
+            await asyncio.wait_for(stop.wait(), STALE_JOB_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def dispatch_notifications(engine, redis, stop: asyncio.Event) -> None:
+    """
+    종료 신호를 받을 때까지 알림 이벤트를 모아 Firebase로 일괄 전송하는 루프
+    같은 게시글에 모인 좋아요/댓글 알림은 보낼 시각이 되면 알림 하나로 만들어 전송합니다.
+    """
+    totals = {}
+    last_log = time.monotonic()
+    while not stop.is_set():
+        events = []
+        try:
+            await flush_due_notifications(redis)
+            await requeue_due_notifications(redis)
+            events = await claim_notification_events(redis, timeout=WORKER_POLL_TIMEOUT)
+            if events:
+                result = await send_notification_batch(engine, redis, events)
+                for name, count in result.items():
+                    totals[name] = totals.get(name, 0) + count
+        except Exception:
+            logger.error(f"알림 전송 처리 실패: {len(events)}건", exc_info=True)
+            # 전송하기 전에 실패한 경우이므로 꺼낸 이벤트는 잃지 않도록 재시도 예약
+            # (send_notification_batch는 전송한 뒤의 후처리 실패로는 예외를 던지지 않음)
+            if events:
+                try:
+                    await schedule_notification_retries(redis, events)
+                except Exception:
+                    logger.error("알림 재시도 예약 실패", exc_info=True)
+
+        elapsed = time.monotonic() - last_log
+        if elapsed >= NOTIFICATION_STATS_LOG_INTERVAL:
+            if totals:
+                logger.info(
+                    f"알림 전송 처리량: 초당 {totals.get('sent', 0) / elapsed:.1f}건 {totals}"
+                )
+            totals = {}
+            last_log = time.monotonic()
+
+
+async def run_worker() -> None:
+    c = conf()
+    engine = await init_mongo(db_url=c.DB_URL, db_name=c.DB_NAME)
+    redis = await init_redis(redis_url=c.redis_url)
+    # 워커는 동시 작업 수를 직접 제한하므로 풀이 바빠도 거절하지 않고 순서를 기다림
+    init_media_executors(reject_when_busy=False)
+
+    # SIGTERM/SIGINT를 받으면 진행 중인 작업까지만 처리하고 종료
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"미디어 작업 워커 시작 (동시 처리 {WORKER_CONCURRENCY}개)")
+    try:
+        await asyncio.gather(
+            requeue_stale_jobs(redis, stop),
+            dispatch_notifications(engine, redis, stop),
+            *(consume(engine, redis, stop) for _ in range(WORKER_CONCURRENCY)),
+        )
+    finally:
+        shutdown_media_executors()
+        await close_redis(redis)
+        await close_mongo(engine)
+        logger.info("미디어 작업 워커 종료")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    asyncio.run(run_worker())
@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from odmantic import ObjectId
+
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+
+OBJECT_ID = ObjectId("614c1b5f27f3b87636d1c2a5")
+
+
+def make_cursor(sort_by, value, object_id=str(OBJECT_ID)) -> str:
+    raw = json.dumps({"s": sort_by, "v": value, "id": object_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+@pytest.mark.parametrize(
+    "sort_by, value",
+    [
+        ("likes", 12),
+        ("relevance", 3.5),
+        ("created_at", datetime(2024, 9, 1, 12, 30)),
+        ("recent", None),
+    ],
+)
+def test_round_trip(sort_by, value):
+    assert decode_cursor(encode_cursor(sort_by, value, OBJECT_ID), sort_by) == (
+        value,
+        OBJECT_ID,
+    )
+
+
+@pytest.mark.parametrize(
+    "sort_by, value",
+    [
+        # 연산자가 쿼리에 그대로 들어가지 않아야 함
+        ("likes", {"$gt": None}),
+        ("relevance", {"$ne": 0}),
+        ("likes", [1]),
+        ("likes", "10"),
+        ("likes", True),
+        ("likes", None),
+        ("created_at", {"$gt": None}),
+        ("created_at", 1725193800),
+    ],
+)
+def test_rejects_wrong_value_type(sort_by, value):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(make_cursor(sort_by, value), sort_by)
+    assert exc_info.value.status_code == 400
+
+
+def test_rejects_non_finite_number():
+    raw = b'{"s":"likes","v":NaN,"id":"614c1b5f27f3b87636d1c2a5"}'
+    cursor = base64.urlsafe_b64encode(raw).decode("ascii")
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, "likes")
+
+
+def test_recent_ignores_value():
+    assert decode_cursor(make_cursor("recent", {"$gt": None}), "recent") == (None, OBJECT_ID)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        make_cursor("likes", 1, object_id="not-an-object-id"),
+        make_cursor("likes", 1, object_id={"$gt": None}),
+        make_cursor("created_at", "2024-09-01T12:30:00"),
+        "not base64!",
+    ],
+)
+def test_rejects_malformed_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, "likes")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.utils.static_utils import IMMUTABLE_CACHE_CONTROL, MediaFiles
+
+BLOB_NAME = "a" * 64 + ".jpg"
+
+
+def request(app: MediaFiles, path: str):
+    """
+    정규화되지 않은 경로를 그대로 전달하기 위해 ASGI scope로 직접 호출
+    """
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "root_path": "",
+        "headers": [],
+        "extensions": {},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], headers, body
+
+
+@pytest.fixture
+def media_app(tmp_path):
+    (tmp_path / "blobs" / "tmp").mkdir(parents=True)
+    (tmp_path / "blobs" / "ab").mkdir()
+    (tmp_path / "blobs" / "tmp" / "upload.part").write_bytes(b"in-progress")
+    (tmp_path / "blobs" / "ab" / BLOB_NAME).write_bytes(b"blob")
+    return MediaFiles(directory=str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/blobs/tmp/upload.part",
+        "/blobs//tmp/upload.part",
+        "/blobs/./tmp/upload.part",
+        "/blobs/ab/../tmp/upload.part",
+        "/./blobs/tmp/upload.part",
+    ],
+)
+def test_private_directory_is_not_served(media_app, path):
+    status, headers, body = request(media_app, path)
+    assert status == 404
+    assert body == b"Not Found"
+    assert "cache-control" not in headers
+
+
+def test_path_outside_directory_is_not_served(media_app):
+    status, _, _ = request(media_app, "/../../etc/passwd")
+    assert status == 404
+
+
+def test_blob_is_served_with_immutable_cache(media_app):
+    status, headers, body = request(media_app, f"/blobs/ab/{BLOB_NAME}")
+    assert status == 200
+    assert body == b"blob"
+    assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert headers["etag"] == f'"{BLOB_NAME}"'
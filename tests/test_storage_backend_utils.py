@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from app.utils import storage_backend_utils
+from app.utils.executor_utils import shutdown_media_executors
+from app.utils.static_utils import IMMUTABLE_CACHE_CONTROL
+from app.utils.storage_backend_utils import S3StorageBackend
+
+BUCKET = "media"
+BLOB_KEY = "blobs/ab/cd/" + "a" * 64 + ".jpg"
+
+
+class FakeS3Client:
+    """
+    boto3 S3 클라이언트 대신 버킷 내용을 메모리에 보관하는 클라이언트 (S3StorageBackend가 쓰는 호출만 구현)
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.args = {}
+        self.uploads = {}
+        self.aborted = []
+
+    def put_object(self, Bucket, Key, Body, **args):
+        self.objects[Key] = bytes(Body)
+        self.args[Key] = args
+
+    def create_multipart_upload(self, Bucket, Key, **args):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"key": Key, "args": args, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId]["parts"][PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        self.objects[Key] = b"".join(upload["parts"][number] for number in numbers)
+        self.args[Key] = upload["args"]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+        self.aborted.append(UploadId)
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        with open(Filename, "rb") as buffer:
+            self.objects[Key] = buffer.read()
+        self.args[Key] = ExtraArgs or {}
+
+    def copy_object(self, Bucket, Key, CopySource, MetadataDirective, **args):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+        self.args[Key] = args
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+        self.args.pop(Key, None)
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def client():
+    yield FakeS3Client()
+    shutdown_media_executors()
+
+
+@pytest.fixture
+def backend(client):
+    return S3StorageBackend(BUCKET, client=client)
+
+
+def test_put_small_file_uses_single_request(backend, client):
+    size = asyncio.run(backend.put(BLOB_KEY, chunks(b"ab", b"cd"), "image/jpeg"))
+
+    assert size == 4
+    assert client.objects[BLOB_KEY] == b"abcd"
+    assert client.args[BLOB_KEY]["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+    assert not client.uploads
+
+
+def test_put_large_file_uses_multipart(backend, client, monkeypatch):
+    monkeypatch.setattr(storage_backend_utils, "S3_MULTIPART_CHUNK_SIZE", 4)
+
+    size = asyncio.run(backend.put(BLOB_KEY, chunks(b"abc", b"def", b"ghij", b"k")))
+
+    assert size == 11
+    assert client.objects[BLOB_KEY] == b"abcdefghijk"
+    assert client.args[BLOB_KEY]["ContentType"] == "image/jpeg"
+    # 완료된 멀티파트 업로드는 남지 않음
+    assert not client.uploads
+
+
+def test_put_aborts_multipart_on_error(backend, client, monkeypatch):
+    monkeypatch.setattr(storage_backend_utils, "S3_MULTIPART_CHUNK_SIZE", 4)
+
+    async def failing_chunks():
+        yield b"abcd"
+        raise ValueError("연결 끊김")
+
+    with pytest.raises(ValueError):
+        asyncio.run(backend.put(BLOB_KEY, failing_chunks()))
+
+    assert client.aborted == ["upload-1"]
+    assert BLOB_KEY not in client.objects
+
+
+def test_move_copies_then_deletes_source(backend, client):
+    tmp_key = "blobs/tmp/upload"
+    client.objects[tmp_key] = b"data"
+
+    asyncio.run(backend.move(tmp_key, BLOB_KEY))
+
+    assert client.objects == {BLOB_KEY: b"data"}
+    # 옮긴 파일은 저장 위치에 맞는 캐시 헤더로 다시 저장
+    assert client.args[BLOB_KEY]["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_delete_ignores_missing_object(backend, client):
+    client.objects[BLOB_KEY] = b"data"
+
+    asyncio.run(backend.delete(BLOB_KEY))
+    asyncio.run(backend.delete(BLOB_KEY))
+
+    assert BLOB_KEY not in client.objects
+
+
+@pytest.mark.parametrize("move", [False, True])
+def test_put_file(backend, client, tmp_path, move):
+    file_path = tmp_path / "video.mp4"
+    file_path.write_bytes(b"video")
+    key = "blobs/ab/cd/" + "b" * 64 + ".mp4"
+
+    asyncio.run(backend.put_file(key, str(file_path), move=move))
+
+    assert client.objects[key] == b"video"
+    assert client.args[key]["ContentType"] == "video/mp4"
+    # move면 로컬 파일은 삭제
+    assert file_path.exists() != move